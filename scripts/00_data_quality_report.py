@@ -15,6 +15,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data
+
 # Settings
 sns.set_style("whitegrid")
 os.makedirs("results/data_quality", exist_ok=True)
@@ -23,7 +27,7 @@ DATA_PATH = "/data2/fabricehc/epi/data/2012-01-2024-08-overdoses.csv"
 
 def main():
     print("Loading raw data...")
-    df_raw = pd.read_csv(DATA_PATH, low_memory=False)
+    df_raw = load_overdose_data(DATA_PATH, report_memory=True)
 
     total_records = len(df_raw)
     print(f"Total records in raw data: {total_records:,}")
@@ -31,13 +35,12 @@ def main():
     # === Sample Derivation ===
     exclusions = []
 
-    # Step 1: Date processing
+    # Step 1: Date processing (parsed by load_overdose_data)
     df = df_raw.copy()
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
+    print("\nDeath date source:")
+    for source, count in df['Date_Source'].value_counts(dropna=False).items():
+        label = source if pd.notna(source) else 'missing/unparseable'
+        print(f"  {label}: {count:,}")
 
     missing_dates = df['Date of Death'].isna().sum()
     exclusions.append({
@@ -227,14 +230,14 @@ def main():
 
     if 'Gender' in df.columns:
         print("\nGender distribution:")
-        gender_dist = df['Gender'].value_counts()
+        gender_dist = df['Gender'].cat.remove_unused_categories().value_counts()
         for gender, count in gender_dist.items():
             pct = (count / final_n * 100)
             print(f"  {gender}: {count:,} ({pct:.1f}%)")
 
     if 'Race' in df.columns:
         print("\nRace/ethnicity distribution:")
-        race_dist = df['Race'].value_counts()
+        race_dist = df['Race'].cat.remove_unused_categories().value_counts()
         for race, count in race_dist.items():
             pct = (count / final_n * 100)
             print(f"  {race}: {count:,} ({pct:.1f}%)")
@@ -12,11 +12,22 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from plotnine import (
-    ggplot, aes, geom_line, geom_area, geom_point,
-    scale_color_manual, scale_fill_manual,
-    theme_minimal, theme, labs, element_text,
-    facet_wrap, geom_col, position_dodge
+
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data, lazy_import
+from figure_queue import figure
+
+# plotnine loads on first use
+(ggplot, aes, geom_line, geom_area, geom_point,
+ scale_color_manual, scale_fill_manual,
+ theme_minimal, theme, labs, element_text,
+ facet_wrap, geom_col, position_dodge) = lazy_import(
+    'plotnine',
+    'ggplot', 'aes', 'geom_line', 'geom_area', 'geom_point',
+    'scale_color_manual', 'scale_fill_manual',
+    'theme_minimal', 'theme', 'labs', 'element_text',
+    'facet_wrap', 'geom_col', 'position_dodge'
 )
 
 # Settings
@@ -37,42 +48,12 @@ colors = {
     'Others': '#808080'
 }
 
-def main():
-    print("Loading data...")
-    df = pd.read_csv(DATA_PATH, low_memory=False)
-
-    # Process dates
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
-
-    df['Year'] = df['Date of Death'].dt.year
-    df['Month'] = df['Date of Death'].dt.month
-    df['YearMonth'] = df['Date of Death'].dt.to_period('M')
-
-    # Filter to complete years (2012-2023) for fair comparison
-    df = df[df['Year'].between(2012, 2023)]
-
-    # === 1. Fentanyl vs Heroin Timeline ===
-    print("Analyzing fentanyl vs heroin timeline...")
-
-    # Annual counts
-    annual_counts = df.groupby('Year')[['Fentanyl', 'Heroin']].sum().reset_index()
-    annual_totals = df.groupby('Year').size().reset_index(name='Total')
-    annual_counts = annual_counts.merge(annual_totals, on='Year')
-
-    # Calculate proportions
-    annual_counts['Fentanyl_pct'] = (annual_counts['Fentanyl'] / annual_counts['Total']) * 100
-    annual_counts['Heroin_pct'] = (annual_counts['Heroin'] / annual_counts['Total']) * 100
 
-    # Save data
-    annual_counts.to_csv('results/01_fentanyl_timeline/fentanyl_heroin_annual.csv', index=False)
-
-    # Plot 1: Absolute counts
+def plot_fentanyl_vs_heroin(annual_counts):
+    """Fentanyl vs heroin deaths: absolute counts and share of all deaths"""
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
 
+    # Plot 1: Absolute counts
     ax1.plot(annual_counts['Year'], annual_counts['Fentanyl'],
              marker='o', linewidth=2, color=colors['Fentanyl'], label='Fentanyl')
     ax1.plot(annual_counts['Year'], annual_counts['Heroin'],
@@ -96,9 +77,98 @@ def main():
     ax2.set_ylim(0, 100)
 
     plt.tight_layout()
-    plt.savefig('results/01_fentanyl_timeline/fentanyl_heroin_comparison.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("Saved: fentanyl_heroin_comparison.png")
+    return fig
+
+
+def plot_all_substances(substance_long):
+    """Share of deaths involving each substance, one line per substance"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for substance in substance_long['Substance'].unique():
+        data = substance_long[substance_long['Substance'] == substance]
+        ax.plot(data['Year'], data['Percentage'],
+                marker='o', linewidth=2, label=substance,
+                color=colors.get(substance, '#666666'))
+
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('% of All Overdose Deaths', fontsize=12)
+    ax.set_title('Timeline of All Substances Involved in Overdose Deaths\nLos Angeles County 2012-2023',
+                 fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10, loc='best')
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_cooccurrence(cooccurrence_df):
+    """Share of fentanyl deaths that also involve each other substance"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for substance in cooccurrence_df['Substance'].unique():
+        data = cooccurrence_df[cooccurrence_df['Substance'] == substance]
+        ax.plot(data['Year'], data['Percentage'],
+                marker='o', linewidth=2, label=substance,
+                color=colors.get(substance, '#666666'))
+
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('% of Fentanyl Deaths', fontsize=12)
+    ax.set_title('Co-occurrence of Other Substances in Fentanyl Deaths\nLos Angeles County 2012-2023',
+                 fontsize=14, fontweight='bold')
+    ax.legend(fontsize=10, loc='best')
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def plot_composition(pivot_data):
+    """Stacked area of substance shares (Year index, one column per substance)"""
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    ax.stackplot(pivot_data.index,
+                 *[pivot_data[col] for col in pivot_data.columns],
+                 labels=list(pivot_data.columns),
+                 colors=[colors.get(col, '#666666') for col in pivot_data.columns],
+                 alpha=0.8)
+
+    ax.set_xlabel('Year', fontsize=12)
+    ax.set_ylabel('% of All Overdose Deaths', fontsize=12)
+    ax.set_title('Composition of Overdose Deaths by Substance Over Time\nLos Angeles County 2012-2023',
+                 fontsize=14, fontweight='bold')
+    ax.legend(loc='upper left', fontsize=10)
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def main():
+    print("Loading data...")
+    df = load_overdose_data(DATA_PATH)
+    df['Month'] = df['Date of Death'].dt.month
+    df['YearMonth'] = df['Date of Death'].dt.to_period('M')
+
+    # Filter to complete years (2012-2023) for fair comparison
+    df = df[df['Year'].between(2012, 2023)]
+
+    # === 1. Fentanyl vs Heroin Timeline ===
+    print("Analyzing fentanyl vs heroin timeline...")
+
+    # Annual counts
+    # Flags are int8; upcast so the yearly counts cannot wrap
+    annual_counts = df[['Fentanyl', 'Heroin']].astype('int64').groupby(df['Year']).sum().reset_index()
+    annual_totals = df.groupby('Year').size().reset_index(name='Total')
+    annual_counts = annual_counts.merge(annual_totals, on='Year')
+
+    # Calculate proportions
+    annual_counts['Fentanyl_pct'] = (annual_counts['Fentanyl'] / annual_counts['Total']) * 100
+    annual_counts['Heroin_pct'] = (annual_counts['Heroin'] / annual_counts['Total']) * 100
+
+    # Save data
+    annual_counts.to_csv('results/01_fentanyl_timeline/fentanyl_heroin_annual.csv', index=False)
+
+    figure(plot_fentanyl_vs_heroin, 'results/01_fentanyl_timeline/fentanyl_heroin_comparison.png',
+           annual_counts)
+
 
     # === 2. All Substances Timeline ===
     print("Analyzing all substances over time...")
@@ -107,7 +177,7 @@ def main():
                       'Prescription.opioids', 'Benzodiazepines', 'Alcohol', 'Others']
 
     # Annual proportions for all substances
-    substance_annual = df.groupby('Year')[substance_cols].sum()
+    substance_annual = df[substance_cols].astype('int64').groupby(df['Year']).sum()
     substance_annual_pct = substance_annual.div(annual_totals.set_index('Year')['Total'], axis=0) * 100
     substance_annual_pct = substance_annual_pct.reset_index()
 
@@ -119,25 +189,9 @@ def main():
 
     substance_long.to_csv('results/01_fentanyl_timeline/all_substances_annual.csv', index=False)
 
-    # Plot
-    fig, ax = plt.subplots(figsize=(12, 6))
-    for substance in substance_cols:
-        data = substance_long[substance_long['Substance'] == substance]
-        ax.plot(data['Year'], data['Percentage'],
-                marker='o', linewidth=2, label=substance,
-                color=colors.get(substance, '#666666'))
-
-    ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('% of All Overdose Deaths', fontsize=12)
-    ax.set_title('Timeline of All Substances Involved in Overdose Deaths\nLos Angeles County 2012-2023',
-                 fontsize=14, fontweight='bold')
-    ax.legend(fontsize=10, loc='best')
-    ax.grid(True, alpha=0.3)
+    figure(plot_all_substances, 'results/01_fentanyl_timeline/all_substances_timeline.png',
+           substance_long)
 
-    plt.tight_layout()
-    plt.savefig('results/01_fentanyl_timeline/all_substances_timeline.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("Saved: all_substances_timeline.png")
 
     # === 3. Fentanyl Co-occurrence Patterns ===
     print("Analyzing fentanyl co-occurrence patterns...")
@@ -168,51 +222,19 @@ def main():
     cooccurrence_df = pd.DataFrame(cooccurrence)
     cooccurrence_df.to_csv('results/01_fentanyl_timeline/fentanyl_cooccurrence.csv', index=False)
 
-    # Plot co-occurrence trends
-    fig, ax = plt.subplots(figsize=(12, 6))
-    for substance in other_substances:
-        data = cooccurrence_df[cooccurrence_df['Substance'] == substance]
-        ax.plot(data['Year'], data['Percentage'],
-                marker='o', linewidth=2, label=substance,
-                color=colors.get(substance, '#666666'))
-
-    ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('% of Fentanyl Deaths', fontsize=12)
-    ax.set_title('Co-occurrence of Other Substances in Fentanyl Deaths\nLos Angeles County 2012-2023',
-                 fontsize=14, fontweight='bold')
-    ax.legend(fontsize=10, loc='best')
-    ax.grid(True, alpha=0.3)
+    figure(plot_cooccurrence, 'results/01_fentanyl_timeline/fentanyl_cooccurrence.png',
+           cooccurrence_df)
 
-    plt.tight_layout()
-    plt.savefig('results/01_fentanyl_timeline/fentanyl_cooccurrence.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("Saved: fentanyl_cooccurrence.png")
 
     # === 4. Stacked area chart of substance proportions ===
     print("Creating stacked area chart...")
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-
     # Prepare data for stacked area
     pivot_data = substance_annual_pct.set_index('Year')[substance_cols]
 
-    ax.stackplot(pivot_data.index,
-                 *[pivot_data[col] for col in substance_cols],
-                 labels=substance_cols,
-                 colors=[colors.get(col, '#666666') for col in substance_cols],
-                 alpha=0.8)
+    figure(plot_composition, 'results/01_fentanyl_timeline/substance_composition_stacked.png',
+           pivot_data)
 
-    ax.set_xlabel('Year', fontsize=12)
-    ax.set_ylabel('% of All Overdose Deaths', fontsize=12)
-    ax.set_title('Composition of Overdose Deaths by Substance Over Time\nLos Angeles County 2012-2023',
-                 fontsize=14, fontweight='bold')
-    ax.legend(loc='upper left', fontsize=10)
-    ax.grid(True, alpha=0.3)
-
-    plt.tight_layout()
-    plt.savefig('results/01_fentanyl_timeline/substance_composition_stacked.png', dpi=300, bbox_inches='tight')
-    plt.close()
-    print("Saved: substance_composition_stacked.png")
 
     # Print key findings
     print("\n" + "="*60)
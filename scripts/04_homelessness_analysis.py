@@ -14,6 +14,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data
+
 # Settings
 sns.set_style("whitegrid")
 os.makedirs("results/04_homelessness_analysis", exist_ok=True)
@@ -22,16 +26,7 @@ DATA_PATH = "/data2/fabricehc/epi/data/2012-01-2024-08-overdoses.csv"
 
 def main():
     print("Loading data...")
-    df = pd.read_csv(DATA_PATH, low_memory=False)
-
-    # Process dates
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
-
-    df['Year'] = df['Date of Death'].dt.year
+    df = load_overdose_data(DATA_PATH)
     df = df[df['Year'].between(2012, 2023)]
 
     substance_cols = ['Heroin', 'Fentanyl', 'Prescription.opioids',
@@ -15,6 +15,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
 
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data, normalize_zip
+
 # Settings
 sns.set_style("whitegrid")
 os.makedirs("results/05_geographic_analysis", exist_ok=True)
@@ -23,16 +27,7 @@ DATA_PATH = "/data2/fabricehc/epi/data/2012-01-2024-08-overdoses.csv"
 
 def main():
     print("Loading data...")
-    df = pd.read_csv(DATA_PATH, low_memory=False)
-
-    # Process dates
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
-
-    df['Year'] = df['Date of Death'].dt.year
+    df = load_overdose_data(DATA_PATH)
     df = df[df['Year'].between(2012, 2023)]
 
     substance_cols = ['Heroin', 'Fentanyl', 'Prescription.opioids',
@@ -43,9 +38,8 @@ def main():
 
     if 'ZIPCODE' in df.columns:
         # Clean ZIP codes
-        df['ZIP'] = df['ZIPCODE'].astype(str).str.replace('.0', '', regex=False)
-        df['ZIP'] = df['ZIP'].str.strip()
-        df['ZIP'] = df['ZIP'].apply(lambda x: x[:5] if len(x) >= 5 else x)
+        df = normalize_zip(df, zip_col='ZIPCODE')
+        df['ZIP'] = df['ZIP'].astype('string')
 
         # Overall hotspots
         zip_counts = df['ZIP'].value_counts().head(20).reset_index()
@@ -16,6 +16,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data
+
 # Settings
 sns.set_style("whitegrid")
 os.makedirs("results/07_covid_impact", exist_ok=True)
@@ -24,16 +28,7 @@ DATA_PATH = "/data2/fabricehc/epi/data/2012-01-2024-08-overdoses.csv"
 
 def main():
     print("Loading data...")
-    df = pd.read_csv(DATA_PATH, low_memory=False)
-
-    # Process dates
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
-
-    df['Year'] = df['Date of Death'].dt.year
+    df = load_overdose_data(DATA_PATH)
     df['Month'] = df['Date of Death'].dt.month
     df['YearMonth'] = df['Date of Death'].dt.to_period('M')
 
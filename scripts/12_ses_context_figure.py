@@ -12,6 +12,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+from figure_queue import figure_key, figure_current, record_figure
+
 print("="*70)
 print("CREATING SES CONTEXT FIGURE")
 print("="*70)
@@ -37,97 +43,103 @@ print(f"Poverty data: {len(poverty_df)} rows")
 print(f"Income data: {len(income_df)} rows")
 print(f"Age data: {len(age_df)} rows")
 
-# Create figure with 6 panels
-fig = plt.figure(figsize=(20, 12))
-gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
-
-race_groups = ['WHITE', 'BLACK', 'LATINE', 'ASIAN']
-race_labels = {
-    'WHITE': 'White (NH)',
-    'BLACK': 'Black (NH)',
-    'LATINE': 'Latine',
-    'ASIAN': 'Asian (NH)'
-}
-
-# Panel A: Overdose Death Rates per 100k
-ax1 = fig.add_subplot(gs[0, 0])
-for race in race_groups:
-    race_data = overdose_df[overdose_df['Race'] == race]
-    ax1.plot(race_data['Year'], race_data['Rate_per_100k'],
-             marker='o', linewidth=2.5, markersize=6,
-             color=colors[race], label=race_labels[race])
-
-ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Overdose Deaths per 100,000', fontsize=12, fontweight='bold')
-ax1.set_title('A. Overdose Death Rates by Race', fontsize=14, fontweight='bold', pad=15)
-ax1.legend(loc='upper left', fontsize=10)
-ax1.grid(True, alpha=0.3)
-ax1.set_xlim(2011.5, 2023.5)
-
-# Panel B: Disparity Ratios
-ax2 = fig.add_subplot(gs[0, 1])
-for race in race_groups:
-    race_data = overdose_df[overdose_df['Race'] == race]
-    ax2.plot(race_data['Year'], race_data['Disparity_Ratio'],
-             marker='o', linewidth=2.5, markersize=6,
-             color=colors[race], label=race_labels[race])
-
-ax2.axhline(y=1.0, color='black', linestyle='--', linewidth=1.5, alpha=0.5,
-            label='Proportional representation')
-ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Disparity Ratio', fontsize=12, fontweight='bold')
-ax2.set_title('B. Disparity Ratios (% Deaths / % Population)', fontsize=14, fontweight='bold', pad=15)
-ax2.legend(loc='upper left', fontsize=10)
-ax2.grid(True, alpha=0.3)
-ax2.set_xlim(2011.5, 2023.5)
-
-# Panel C: Poverty Rates
-ax3 = fig.add_subplot(gs[1, 0])
-for race in race_groups:
-    ax3.plot(poverty_df['Year'], poverty_df[f'{race}_Poverty_Rate'],
-             marker='s', linewidth=2.5, markersize=6,
-             color=colors[race], label=race_labels[race])
-
-ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax3.set_ylabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
-ax3.set_title('C. Poverty Rates by Race', fontsize=14, fontweight='bold', pad=15)
-ax3.legend(loc='upper right', fontsize=10)
-ax3.grid(True, alpha=0.3)
-ax3.set_xlim(2011.5, 2023.5)
-
-# Panel D: Median Household Income
-ax4 = fig.add_subplot(gs[1, 1])
-for race in race_groups:
-    ax4.plot(income_df['Year'], income_df[f'{race}_Median_Income'] / 1000,
-             marker='s', linewidth=2.5, markersize=6,
-             color=colors[race], label=race_labels[race])
-
-ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax4.set_ylabel('Median Household Income ($1,000s)', fontsize=12, fontweight='bold')
-ax4.set_title('D. Median Household Income by Race', fontsize=14, fontweight='bold', pad=15)
-ax4.legend(loc='upper left', fontsize=10)
-ax4.grid(True, alpha=0.3)
-ax4.set_xlim(2011.5, 2023.5)
-
-# Panel E: Median Population Age
-ax5 = fig.add_subplot(gs[2, 0])
-for race in race_groups:
-    ax5.plot(age_df['Year'], age_df[f'{race}_Median_Age'],
-             marker='s', linewidth=2.5, markersize=6,
-             color=colors[race], label=race_labels[race])
-
-ax5.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax5.set_ylabel('Median Age (years)', fontsize=12, fontweight='bold')
-ax5.set_title('E. Median Population Age by Race', fontsize=14, fontweight='bold', pad=15)
-ax5.legend(loc='upper left', fontsize=10)
-ax5.grid(True, alpha=0.3)
-ax5.set_xlim(2011.5, 2023.5)
-
-# Panel F: Key Finding Text Box
-ax6 = fig.add_subplot(gs[2, 1])
-ax6.axis('off')
-
-text_content = """
+# Redraw only when the data, this script or the plot style changed
+figure_path = 'results/12_ses_context_figure/ses_context_figure.png'
+figure_cache_key = figure_key([overdose_df, poverty_df, income_df, age_df], __file__)
+if plots_enabled() and figure_current(figure_path, figure_cache_key):
+    print(f"\n✓ Figure unchanged: {figure_path}")
+elif plots_enabled():
+    # Create figure with 6 panels
+    fig = plt.figure(figsize=(20, 12))
+    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+
+    race_groups = ['WHITE', 'BLACK', 'LATINE', 'ASIAN']
+    race_labels = {
+        'WHITE': 'White (NH)',
+        'BLACK': 'Black (NH)',
+        'LATINE': 'Latine',
+        'ASIAN': 'Asian (NH)'
+    }
+
+    # Panel A: Overdose Death Rates per 100k
+    ax1 = fig.add_subplot(gs[0, 0])
+    for race in race_groups:
+        race_data = overdose_df[overdose_df['Race'] == race]
+        ax1.plot(race_data['Year'], race_data['Rate_per_100k'],
+                 marker='o', linewidth=2.5, markersize=6,
+                 color=colors[race], label=race_labels[race])
+
+    ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Overdose Deaths per 100,000', fontsize=12, fontweight='bold')
+    ax1.set_title('A. Overdose Death Rates by Race', fontsize=14, fontweight='bold', pad=15)
+    ax1.legend(loc='upper left', fontsize=10)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_xlim(2011.5, 2023.5)
+
+    # Panel B: Disparity Ratios
+    ax2 = fig.add_subplot(gs[0, 1])
+    for race in race_groups:
+        race_data = overdose_df[overdose_df['Race'] == race]
+        ax2.plot(race_data['Year'], race_data['Disparity_Ratio'],
+                 marker='o', linewidth=2.5, markersize=6,
+                 color=colors[race], label=race_labels[race])
+
+    ax2.axhline(y=1.0, color='black', linestyle='--', linewidth=1.5, alpha=0.5,
+                label='Proportional representation')
+    ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Disparity Ratio', fontsize=12, fontweight='bold')
+    ax2.set_title('B. Disparity Ratios (% Deaths / % Population)', fontsize=14, fontweight='bold', pad=15)
+    ax2.legend(loc='upper left', fontsize=10)
+    ax2.grid(True, alpha=0.3)
+    ax2.set_xlim(2011.5, 2023.5)
+
+    # Panel C: Poverty Rates
+    ax3 = fig.add_subplot(gs[1, 0])
+    for race in race_groups:
+        ax3.plot(poverty_df['Year'], poverty_df[f'{race}_Poverty_Rate'],
+                 marker='s', linewidth=2.5, markersize=6,
+                 color=colors[race], label=race_labels[race])
+
+    ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
+    ax3.set_title('C. Poverty Rates by Race', fontsize=14, fontweight='bold', pad=15)
+    ax3.legend(loc='upper right', fontsize=10)
+    ax3.grid(True, alpha=0.3)
+    ax3.set_xlim(2011.5, 2023.5)
+
+    # Panel D: Median Household Income
+    ax4 = fig.add_subplot(gs[1, 1])
+    for race in race_groups:
+        ax4.plot(income_df['Year'], income_df[f'{race}_Median_Income'] / 1000,
+                 marker='s', linewidth=2.5, markersize=6,
+                 color=colors[race], label=race_labels[race])
+
+    ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax4.set_ylabel('Median Household Income ($1,000s)', fontsize=12, fontweight='bold')
+    ax4.set_title('D. Median Household Income by Race', fontsize=14, fontweight='bold', pad=15)
+    ax4.legend(loc='upper left', fontsize=10)
+    ax4.grid(True, alpha=0.3)
+    ax4.set_xlim(2011.5, 2023.5)
+
+    # Panel E: Median Population Age
+    ax5 = fig.add_subplot(gs[2, 0])
+    for race in race_groups:
+        ax5.plot(age_df['Year'], age_df[f'{race}_Median_Age'],
+                 marker='s', linewidth=2.5, markersize=6,
+                 color=colors[race], label=race_labels[race])
+
+    ax5.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax5.set_ylabel('Median Age (years)', fontsize=12, fontweight='bold')
+    ax5.set_title('E. Median Population Age by Race', fontsize=14, fontweight='bold', pad=15)
+    ax5.legend(loc='upper left', fontsize=10)
+    ax5.grid(True, alpha=0.3)
+    ax5.set_xlim(2011.5, 2023.5)
+
+    # Panel F: Key Finding Text Box
+    ax6 = fig.add_subplot(gs[2, 1])
+    ax6.axis('off')
+
+    text_content = """
 KEY FINDINGS: SES CONTEXT FOR OVERDOSE DISPARITIES (2023)
 
 OVERDOSE BURDEN:
@@ -173,21 +185,22 @@ These findings suggest structural inequities beyond individual-level
 SES factors drive racial disparities in overdose deaths.
 """
 
-ax6.text(0.05, 0.95, text_content, transform=ax6.transAxes,
-         fontsize=11, verticalalignment='top',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3),
-         family='monospace')
+    ax6.text(0.05, 0.95, text_content, transform=ax6.transAxes,
+             fontsize=11, verticalalignment='top',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3),
+             family='monospace')
 
-# Overall title
-fig.suptitle('Socioeconomic Context for Racial Disparities in Overdose Deaths\nLos Angeles County, 2012-2023',
-             fontsize=16, fontweight='bold', y=0.995)
+    # Overall title
+    fig.suptitle('Socioeconomic Context for Racial Disparities in Overdose Deaths\nLos Angeles County, 2012-2023',
+                 fontsize=16, fontweight='bold', y=0.995)
 
-# Save figure
-output_path = 'results/12_ses_context_figure/ses_context_figure.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved figure: {output_path}")
+    # Save figure
+    output_path = figure_path
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved figure: {output_path}")
 
-plt.close()
+    plt.close()
+    record_figure(output_path, figure_cache_key)
 
 print("\n" + "="*70)
 print("CREATING 2023 SNAPSHOT TABLE")
@@ -13,6 +13,11 @@ import matplotlib.pyplot as plt
 from scipy import stats
 import seaborn as sns
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+
 print("="*70)
 print("TEMPORAL CORRELATION ANALYSIS: SES vs OVERDOSE RATES")
 print("="*70)
@@ -179,89 +184,90 @@ for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
 # VISUALIZATION: Scatter Plots
 # ============================================================================
 
-print("\n" + "="*70)
-print("CREATING VISUALIZATION")
-print("="*70)
-
-fig, axes = plt.subplots(2, 4, figsize=(24, 12))
-
-for idx, race in enumerate(['WHITE', 'BLACK', 'LATINE', 'ASIAN']):
-    # Top row: Poverty vs Overdose Rate
-    ax1 = axes[0, idx]
-
-    overdose_race = overdose_df[overdose_df['Race'] == race].copy()
-    overdose_race = overdose_race[overdose_race['Year'] != 2020]
-
-    poverty_race = poverty_df[['Year', f'{race}_Poverty_Rate']].copy()
-    poverty_race.columns = ['Year', 'Poverty_Rate']
-
-    merged = overdose_race.merge(poverty_race, on='Year')
-
-    ax1.scatter(merged['Poverty_Rate'], merged['Rate_per_100k'],
-                s=100, alpha=0.7, color=colors[race])
-
-    # Add trend line
-    if len(merged) > 2:
-        z = np.polyfit(merged['Poverty_Rate'], merged['Rate_per_100k'], 1)
-        p = np.poly1d(z)
-        x_line = np.linspace(merged['Poverty_Rate'].min(), merged['Poverty_Rate'].max(), 100)
-        ax1.plot(x_line, p(x_line), "--", color=colors[race], alpha=0.5, linewidth=2)
-
-        # Add correlation
-        corr, pval = stats.pearsonr(merged['Poverty_Rate'], merged['Rate_per_100k'])
-        sig = "***" if pval < 0.001 else "**" if pval < 0.01 else "*" if pval < 0.05 else ""
-        ax1.text(0.05, 0.95, f'r = {corr:+.3f}{sig}',
-                transform=ax1.transAxes, fontsize=11, fontweight='bold',
-                verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-
-    ax1.set_xlabel('Poverty Rate (%)', fontsize=11, fontweight='bold')
-    ax1.set_ylabel('Overdose Deaths per 100k', fontsize=11, fontweight='bold')
-    ax1.set_title(f'{race_labels[race]}: Poverty vs Overdose Rate',
-                  fontsize=12, fontweight='bold')
-    ax1.grid(True, alpha=0.3)
-
-    # Bottom row: Income vs Overdose Rate
-    ax2 = axes[1, idx]
-
-    income_race = income_df[['Year', f'{race}_Median_Income']].copy()
-    income_race.columns = ['Year', 'Median_Income']
-
-    merged = overdose_race.merge(income_race, on='Year')
-
-    ax2.scatter(merged['Median_Income']/1000, merged['Rate_per_100k'],
-                s=100, alpha=0.7, color=colors[race])
-
-    # Add trend line
-    if len(merged) > 2:
-        z = np.polyfit(merged['Median_Income'], merged['Rate_per_100k'], 1)
-        p = np.poly1d(z)
-        x_line = np.linspace(merged['Median_Income'].min(), merged['Median_Income'].max(), 100)
-        ax2.plot(x_line/1000, p(x_line), "--", color=colors[race], alpha=0.5, linewidth=2)
-
-        # Add correlation
-        corr, pval = stats.pearsonr(merged['Median_Income'], merged['Rate_per_100k'])
-        sig = "***" if pval < 0.001 else "**" if pval < 0.01 else "*" if pval < 0.05 else ""
-        ax2.text(0.05, 0.95, f'r = {corr:+.3f}{sig}',
-                transform=ax2.transAxes, fontsize=11, fontweight='bold',
-                verticalalignment='top',
-                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-
-    ax2.set_xlabel('Median Household Income ($1,000s)', fontsize=11, fontweight='bold')
-    ax2.set_ylabel('Overdose Deaths per 100k', fontsize=11, fontweight='bold')
-    ax2.set_title(f'{race_labels[race]}: Income vs Overdose Rate',
-                  fontsize=12, fontweight='bold')
-    ax2.grid(True, alpha=0.3)
-
-plt.suptitle('Temporal Correlations: Socioeconomic Status vs Overdose Death Rates\n' +
-             'Los Angeles County, 2012-2023 (excluding 2020)',
-             fontsize=16, fontweight='bold', y=0.995)
-
-plt.tight_layout()
-output_path = 'results/13_temporal_correlation/temporal_correlation_scatterplots.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved scatter plots: {output_path}")
-plt.close()
+if plots_enabled():
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATION")
+    print("="*70)
+
+    fig, axes = plt.subplots(2, 4, figsize=(24, 12))
+
+    for idx, race in enumerate(['WHITE', 'BLACK', 'LATINE', 'ASIAN']):
+        # Top row: Poverty vs Overdose Rate
+        ax1 = axes[0, idx]
+
+        overdose_race = overdose_df[overdose_df['Race'] == race].copy()
+        overdose_race = overdose_race[overdose_race['Year'] != 2020]
+
+        poverty_race = poverty_df[['Year', f'{race}_Poverty_Rate']].copy()
+        poverty_race.columns = ['Year', 'Poverty_Rate']
+
+        merged = overdose_race.merge(poverty_race, on='Year')
+
+        ax1.scatter(merged['Poverty_Rate'], merged['Rate_per_100k'],
+                    s=100, alpha=0.7, color=colors[race])
+
+        # Add trend line
+        if len(merged) > 2:
+            z = np.polyfit(merged['Poverty_Rate'], merged['Rate_per_100k'], 1)
+            p = np.poly1d(z)
+            x_line = np.linspace(merged['Poverty_Rate'].min(), merged['Poverty_Rate'].max(), 100)
+            ax1.plot(x_line, p(x_line), "--", color=colors[race], alpha=0.5, linewidth=2)
+
+            # Add correlation
+            corr, pval = stats.pearsonr(merged['Poverty_Rate'], merged['Rate_per_100k'])
+            sig = "***" if pval < 0.001 else "**" if pval < 0.01 else "*" if pval < 0.05 else ""
+            ax1.text(0.05, 0.95, f'r = {corr:+.3f}{sig}',
+                    transform=ax1.transAxes, fontsize=11, fontweight='bold',
+                    verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+        ax1.set_xlabel('Poverty Rate (%)', fontsize=11, fontweight='bold')
+        ax1.set_ylabel('Overdose Deaths per 100k', fontsize=11, fontweight='bold')
+        ax1.set_title(f'{race_labels[race]}: Poverty vs Overdose Rate',
+                      fontsize=12, fontweight='bold')
+        ax1.grid(True, alpha=0.3)
+
+        # Bottom row: Income vs Overdose Rate
+        ax2 = axes[1, idx]
+
+        income_race = income_df[['Year', f'{race}_Median_Income']].copy()
+        income_race.columns = ['Year', 'Median_Income']
+
+        merged = overdose_race.merge(income_race, on='Year')
+
+        ax2.scatter(merged['Median_Income']/1000, merged['Rate_per_100k'],
+                    s=100, alpha=0.7, color=colors[race])
+
+        # Add trend line
+        if len(merged) > 2:
+            z = np.polyfit(merged['Median_Income'], merged['Rate_per_100k'], 1)
+            p = np.poly1d(z)
+            x_line = np.linspace(merged['Median_Income'].min(), merged['Median_Income'].max(), 100)
+            ax2.plot(x_line/1000, p(x_line), "--", color=colors[race], alpha=0.5, linewidth=2)
+
+            # Add correlation
+            corr, pval = stats.pearsonr(merged['Median_Income'], merged['Rate_per_100k'])
+            sig = "***" if pval < 0.001 else "**" if pval < 0.01 else "*" if pval < 0.05 else ""
+            ax2.text(0.05, 0.95, f'r = {corr:+.3f}{sig}',
+                    transform=ax2.transAxes, fontsize=11, fontweight='bold',
+                    verticalalignment='top',
+                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+        ax2.set_xlabel('Median Household Income ($1,000s)', fontsize=11, fontweight='bold')
+        ax2.set_ylabel('Overdose Deaths per 100k', fontsize=11, fontweight='bold')
+        ax2.set_title(f'{race_labels[race]}: Income vs Overdose Rate',
+                      fontsize=12, fontweight='bold')
+        ax2.grid(True, alpha=0.3)
+
+    plt.suptitle('Temporal Correlations: Socioeconomic Status vs Overdose Death Rates\n' +
+                 'Los Angeles County, 2012-2023 (excluding 2020)',
+                 fontsize=16, fontweight='bold', y=0.995)
+
+    plt.tight_layout()
+    output_path = 'results/13_temporal_correlation/temporal_correlation_scatterplots.png'
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved scatter plots: {output_path}")
+    plt.close()
 
 # ============================================================================
 # Save Correlation Results Table
@@ -11,6 +11,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data, standardize_race, MAJOR_RACE_RULES
 
 print("="*70)
 print("YEARS OF POTENTIAL LIFE LOST (YPLL) ANALYSIS")
@@ -18,20 +23,12 @@ print("="*70)
 
 # Load data
 print("\nLoading data...")
-df = pd.read_csv('data/2012-01-2024-08-overdoses.csv', low_memory=False)
+df = load_overdose_data('data/2012-01-2024-08-overdoses.csv')
 population_df = pd.read_csv('data/la_county_population_census.csv')
 
 print(f"✓ Loaded {len(df):,} overdose records")
 print(f"✓ Loaded {len(population_df)} years of population data")
 
-# Process dates to extract year
-df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-if 'DateofDeath' in df.columns:
-    df['Date of Death'] = df['Date of Death'].fillna(
-        pd.to_datetime(df['DateofDeath'], errors='coerce')
-    )
-df['Year'] = df['Date of Death'].dt.year
-
 # Filter to 2012-2023
 df = df[df['Year'].between(2012, 2023)].copy()
 print(f"✓ Filtered to {len(df):,} records (2012-2023)")
@@ -43,14 +40,8 @@ else:
     df['Age'] = pd.to_numeric(df['Age'], errors='coerce')
 
 # Process Race/Ethnicity
-conditions = [
-    df['Race'].isin(["CAUCASIAN", "WHITE", "White/Caucasian"]),
-    df['Race'].isin(["LATINE", "HISPANIC/LATIN AMERICAN", "Hispanic/Latino"]) | df['Race'].str.contains("Hispanic", na=False),
-    df['Race'].isin(["BLACK", "Black"]),
-    df['Race'].isin(["ASIAN", "Asian", "CHINESE", "FILIPINO", "JAPANESE", "KOREAN", "VIETNAMESE"]),
-]
-choices = ['WHITE', 'LATINE', 'BLACK', 'ASIAN']
-df['Race_Ethnicity_Cleaned'] = np.select(conditions, choices, default=None)
+df = standardize_race(df, rules=MAJOR_RACE_RULES, as_category=False)
+df.loc[df['Race_Ethnicity_Cleaned'] == 'OTHER', 'Race_Ethnicity_Cleaned'] = None
 
 # Remove missing age or race
 df = df[df['Age'].notna() & df['Race_Ethnicity_Cleaned'].notna()].copy()
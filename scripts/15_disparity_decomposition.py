@@ -14,6 +14,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+
 print("="*70)
 print("DISPARITY DECOMPOSITION ANALYSIS")
 print("="*70)
@@ -221,101 +226,102 @@ for _, row in decomp_df.iterrows():
 # VISUALIZATION
 # ============================================================================
 
-print("\n" + "="*70)
-print("CREATING VISUALIZATION")
-print("="*70)
-
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-# Panel A: Disparity ratios over time
-ax1 = axes[0, 0]
-ax1.plot(decomp_df['Year'], decomp_df['OD_Ratio'],
-         marker='o', linewidth=2.5, markersize=8,
-         color='#ED0000', label='Overdose Disparity (Black/White)', zorder=3)
-ax1.plot(decomp_df['Year'], decomp_df['Poverty_Ratio'],
-         marker='s', linewidth=2, markersize=7,
-         color='#4472C4', label='Poverty Ratio (Black/White)', linestyle='--', zorder=2)
-ax1.plot(decomp_df['Year'], decomp_df['Income_Ratio_Inverse'],
-         marker='^', linewidth=2, markersize=7,
-         color='#70AD47', label='Inverse Income Ratio (White/Black)', linestyle='--', zorder=2)
-
-ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=1, alpha=0.3, label='Parity')
-ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Ratio (Black / White)', fontsize=12, fontweight='bold')
-ax1.set_title('A. Overdose Disparity vs SES Disparities Over Time',
-              fontsize=14, fontweight='bold', pad=15)
-ax1.legend(fontsize=10, loc='upper left')
-ax1.grid(True, alpha=0.3)
-ax1.set_xlim(2011.5, 2023.5)
-
-# Panel B: Percent unexplained by poverty
-ax2 = axes[0, 1]
-ax2.bar(decomp_df['Year'], decomp_df['Pct_Unexplained'],
-        color='#ED7D31', alpha=0.7, edgecolor='black')
-ax2.axhline(y=50, color='red', linestyle='--', linewidth=2, alpha=0.5,
-            label='50% threshold')
-ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax2.set_ylabel('% of Disparity Unexplained by Poverty', fontsize=12, fontweight='bold')
-ax2.set_title('B. Proportion of Disparity Not Explained by Poverty',
-              fontsize=14, fontweight='bold', pad=15)
-ax2.legend(fontsize=10)
-ax2.grid(True, alpha=0.3, axis='y')
-ax2.set_xlim(2011.5, 2023.5)
-
-# Panel C: Cross-sectional comparison (2023)
-ax3 = axes[1, 0]
-
-races = ['WHITE', 'BLACK', 'LATINE', 'ASIAN']
-colors_race = {'WHITE': '#4472C4', 'BLACK': '#ED7D31',
-               'LATINE': '#A5A5A5', 'ASIAN': '#FFC000'}
-
-# Normalize to White = 1.0
-white_vals = {
-    'OD_Rate': white_rate,
-    'Poverty': white_pov,
-    'Income': white_inc
-}
-
-comparison_data = []
-for race in races:
-    od_val = overdose_2023.loc[race, 'Rate_per_100k'] / white_vals['OD_Rate']
-    pov_val = poverty_2023[f'{race}_Poverty_Rate'] / white_vals['Poverty']
-    inc_val = income_2023[f'{race}_Median_Income'] / white_vals['Income']
-
-    comparison_data.append({
-        'Race': race,
-        'OD_Rate_Ratio': od_val,
-        'Poverty_Ratio': pov_val,
-        'Income_Ratio': inc_val
-    })
-
-comp_df = pd.DataFrame(comparison_data)
-
-x = np.arange(len(races))
-width = 0.25
-
-bars1 = ax3.bar(x - width, comp_df['OD_Rate_Ratio'], width,
-                label='Overdose Rate', color='#ED0000', alpha=0.8)
-bars2 = ax3.bar(x, comp_df['Poverty_Ratio'], width,
-                label='Poverty Rate', color='#4472C4', alpha=0.8)
-bars3 = ax3.bar(x + width, comp_df['Income_Ratio'], width,
-                label='Income', color='#70AD47', alpha=0.8)
-
-ax3.axhline(y=1.0, color='black', linestyle='-', linewidth=2, alpha=0.5)
-ax3.set_xlabel('Race/Ethnicity', fontsize=12, fontweight='bold')
-ax3.set_ylabel('Ratio (Relative to White)', fontsize=12, fontweight='bold')
-ax3.set_title('C. 2023 Cross-Sectional Comparison (White = 1.0)',
-              fontsize=14, fontweight='bold', pad=15)
-ax3.set_xticks(x)
-ax3.set_xticklabels(['White (NH)', 'Black (NH)', 'Latine', 'Asian (NH)'])
-ax3.legend(fontsize=10)
-ax3.grid(True, alpha=0.3, axis='y')
-
-# Panel D: Text summary
-ax4 = axes[1, 1]
-ax4.axis('off')
-
-summary_text = f"""
+if plots_enabled():
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATION")
+    print("="*70)
+
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # Panel A: Disparity ratios over time
+    ax1 = axes[0, 0]
+    ax1.plot(decomp_df['Year'], decomp_df['OD_Ratio'],
+             marker='o', linewidth=2.5, markersize=8,
+             color='#ED0000', label='Overdose Disparity (Black/White)', zorder=3)
+    ax1.plot(decomp_df['Year'], decomp_df['Poverty_Ratio'],
+             marker='s', linewidth=2, markersize=7,
+             color='#4472C4', label='Poverty Ratio (Black/White)', linestyle='--', zorder=2)
+    ax1.plot(decomp_df['Year'], decomp_df['Income_Ratio_Inverse'],
+             marker='^', linewidth=2, markersize=7,
+             color='#70AD47', label='Inverse Income Ratio (White/Black)', linestyle='--', zorder=2)
+
+    ax1.axhline(y=1.0, color='black', linestyle='-', linewidth=1, alpha=0.3, label='Parity')
+    ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Ratio (Black / White)', fontsize=12, fontweight='bold')
+    ax1.set_title('A. Overdose Disparity vs SES Disparities Over Time',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax1.legend(fontsize=10, loc='upper left')
+    ax1.grid(True, alpha=0.3)
+    ax1.set_xlim(2011.5, 2023.5)
+
+    # Panel B: Percent unexplained by poverty
+    ax2 = axes[0, 1]
+    ax2.bar(decomp_df['Year'], decomp_df['Pct_Unexplained'],
+            color='#ED7D31', alpha=0.7, edgecolor='black')
+    ax2.axhline(y=50, color='red', linestyle='--', linewidth=2, alpha=0.5,
+                label='50% threshold')
+    ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('% of Disparity Unexplained by Poverty', fontsize=12, fontweight='bold')
+    ax2.set_title('B. Proportion of Disparity Not Explained by Poverty',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax2.legend(fontsize=10)
+    ax2.grid(True, alpha=0.3, axis='y')
+    ax2.set_xlim(2011.5, 2023.5)
+
+    # Panel C: Cross-sectional comparison (2023)
+    ax3 = axes[1, 0]
+
+    races = ['WHITE', 'BLACK', 'LATINE', 'ASIAN']
+    colors_race = {'WHITE': '#4472C4', 'BLACK': '#ED7D31',
+                   'LATINE': '#A5A5A5', 'ASIAN': '#FFC000'}
+
+    # Normalize to White = 1.0
+    white_vals = {
+        'OD_Rate': white_rate,
+        'Poverty': white_pov,
+        'Income': white_inc
+    }
+
+    comparison_data = []
+    for race in races:
+        od_val = overdose_2023.loc[race, 'Rate_per_100k'] / white_vals['OD_Rate']
+        pov_val = poverty_2023[f'{race}_Poverty_Rate'] / white_vals['Poverty']
+        inc_val = income_2023[f'{race}_Median_Income'] / white_vals['Income']
+
+        comparison_data.append({
+            'Race': race,
+            'OD_Rate_Ratio': od_val,
+            'Poverty_Ratio': pov_val,
+            'Income_Ratio': inc_val
+        })
+
+    comp_df = pd.DataFrame(comparison_data)
+
+    x = np.arange(len(races))
+    width = 0.25
+
+    bars1 = ax3.bar(x - width, comp_df['OD_Rate_Ratio'], width,
+                    label='Overdose Rate', color='#ED0000', alpha=0.8)
+    bars2 = ax3.bar(x, comp_df['Poverty_Ratio'], width,
+                    label='Poverty Rate', color='#4472C4', alpha=0.8)
+    bars3 = ax3.bar(x + width, comp_df['Income_Ratio'], width,
+                    label='Income', color='#70AD47', alpha=0.8)
+
+    ax3.axhline(y=1.0, color='black', linestyle='-', linewidth=2, alpha=0.5)
+    ax3.set_xlabel('Race/Ethnicity', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Ratio (Relative to White)', fontsize=12, fontweight='bold')
+    ax3.set_title('C. 2023 Cross-Sectional Comparison (White = 1.0)',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(['White (NH)', 'Black (NH)', 'Latine', 'Asian (NH)'])
+    ax3.legend(fontsize=10)
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    # Panel D: Text summary
+    ax4 = axes[1, 1]
+    ax4.axis('off')
+
+    summary_text = f"""
 DISPARITY DECOMPOSITION SUMMARY (2023)
 
 OBSERVED DISPARITIES:
@@ -363,19 +369,19 @@ This residual disparity likely reflects:
   • Structural racism and systemic inequities
 """
 
-ax4.text(0.05, 0.95, summary_text, transform=ax4.transAxes,
-         fontsize=10, verticalalignment='top', family='monospace',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+    ax4.text(0.05, 0.95, summary_text, transform=ax4.transAxes,
+             fontsize=10, verticalalignment='top', family='monospace',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
 
-plt.suptitle('Disparity Decomposition: SES-Explained vs Structural Factors\n' +
-             'Black-White Overdose Disparity in Los Angeles County',
-             fontsize=16, fontweight='bold', y=0.995)
+    plt.suptitle('Disparity Decomposition: SES-Explained vs Structural Factors\n' +
+                 'Black-White Overdose Disparity in Los Angeles County',
+                 fontsize=16, fontweight='bold', y=0.995)
 
-plt.tight_layout()
-output_path = 'results/15_disparity_decomposition/disparity_decomposition.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved figure: {output_path}")
-plt.close()
+    plt.tight_layout()
+    output_path = 'results/15_disparity_decomposition/disparity_decomposition.png'
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved figure: {output_path}")
+    plt.close()
 
 # Save decomposition table
 decomp_df.to_csv('results/15_disparity_decomposition/disparity_decomposition_annual.csv', index=False)
@@ -12,6 +12,12 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.gridspec import GridSpec
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+from figure_queue import figure_key, figure_current, record_figure
+
 print("="*70)
 print("CREATING COMPREHENSIVE PUBLICATION FIGURE")
 print("="*70)
@@ -25,211 +31,217 @@ decomp_df = pd.read_csv('results/16_comprehensive_publication/disparity_decompos
 
 print("✓ Loaded all datasets")
 
-# Set styling
-plt.style.use('seaborn-v0_8-whitegrid')
-colors = {
-    'WHITE': '#4472C4',
-    'BLACK': '#ED7D31',
-    'LATINE': '#A5A5A5',
-    'ASIAN': '#FFC000'
-}
-
-race_labels = {
-    'WHITE': 'White (NH)',
-    'BLACK': 'Black (NH)',
-    'LATINE': 'Latine',
-    'ASIAN': 'Asian (NH)'
-}
-
-# Create figure with custom gridspec
-fig = plt.figure(figsize=(24, 16))
-gs = GridSpec(4, 3, figure=fig, hspace=0.4, wspace=0.3)
-
-# ============================================================================
-# PANEL A: Overdose Death Rates Over Time
-# ============================================================================
-
-ax1 = fig.add_subplot(gs[0, :2])
-
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    race_data = overdose_df[overdose_df['Race'] == race]
-    ax1.plot(race_data['Year'], race_data['Rate_per_100k'],
-             marker='o', linewidth=3, markersize=8,
-             color=colors[race], label=race_labels[race], alpha=0.9)
-
-ax1.set_xlabel('Year', fontsize=13, fontweight='bold')
-ax1.set_ylabel('Overdose Deaths per 100,000', fontsize=13, fontweight='bold')
-ax1.set_title('A. Population-Adjusted Overdose Death Rates by Race',
-              fontsize=15, fontweight='bold', pad=15, loc='left')
-ax1.legend(loc='upper left', fontsize=12, framealpha=0.9)
-ax1.grid(True, alpha=0.4)
-ax1.set_xlim(2011.5, 2023.5)
-
-# Add annotation for key finding
-ax1.annotate('Black rate surpasses\nWhite rate (2019)',
-            xy=(2019, 55), xytext=(2016, 75),
-            arrowprops=dict(arrowstyle='->', color='red', lw=2),
-            fontsize=11, fontweight='bold', color='red',
-            bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7))
-
-# ============================================================================
-# PANEL B: Disparity Ratios Over Time
-# ============================================================================
-
-ax2 = fig.add_subplot(gs[0, 2])
-
-for race in ['BLACK', 'LATINE', 'ASIAN']:
-    race_data = overdose_df[overdose_df['Race'] == race]
-    ax2.plot(race_data['Year'], race_data['Disparity_Ratio'],
-             marker='o', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax2.axhline(y=1.0, color='black', linestyle='--', linewidth=2, alpha=0.5,
-            label='Proportional (no disparity)')
-ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Disparity Ratio', fontsize=12, fontweight='bold')
-ax2.set_title('B. Disparity Ratios\n(% Deaths / % Population)',
-              fontsize=14, fontweight='bold', pad=10, loc='left')
-ax2.legend(loc='upper left', fontsize=10)
-ax2.grid(True, alpha=0.4)
-ax2.set_xlim(2011.5, 2023.5)
-
-# ============================================================================
-# PANEL C: YPLL Rates
-# ============================================================================
-
-ax3 = fig.add_subplot(gs[1, 0])
-
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    race_data = ypll_df[ypll_df['Race'] == race]
-    ax3.plot(race_data['Year'], race_data['YPLL_Rate_per_100k'],
-             marker='s', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax3.set_ylabel('YPLL per 100,000', fontsize=12, fontweight='bold')
-ax3.set_title('C. Years of Potential\nLife Lost (YPLL) Rates',
-              fontsize=14, fontweight='bold', pad=10, loc='left')
-ax3.legend(loc='upper left', fontsize=10)
-ax3.grid(True, alpha=0.4)
-ax3.set_xlim(2011.5, 2023.5)
-
-# ============================================================================
-# PANEL D: Poverty Rates
-# ============================================================================
-
-ax4 = fig.add_subplot(gs[1, 1])
-
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    ax4.plot(poverty_df['Year'], poverty_df[f'{race}_Poverty_Rate'],
-             marker='s', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax4.set_ylabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
-ax4.set_title('D. Poverty Rates by Race\n(Decreasing Over Time)',
-              fontsize=14, fontweight='bold', pad=10, loc='left')
-ax4.legend(loc='upper right', fontsize=10)
-ax4.grid(True, alpha=0.4)
-ax4.set_xlim(2011.5, 2023.5)
-
-# Add annotation
-ax4.annotate('Poverty declining\nwhile overdoses rising',
-            xy=(2018, 20), xytext=(2015, 14),
-            arrowprops=dict(arrowstyle='->', color='darkgreen', lw=1.5),
-            fontsize=10, color='darkgreen',
-            bbox=dict(boxstyle='round,pad=0.3', facecolor='lightgreen', alpha=0.6))
-
-# ============================================================================
-# PANEL E: Median Income
-# ============================================================================
-
-ax5 = fig.add_subplot(gs[1, 2])
-
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    ax5.plot(income_df['Year'], income_df[f'{race}_Median_Income']/1000,
-             marker='s', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax5.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax5.set_ylabel('Median Income ($1,000s)', fontsize=12, fontweight='bold')
-ax5.set_title('E. Median Household Income\n(Rising Over Time)',
-              fontsize=14, fontweight='bold', pad=10, loc='left')
-ax5.legend(loc='upper left', fontsize=10)
-ax5.grid(True, alpha=0.4)
-ax5.set_xlim(2011.5, 2023.5)
-
-# ============================================================================
-# PANEL F: 2023 Snapshot Comparison
-# ============================================================================
-
-ax6 = fig.add_subplot(gs[2, :])
-
-# Get 2023 data
-overdose_2023 = overdose_df[overdose_df['Year'] == 2023].set_index('Race')
-poverty_2023 = poverty_df[poverty_df['Year'] == 2023].iloc[0]
-income_2023 = income_df[income_df['Year'] == 2023].iloc[0]
-ypll_2023 = ypll_df[ypll_df['Year'] == 2023].set_index('Race')
-
-races = ['BLACK', 'WHITE', 'LATINE', 'ASIAN']
-x_pos = np.arange(len(races))
-width = 0.18
-
-# Normalize all metrics to White = 1.0
-metrics = []
-for race in races:
-    od_norm = overdose_2023.loc[race, 'Rate_per_100k'] / overdose_2023.loc['WHITE', 'Rate_per_100k']
-    pov_norm = poverty_2023[f'{race}_Poverty_Rate'] / poverty_2023['WHITE_Poverty_Rate']
-    inc_norm = income_2023[f'{race}_Median_Income'] / income_2023['WHITE_Median_Income']
-    ypll_norm = ypll_2023.loc[race, 'YPLL_Rate_per_100k'] / ypll_2023.loc['WHITE', 'YPLL_Rate_per_100k']
-
-    metrics.append({
-        'Race': race,
-        'OD_Rate': od_norm,
-        'Poverty': pov_norm,
-        'Income': inc_norm,
-        'YPLL': ypll_norm
-    })
-
-metrics_df = pd.DataFrame(metrics)
-
-bars1 = ax6.bar(x_pos - 1.5*width, metrics_df['OD_Rate'], width,
-                label='Overdose Rate', color='#ED0000', alpha=0.85, edgecolor='black', linewidth=1)
-bars2 = ax6.bar(x_pos - 0.5*width, metrics_df['YPLL'], width,
-                label='YPLL Rate', color='#C00000', alpha=0.85, edgecolor='black', linewidth=1)
-bars3 = ax6.bar(x_pos + 0.5*width, metrics_df['Poverty'], width,
-                label='Poverty Rate', color='#4472C4', alpha=0.85, edgecolor='black', linewidth=1)
-bars4 = ax6.bar(x_pos + 1.5*width, metrics_df['Income'], width,
-                label='Median Income', color='#70AD47', alpha=0.85, edgecolor='black', linewidth=1)
-
-ax6.axhline(y=1.0, color='black', linestyle='-', linewidth=2.5, alpha=0.7, zorder=1)
-ax6.text(len(races)-0.3, 1.05, 'White Baseline', fontsize=11, fontweight='bold', ha='right')
-
-ax6.set_xlabel('Race/Ethnicity', fontsize=13, fontweight='bold')
-ax6.set_ylabel('Ratio (Relative to White = 1.0)', fontsize=13, fontweight='bold')
-ax6.set_title('F. 2023 Cross-Sectional Comparison: Overdose Burden vs Socioeconomic Status',
-              fontsize=15, fontweight='bold', pad=15, loc='left')
-ax6.set_xticks(x_pos)
-ax6.set_xticklabels([race_labels[r] for r in races], fontsize=12)
-ax6.legend(loc='upper right', fontsize=11, ncol=4, framealpha=0.9)
-ax6.grid(True, alpha=0.4, axis='y')
-ax6.set_ylim(0, 2.6)
-
-# Add value labels on bars for Black (most important)
-for i, bar in enumerate([bars1[0], bars2[0], bars3[0], bars4[0]]):
-    height = bar.get_height()
-    ax6.text(bar.get_x() + bar.get_width()/2., height + 0.05,
-             f'{height:.2f}x',
-             ha='center', va='bottom', fontsize=10, fontweight='bold')
-
-# ============================================================================
-# PANEL G: Key Findings Text Box
-# ============================================================================
-
-ax7 = fig.add_subplot(gs[3, :])
-ax7.axis('off')
-
-key_findings_text = """
+# Redraw only when the data, this script or the plot style changed
+figure_path = 'results/16_comprehensive_publication/COMPREHENSIVE_PUBLICATION_FIGURE.png'
+figure_cache_key = figure_key([overdose_df, poverty_df, income_df, ypll_df, decomp_df], __file__)
+if plots_enabled() and figure_current(figure_path, figure_cache_key):
+    print(f"\n✓ Figure unchanged: {figure_path}")
+elif plots_enabled():
+    # Set styling
+    plt.style.use('seaborn-v0_8-whitegrid')
+    colors = {
+        'WHITE': '#4472C4',
+        'BLACK': '#ED7D31',
+        'LATINE': '#A5A5A5',
+        'ASIAN': '#FFC000'
+    }
+
+    race_labels = {
+        'WHITE': 'White (NH)',
+        'BLACK': 'Black (NH)',
+        'LATINE': 'Latine',
+        'ASIAN': 'Asian (NH)'
+    }
+
+    # Create figure with custom gridspec
+    fig = plt.figure(figsize=(24, 16))
+    gs = GridSpec(4, 3, figure=fig, hspace=0.4, wspace=0.3)
+
+    # ============================================================================
+    # PANEL A: Overdose Death Rates Over Time
+    # ============================================================================
+
+    ax1 = fig.add_subplot(gs[0, :2])
+
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        race_data = overdose_df[overdose_df['Race'] == race]
+        ax1.plot(race_data['Year'], race_data['Rate_per_100k'],
+                 marker='o', linewidth=3, markersize=8,
+                 color=colors[race], label=race_labels[race], alpha=0.9)
+
+    ax1.set_xlabel('Year', fontsize=13, fontweight='bold')
+    ax1.set_ylabel('Overdose Deaths per 100,000', fontsize=13, fontweight='bold')
+    ax1.set_title('A. Population-Adjusted Overdose Death Rates by Race',
+                  fontsize=15, fontweight='bold', pad=15, loc='left')
+    ax1.legend(loc='upper left', fontsize=12, framealpha=0.9)
+    ax1.grid(True, alpha=0.4)
+    ax1.set_xlim(2011.5, 2023.5)
+
+    # Add annotation for key finding
+    ax1.annotate('Black rate surpasses\nWhite rate (2019)',
+                xy=(2019, 55), xytext=(2016, 75),
+                arrowprops=dict(arrowstyle='->', color='red', lw=2),
+                fontsize=11, fontweight='bold', color='red',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7))
+
+    # ============================================================================
+    # PANEL B: Disparity Ratios Over Time
+    # ============================================================================
+
+    ax2 = fig.add_subplot(gs[0, 2])
+
+    for race in ['BLACK', 'LATINE', 'ASIAN']:
+        race_data = overdose_df[overdose_df['Race'] == race]
+        ax2.plot(race_data['Year'], race_data['Disparity_Ratio'],
+                 marker='o', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax2.axhline(y=1.0, color='black', linestyle='--', linewidth=2, alpha=0.5,
+                label='Proportional (no disparity)')
+    ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Disparity Ratio', fontsize=12, fontweight='bold')
+    ax2.set_title('B. Disparity Ratios\n(% Deaths / % Population)',
+                  fontsize=14, fontweight='bold', pad=10, loc='left')
+    ax2.legend(loc='upper left', fontsize=10)
+    ax2.grid(True, alpha=0.4)
+    ax2.set_xlim(2011.5, 2023.5)
+
+    # ============================================================================
+    # PANEL C: YPLL Rates
+    # ============================================================================
+
+    ax3 = fig.add_subplot(gs[1, 0])
+
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        race_data = ypll_df[ypll_df['Race'] == race]
+        ax3.plot(race_data['Year'], race_data['YPLL_Rate_per_100k'],
+                 marker='s', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('YPLL per 100,000', fontsize=12, fontweight='bold')
+    ax3.set_title('C. Years of Potential\nLife Lost (YPLL) Rates',
+                  fontsize=14, fontweight='bold', pad=10, loc='left')
+    ax3.legend(loc='upper left', fontsize=10)
+    ax3.grid(True, alpha=0.4)
+    ax3.set_xlim(2011.5, 2023.5)
+
+    # ============================================================================
+    # PANEL D: Poverty Rates
+    # ============================================================================
+
+    ax4 = fig.add_subplot(gs[1, 1])
+
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        ax4.plot(poverty_df['Year'], poverty_df[f'{race}_Poverty_Rate'],
+                 marker='s', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax4.set_ylabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
+    ax4.set_title('D. Poverty Rates by Race\n(Decreasing Over Time)',
+                  fontsize=14, fontweight='bold', pad=10, loc='left')
+    ax4.legend(loc='upper right', fontsize=10)
+    ax4.grid(True, alpha=0.4)
+    ax4.set_xlim(2011.5, 2023.5)
+
+    # Add annotation
+    ax4.annotate('Poverty declining\nwhile overdoses rising',
+                xy=(2018, 20), xytext=(2015, 14),
+                arrowprops=dict(arrowstyle='->', color='darkgreen', lw=1.5),
+                fontsize=10, color='darkgreen',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor='lightgreen', alpha=0.6))
+
+    # ============================================================================
+    # PANEL E: Median Income
+    # ============================================================================
+
+    ax5 = fig.add_subplot(gs[1, 2])
+
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        ax5.plot(income_df['Year'], income_df[f'{race}_Median_Income']/1000,
+                 marker='s', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax5.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax5.set_ylabel('Median Income ($1,000s)', fontsize=12, fontweight='bold')
+    ax5.set_title('E. Median Household Income\n(Rising Over Time)',
+                  fontsize=14, fontweight='bold', pad=10, loc='left')
+    ax5.legend(loc='upper left', fontsize=10)
+    ax5.grid(True, alpha=0.4)
+    ax5.set_xlim(2011.5, 2023.5)
+
+    # ============================================================================
+    # PANEL F: 2023 Snapshot Comparison
+    # ============================================================================
+
+    ax6 = fig.add_subplot(gs[2, :])
+
+    # Get 2023 data
+    overdose_2023 = overdose_df[overdose_df['Year'] == 2023].set_index('Race')
+    poverty_2023 = poverty_df[poverty_df['Year'] == 2023].iloc[0]
+    income_2023 = income_df[income_df['Year'] == 2023].iloc[0]
+    ypll_2023 = ypll_df[ypll_df['Year'] == 2023].set_index('Race')
+
+    races = ['BLACK', 'WHITE', 'LATINE', 'ASIAN']
+    x_pos = np.arange(len(races))
+    width = 0.18
+
+    # Normalize all metrics to White = 1.0
+    metrics = []
+    for race in races:
+        od_norm = overdose_2023.loc[race, 'Rate_per_100k'] / overdose_2023.loc['WHITE', 'Rate_per_100k']
+        pov_norm = poverty_2023[f'{race}_Poverty_Rate'] / poverty_2023['WHITE_Poverty_Rate']
+        inc_norm = income_2023[f'{race}_Median_Income'] / income_2023['WHITE_Median_Income']
+        ypll_norm = ypll_2023.loc[race, 'YPLL_Rate_per_100k'] / ypll_2023.loc['WHITE', 'YPLL_Rate_per_100k']
+
+        metrics.append({
+            'Race': race,
+            'OD_Rate': od_norm,
+            'Poverty': pov_norm,
+            'Income': inc_norm,
+            'YPLL': ypll_norm
+        })
+
+    metrics_df = pd.DataFrame(metrics)
+
+    bars1 = ax6.bar(x_pos - 1.5*width, metrics_df['OD_Rate'], width,
+                    label='Overdose Rate', color='#ED0000', alpha=0.85, edgecolor='black', linewidth=1)
+    bars2 = ax6.bar(x_pos - 0.5*width, metrics_df['YPLL'], width,
+                    label='YPLL Rate', color='#C00000', alpha=0.85, edgecolor='black', linewidth=1)
+    bars3 = ax6.bar(x_pos + 0.5*width, metrics_df['Poverty'], width,
+                    label='Poverty Rate', color='#4472C4', alpha=0.85, edgecolor='black', linewidth=1)
+    bars4 = ax6.bar(x_pos + 1.5*width, metrics_df['Income'], width,
+                    label='Median Income', color='#70AD47', alpha=0.85, edgecolor='black', linewidth=1)
+
+    ax6.axhline(y=1.0, color='black', linestyle='-', linewidth=2.5, alpha=0.7, zorder=1)
+    ax6.text(len(races)-0.3, 1.05, 'White Baseline', fontsize=11, fontweight='bold', ha='right')
+
+    ax6.set_xlabel('Race/Ethnicity', fontsize=13, fontweight='bold')
+    ax6.set_ylabel('Ratio (Relative to White = 1.0)', fontsize=13, fontweight='bold')
+    ax6.set_title('F. 2023 Cross-Sectional Comparison: Overdose Burden vs Socioeconomic Status',
+                  fontsize=15, fontweight='bold', pad=15, loc='left')
+    ax6.set_xticks(x_pos)
+    ax6.set_xticklabels([race_labels[r] for r in races], fontsize=12)
+    ax6.legend(loc='upper right', fontsize=11, ncol=4, framealpha=0.9)
+    ax6.grid(True, alpha=0.4, axis='y')
+    ax6.set_ylim(0, 2.6)
+
+    # Add value labels on bars for Black (most important)
+    for i, bar in enumerate([bars1[0], bars2[0], bars3[0], bars4[0]]):
+        height = bar.get_height()
+        ax6.text(bar.get_x() + bar.get_width()/2., height + 0.05,
+                 f'{height:.2f}x',
+                 ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    # ============================================================================
+    # PANEL G: Key Findings Text Box
+    # ============================================================================
+
+    ax7 = fig.add_subplot(gs[3, :])
+    ax7.axis('off')
+
+    key_findings_text = """
 KEY FINDINGS: RACIAL DISPARITIES IN OVERDOSE DEATHS (LA County, 2012-2023)
 
 1. POPULATION-ADJUSTED RATES REVEAL SEVERE DISPARITIES:
@@ -274,22 +286,23 @@ Black communities independent of individual socioeconomic status. Effective resp
 structural determinants through equitable harm reduction, treatment access, and drug supply interventions.
 """
 
-ax7.text(0.02, 0.98, key_findings_text, transform=ax7.transAxes,
-         fontsize=10.5, verticalalignment='top', family='monospace',
-         bbox=dict(boxstyle='round,pad=1', facecolor='lightyellow',
-                  edgecolor='black', linewidth=2, alpha=0.95))
-
-# Overall title
-fig.suptitle('Racial Disparities in Overdose Deaths: Population-Adjusted Rates and Socioeconomic Context\n' +
-             'Los Angeles County, 2012-2023',
-             fontsize=18, fontweight='bold', y=0.998)
-
-# Save
-plt.tight_layout()
-output_path = 'results/16_comprehensive_publication/COMPREHENSIVE_PUBLICATION_FIGURE.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved comprehensive figure: {output_path}")
-plt.close()
+    ax7.text(0.02, 0.98, key_findings_text, transform=ax7.transAxes,
+             fontsize=10.5, verticalalignment='top', family='monospace',
+             bbox=dict(boxstyle='round,pad=1', facecolor='lightyellow',
+                      edgecolor='black', linewidth=2, alpha=0.95))
+
+    # Overall title
+    fig.suptitle('Racial Disparities in Overdose Deaths: Population-Adjusted Rates and Socioeconomic Context\n' +
+                 'Los Angeles County, 2012-2023',
+                 fontsize=18, fontweight='bold', y=0.998)
+
+    # Save
+    plt.tight_layout()
+    output_path = figure_path
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved comprehensive figure: {output_path}")
+    plt.close()
+    record_figure(output_path, figure_cache_key)
 
 print("\n" + "="*70)
 print("PUBLICATION FIGURE COMPLETE")
@@ -14,6 +14,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from dotenv import load_dotenv
 
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+
 print("="*70)
 print("REAL INCOME & COST OF LIVING ANALYSIS")
 print("="*70)
@@ -265,23 +269,6 @@ for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
 
     print(f"  Real income change 2012→2023: {real_change:+.1f}%")
 
-# ============================================================================
-# VISUALIZATION
-# ============================================================================
-
-print("\n" + "="*70)
-print("CREATING VISUALIZATIONS")
-print("="*70)
-
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-
-colors = {
-    'WHITE': '#4472C4',
-    'BLACK': '#ED7D31',
-    'LATINE': '#A5A5A5',
-    'ASIAN': '#FFC000'
-}
-
 race_labels = {
     'WHITE': 'White (NH)',
     'BLACK': 'Black (NH)',
@@ -289,92 +276,110 @@ race_labels = {
     'ASIAN': 'Asian (NH)'
 }
 
-# Panel A: Nominal vs Real Income (Black)
-ax1 = axes[0, 0]
-ax1.plot(income_df['Year'], income_df['BLACK_Median_Income']/1000,
-         marker='o', linewidth=2.5, markersize=7, color='#ED7D31',
-         label='Nominal Income', linestyle='-')
-ax1.plot(income_df['Year'], income_df['BLACK_Real_Income_2023']/1000,
-         marker='s', linewidth=2.5, markersize=7, color='#C00000',
-         label='Real Income (2023 $)', linestyle='--')
-
-ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Median Household Income ($1,000s)', fontsize=12, fontweight='bold')
-ax1.set_title('A. Black Income: Nominal vs Real (Inflation-Adjusted)',
-              fontsize=14, fontweight='bold', pad=15)
-ax1.legend(fontsize=11)
-ax1.grid(True, alpha=0.3)
-ax1.set_xlim(2011.5, 2023.5)
-
-# Panel B: Real income for all races
-ax2 = axes[0, 1]
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    ax2.plot(income_df['Year'], income_df[f'{race}_Real_Income_2023']/1000,
-             marker='o', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Real Median Income (2023 $1,000s)', fontsize=12, fontweight='bold')
-ax2.set_title('B. Real Income Trends by Race (Inflation-Adjusted)',
-              fontsize=14, fontweight='bold', pad=15)
-ax2.legend(fontsize=11)
-ax2.grid(True, alpha=0.3)
-ax2.set_xlim(2011.5, 2023.5)
-
-# Panel C: Housing costs
-ax3 = axes[1, 0]
-ax3_twin = ax3.twinx()
-
-ax3.plot(housing_df['Year'], housing_df['Median_Gross_Rent'],
-         marker='o', linewidth=2.5, markersize=7, color='#ED7D31',
-         label='Median Gross Rent')
-ax3_twin.plot(housing_df['Year'], housing_df['Median_Home_Value']/1000,
-              marker='s', linewidth=2.5, markersize=7, color='#4472C4',
-              label='Median Home Value', linestyle='--')
-
-ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax3.set_ylabel('Median Gross Rent ($)', fontsize=12, fontweight='bold', color='#ED7D31')
-ax3_twin.set_ylabel('Median Home Value ($1,000s)', fontsize=12, fontweight='bold', color='#4472C4')
-ax3.set_title('C. Housing Costs in LA County',
-              fontsize=14, fontweight='bold', pad=15)
-ax3.tick_params(axis='y', labelcolor='#ED7D31')
-ax3_twin.tick_params(axis='y', labelcolor='#4472C4')
-ax3.grid(True, alpha=0.3)
-ax3.set_xlim(2011.5, 2023.5)
-
-# Combine legends
-lines1, labels1 = ax3.get_legend_handles_labels()
-lines2, labels2 = ax3_twin.get_legend_handles_labels()
-ax3.legend(lines1 + lines2, labels1 + labels2, loc='upper left', fontsize=10)
-
-# Panel D: Rent burden by race
-ax4 = axes[1, 1]
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    ax4.plot(income_housing['Year'], income_housing[f'{race}_Rent_Burden_Pct'],
-             marker='o', linewidth=2.5, markersize=7,
-             color=colors[race], label=race_labels[race])
-
-ax4.axhline(y=30, color='red', linestyle='--', linewidth=2, alpha=0.5,
-            label='HUD Cost-Burdened (30%)')
-ax4.axhline(y=50, color='darkred', linestyle='--', linewidth=2, alpha=0.5,
-            label='Severely Burdened (50%)')
-
-ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
-ax4.set_ylabel('Rent as % of Median Income', fontsize=12, fontweight='bold')
-ax4.set_title('D. Housing Cost Burden by Race',
-              fontsize=14, fontweight='bold', pad=15)
-ax4.legend(fontsize=10, loc='upper left')
-ax4.grid(True, alpha=0.3)
-ax4.set_xlim(2011.5, 2023.5)
-
-plt.suptitle('Real Income and Cost of Living Analysis\nLos Angeles County, 2012-2023',
-             fontsize=16, fontweight='bold', y=0.995)
-
-plt.tight_layout()
-output_path = 'results/17_real_income_analysis/real_income_cost_of_living.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved figure: {output_path}")
-plt.close()
+# ============================================================================
+# VISUALIZATION
+# ============================================================================
+
+if plots_enabled():
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATIONS")
+    print("="*70)
+
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    colors = {
+        'WHITE': '#4472C4',
+        'BLACK': '#ED7D31',
+        'LATINE': '#A5A5A5',
+        'ASIAN': '#FFC000'
+    }
+
+    # Panel A: Nominal vs Real Income (Black)
+    ax1 = axes[0, 0]
+    ax1.plot(income_df['Year'], income_df['BLACK_Median_Income']/1000,
+             marker='o', linewidth=2.5, markersize=7, color='#ED7D31',
+             label='Nominal Income', linestyle='-')
+    ax1.plot(income_df['Year'], income_df['BLACK_Real_Income_2023']/1000,
+             marker='s', linewidth=2.5, markersize=7, color='#C00000',
+             label='Real Income (2023 $)', linestyle='--')
+
+    ax1.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Median Household Income ($1,000s)', fontsize=12, fontweight='bold')
+    ax1.set_title('A. Black Income: Nominal vs Real (Inflation-Adjusted)',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax1.legend(fontsize=11)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_xlim(2011.5, 2023.5)
+
+    # Panel B: Real income for all races
+    ax2 = axes[0, 1]
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        ax2.plot(income_df['Year'], income_df[f'{race}_Real_Income_2023']/1000,
+                 marker='o', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax2.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Real Median Income (2023 $1,000s)', fontsize=12, fontweight='bold')
+    ax2.set_title('B. Real Income Trends by Race (Inflation-Adjusted)',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax2.legend(fontsize=11)
+    ax2.grid(True, alpha=0.3)
+    ax2.set_xlim(2011.5, 2023.5)
+
+    # Panel C: Housing costs
+    ax3 = axes[1, 0]
+    ax3_twin = ax3.twinx()
+
+    ax3.plot(housing_df['Year'], housing_df['Median_Gross_Rent'],
+             marker='o', linewidth=2.5, markersize=7, color='#ED7D31',
+             label='Median Gross Rent')
+    ax3_twin.plot(housing_df['Year'], housing_df['Median_Home_Value']/1000,
+                  marker='s', linewidth=2.5, markersize=7, color='#4472C4',
+                  label='Median Home Value', linestyle='--')
+
+    ax3.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Median Gross Rent ($)', fontsize=12, fontweight='bold', color='#ED7D31')
+    ax3_twin.set_ylabel('Median Home Value ($1,000s)', fontsize=12, fontweight='bold', color='#4472C4')
+    ax3.set_title('C. Housing Costs in LA County',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax3.tick_params(axis='y', labelcolor='#ED7D31')
+    ax3_twin.tick_params(axis='y', labelcolor='#4472C4')
+    ax3.grid(True, alpha=0.3)
+    ax3.set_xlim(2011.5, 2023.5)
+
+    # Combine legends
+    lines1, labels1 = ax3.get_legend_handles_labels()
+    lines2, labels2 = ax3_twin.get_legend_handles_labels()
+    ax3.legend(lines1 + lines2, labels1 + labels2, loc='upper left', fontsize=10)
+
+    # Panel D: Rent burden by race
+    ax4 = axes[1, 1]
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        ax4.plot(income_housing['Year'], income_housing[f'{race}_Rent_Burden_Pct'],
+                 marker='o', linewidth=2.5, markersize=7,
+                 color=colors[race], label=race_labels[race])
+
+    ax4.axhline(y=30, color='red', linestyle='--', linewidth=2, alpha=0.5,
+                label='HUD Cost-Burdened (30%)')
+    ax4.axhline(y=50, color='darkred', linestyle='--', linewidth=2, alpha=0.5,
+                label='Severely Burdened (50%)')
+
+    ax4.set_xlabel('Year', fontsize=12, fontweight='bold')
+    ax4.set_ylabel('Rent as % of Median Income', fontsize=12, fontweight='bold')
+    ax4.set_title('D. Housing Cost Burden by Race',
+                  fontsize=14, fontweight='bold', pad=15)
+    ax4.legend(fontsize=10, loc='upper left')
+    ax4.grid(True, alpha=0.3)
+    ax4.set_xlim(2011.5, 2023.5)
+
+    plt.suptitle('Real Income and Cost of Living Analysis\nLos Angeles County, 2012-2023',
+                 fontsize=16, fontweight='bold', y=0.995)
+
+    plt.tight_layout()
+    output_path = 'results/17_real_income_analysis/real_income_cost_of_living.png'
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved figure: {output_path}")
+    plt.close()
 
 # ============================================================================
 # SAVE DATA
@@ -16,7 +16,7 @@ import requests
 import time
 
 # Import shared utilities
-from utils import load_overdose_data, standardize_race, process_age, RACE_COLORS
+from utils import load_overdose_data, standardize_race, process_age, normalize_zip, RACE_COLORS
 
 # Setup
 plt.style.use('seaborn-v0_8-darkgrid')
@@ -44,9 +44,9 @@ df = process_age(df, age_col='Age')
 df = df[(df['Year'] >= 2012) & (df['Year'] <= 2023)].copy()
 
 # Clean ZIP codes
-df['ZIP'] = df['ZIPCODE'].astype(str).str.replace('.0', '', regex=False)
-df['ZIP'] = df['ZIP'].str.strip()
-df = df[df['ZIP'].str.match(r'^\d{5}$', na=False)].copy()
+df = normalize_zip(df, zip_col='ZIPCODE')
+df = df[df['ZIP'].between(10000, 99999).fillna(False)].copy()  # Any 5-digit ZIP
+df['ZIP'] = df['ZIP'].astype(str)
 
 print(f"✓ Loaded {len(df):,} overdose deaths with valid ZIP codes")
 print(f"  Unique ZIPs: {df['ZIP'].nunique()}")
@@ -17,6 +17,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+
 print("="*70)
 print("REVISED: SES and Racial Disparities Analysis")
 print("="*70)
@@ -185,76 +190,77 @@ print(f"  EXCESS beyond SES: {excess:.1f} per 100k ({excess/actual*100:.0f}%)")
 # VISUALIZATION
 # ============================================================================
 
-print("\n" + "="*70)
-print("CREATING VISUALIZATIONS")
-print("="*70)
+if plots_enabled():
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATIONS")
+    print("="*70)
 
-fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
 
-colors_dict = {'WHITE': '#4472C4', 'BLACK': '#ED7D31',
-               'LATINE': '#A5A5A5', 'ASIAN': '#FFC000'}
+    colors_dict = {'WHITE': '#4472C4', 'BLACK': '#ED7D31',
+                   'LATINE': '#A5A5A5', 'ASIAN': '#FFC000'}
 
-# Panel A: Poverty vs Rate (2023)
-ax1 = axes[0, 0]
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    row = df_2023[df_2023['Race'] == race].iloc[0]
-    ax1.scatter(row['Poverty_Rate'], row['Rate_per_100k'],
-               s=300, color=colors_dict[race], edgecolor='black',
-               linewidth=2, label=race, alpha=0.8)
-    ax1.text(row['Poverty_Rate'] + 0.5, row['Rate_per_100k'] + 2,
-            race, fontsize=10, fontweight='bold')
-
-ax1.set_xlabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
-ax1.set_ylabel('Overdose Rate (per 100k)', fontsize=12, fontweight='bold')
-ax1.set_title('A. 2023: Poverty vs Overdose Rate\n(No clear relationship)',
-              fontsize=13, fontweight='bold', pad=15)
-ax1.grid(True, alpha=0.3)
-
-# Panel B: Income vs Rate (2023)
-ax2 = axes[0, 1]
-for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
-    row = df_2023[df_2023['Race'] == race].iloc[0]
-    ax2.scatter(row['Median_Income']/1000, row['Rate_per_100k'],
-               s=300, color=colors_dict[race], edgecolor='black',
-               linewidth=2, label=race, alpha=0.8)
-    ax2.text(row['Median_Income']/1000 + 2, row['Rate_per_100k'] + 2,
-            race, fontsize=10, fontweight='bold')
-
-ax2.set_xlabel('Median Income ($1,000s)', fontsize=12, fontweight='bold')
-ax2.set_ylabel('Overdose Rate (per 100k)', fontsize=12, fontweight='bold')
-ax2.set_title('B. 2023: Income vs Overdose Rate\n(No clear relationship)',
-              fontsize=13, fontweight='bold', pad=15)
-ax2.grid(True, alpha=0.3)
-
-# Panel C: Bar chart comparison
-ax3 = axes[1, 0]
-races = ['BLACK', 'WHITE', 'LATINE', 'ASIAN']
-rates = [df_2023[df_2023['Race']==r]['Rate_per_100k'].values[0] for r in races]
-pov = [df_2023[df_2023['Race']==r]['Poverty_Rate'].values[0] for r in races]
-
-x = np.arange(len(races))
-width = 0.35
-
-bars1 = ax3.bar(x - width/2, rates, width, label='Overdose Rate',
-               color=[colors_dict[r] for r in races], alpha=0.8,
-               edgecolor='black', linewidth=1.5)
-bars2 = ax3.bar(x + width/2, [p*2 for p in pov], width,
-               label='Poverty Rate (×2 for scale)',
-               color='gray', alpha=0.5, edgecolor='black', linewidth=1.5)
-
-ax3.set_ylabel('Rate', fontsize=12, fontweight='bold')
-ax3.set_title('C. Overdose Rate vs Poverty (2023)\n(Patterns diverge)',
-              fontsize=13, fontweight='bold', pad=15)
-ax3.set_xticks(x)
-ax3.set_xticklabels(races)
-ax3.legend()
-ax3.grid(True, alpha=0.3, axis='y')
-
-# Panel D: Summary
-ax4 = axes[1, 1]
-ax4.axis('off')
-
-summary_text = f"""
+    # Panel A: Poverty vs Rate (2023)
+    ax1 = axes[0, 0]
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        row = df_2023[df_2023['Race'] == race].iloc[0]
+        ax1.scatter(row['Poverty_Rate'], row['Rate_per_100k'],
+                   s=300, color=colors_dict[race], edgecolor='black',
+                   linewidth=2, label=race, alpha=0.8)
+        ax1.text(row['Poverty_Rate'] + 0.5, row['Rate_per_100k'] + 2,
+                race, fontsize=10, fontweight='bold')
+
+    ax1.set_xlabel('Poverty Rate (%)', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('Overdose Rate (per 100k)', fontsize=12, fontweight='bold')
+    ax1.set_title('A. 2023: Poverty vs Overdose Rate\n(No clear relationship)',
+                  fontsize=13, fontweight='bold', pad=15)
+    ax1.grid(True, alpha=0.3)
+
+    # Panel B: Income vs Rate (2023)
+    ax2 = axes[0, 1]
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        row = df_2023[df_2023['Race'] == race].iloc[0]
+        ax2.scatter(row['Median_Income']/1000, row['Rate_per_100k'],
+                   s=300, color=colors_dict[race], edgecolor='black',
+                   linewidth=2, label=race, alpha=0.8)
+        ax2.text(row['Median_Income']/1000 + 2, row['Rate_per_100k'] + 2,
+                race, fontsize=10, fontweight='bold')
+
+    ax2.set_xlabel('Median Income ($1,000s)', fontsize=12, fontweight='bold')
+    ax2.set_ylabel('Overdose Rate (per 100k)', fontsize=12, fontweight='bold')
+    ax2.set_title('B. 2023: Income vs Overdose Rate\n(No clear relationship)',
+                  fontsize=13, fontweight='bold', pad=15)
+    ax2.grid(True, alpha=0.3)
+
+    # Panel C: Bar chart comparison
+    ax3 = axes[1, 0]
+    races = ['BLACK', 'WHITE', 'LATINE', 'ASIAN']
+    rates = [df_2023[df_2023['Race']==r]['Rate_per_100k'].values[0] for r in races]
+    pov = [df_2023[df_2023['Race']==r]['Poverty_Rate'].values[0] for r in races]
+
+    x = np.arange(len(races))
+    width = 0.35
+
+    bars1 = ax3.bar(x - width/2, rates, width, label='Overdose Rate',
+                   color=[colors_dict[r] for r in races], alpha=0.8,
+                   edgecolor='black', linewidth=1.5)
+    bars2 = ax3.bar(x + width/2, [p*2 for p in pov], width,
+                   label='Poverty Rate (×2 for scale)',
+                   color='gray', alpha=0.5, edgecolor='black', linewidth=1.5)
+
+    ax3.set_ylabel('Rate', fontsize=12, fontweight='bold')
+    ax3.set_title('C. Overdose Rate vs Poverty (2023)\n(Patterns diverge)',
+                  fontsize=13, fontweight='bold', pad=15)
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(races)
+    ax3.legend()
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    # Panel D: Summary
+    ax4 = axes[1, 1]
+    ax4.axis('off')
+
+    summary_text = f"""
 KEY FINDINGS (2023):
 
 SES DOES NOT EXPLAIN RACIAL DISPARITIES
@@ -293,19 +299,19 @@ Eliminating SES gaps would NOT eliminate
 racial disparities in this crisis. Supply-side
 and structural factors dominate."""
 
-ax4.text(0.05, 0.95, summary_text, transform=ax4.transAxes,
-         fontsize=9.5, verticalalignment='top', family='monospace',
-         bbox=dict(boxstyle='round', facecolor='lightyellow',
-                  edgecolor='black', linewidth=2, alpha=0.95))
+    ax4.text(0.05, 0.95, summary_text, transform=ax4.transAxes,
+             fontsize=9.5, verticalalignment='top', family='monospace',
+             bbox=dict(boxstyle='round', facecolor='lightyellow',
+                      edgecolor='black', linewidth=2, alpha=0.95))
 
-plt.suptitle('LA County Overdose Crisis: Race vs SES Analysis\nSES Does Not Explain Racial Disparities',
-             fontsize=16, fontweight='bold', y=0.998)
+    plt.suptitle('LA County Overdose Crisis: Race vs SES Analysis\nSES Does Not Explain Racial Disparities',
+                 fontsize=16, fontweight='bold', y=0.998)
 
-plt.tight_layout()
-output_path = 'results/22_counterfactual_ses_matching/counterfactual_ses_matching.png'
-plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"\n✓ Saved figure: {output_path}")
-plt.close()
+    plt.tight_layout()
+    output_path = 'results/22_counterfactual_ses_matching/counterfactual_ses_matching.png'
+    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\n✓ Saved figure: {output_path}")
+    plt.close()
 
 # Save results
 results = pd.DataFrame({
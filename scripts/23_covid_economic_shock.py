@@ -43,7 +43,7 @@ df = process_age(df, age_col='Age')
 df = df[(df['Year'] >= 2012) & (df['Year'] <= 2023)].copy()
 
 # Add month for within-year analysis
-df['Month'] = pd.to_datetime(df['DeathDate'], errors='coerce').dt.month
+df['Month'] = df['Date of Death'].where(df['Date_Source'] == 'DeathDate').dt.month
 
 # Load Census SES data
 pop_data_wide = pd.read_csv('data/la_county_population_census.csv')
@@ -12,11 +12,13 @@ from scipy import stats
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-import statsmodels.api as sm
-from statsmodels.formula.api import poisson
 
 # Import shared utilities
-from utils import load_overdose_data, standardize_race, process_age, RACE_COLORS
+from utils import load_overdose_data, standardize_race, process_age, RACE_COLORS, lazy_import
+
+# statsmodels loads on first use
+sm = lazy_import('statsmodels.api')
+poisson = lazy_import('statsmodels.formula.api', 'poisson')
 
 # Setup
 plt.style.use('seaborn-v0_8-darkgrid')
@@ -8,7 +8,6 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os
@@ -16,15 +15,15 @@ import sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/28_unemployment_overdose_correlation')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 def fetch_fred_safe(series_id, name):
     """Safely fetch FRED series with error handling"""
     try:
-        data = fred.get_series(series_id, observation_start='2012-01-01', observation_end='2023-12-31')
+        data = get_series(series_id, observation_start='2012-01-01', observation_end='2023-12-31')
         print(f"  ✓ Fetched {name}")
         return data
     except Exception as e:
@@ -89,7 +88,7 @@ def main():
         print(corr_df)
 
     # By race analysis
-    race_annual = df.groupby(['Year', 'Race']).size().reset_index(name='Deaths')
+    race_annual = df.groupby(['Year', 'Race'], observed=True).size().reset_index(name='Deaths')
     if 'CA_Unemployment' in annual_deaths.columns:
         race_unemp = race_annual.merge(
             annual_deaths[['Year', 'CA_Unemployment']],
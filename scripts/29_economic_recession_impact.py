@@ -2,7 +2,6 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
@@ -10,7 +9,6 @@ import os, sys
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/29_economic_recession_impact')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -39,7 +37,7 @@ def main():
     print("\n✓ Saved: period_comparison.csv")
 
     # By race
-    race_period = df.groupby(['Year', 'Race']).size().reset_index(name='Deaths')
+    race_period = df.groupby(['Year', 'Race'], observed=True).size().reset_index(name='Deaths')
     race_period['Period'] = race_period['Year'].apply(lambda x:
         'Pre-Pandemic' if x < 2020 else 'Pandemic' if x <= 2021 else 'Post-Pandemic')
 
@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/30_real_wages_deaths_despair')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -25,7 +24,7 @@ def main():
 
     # Fetch real earnings
     try:
-        earnings = fred.get_series('LES1252881600Q', observation_start='2012-01-01', observation_end='2023-12-31')
+        earnings = get_series('LES1252881600Q', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_earnings = earnings.resample('Y').mean()
         annual_earnings.index = annual_earnings.index.year
         annual_deaths['Real_Earnings'] = annual_deaths['Year'].map(dict(zip(annual_earnings.index, annual_earnings.values)))
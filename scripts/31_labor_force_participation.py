@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/31_labor_force_participation')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -25,7 +24,7 @@ def main():
 
     # Fetch LFPR
     try:
-        lfpr = fred.get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
+        lfpr = get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_lfpr = lfpr.resample('Y').mean()
         annual_lfpr.index = annual_lfpr.index.year
         annual_deaths['LFPR'] = annual_deaths['Year'].map(dict(zip(annual_lfpr.index, annual_lfpr.values)))
@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/32_housing_market_stress')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -25,7 +24,7 @@ def main():
 
     # Fetch housing data
     try:
-        mortgage = fred.get_series('MORTGAGE30US', observation_start='2012-01-01', observation_end='2023-12-31')
+        mortgage = get_series('MORTGAGE30US', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_mortgage = mortgage.resample('Y').mean()
         annual_mortgage.index = annual_mortgage.index.year
         annual_deaths['Mortgage_Rate'] = annual_deaths['Year'].map(dict(zip(annual_mortgage.index, annual_mortgage.values)))
@@ -34,7 +33,7 @@ def main():
         print("✗ Could not fetch mortgage data")
 
     try:
-        hpi = fred.get_series('CSUSHPISA', observation_start='2012-01-01', observation_end='2023-12-31')
+        hpi = get_series('CSUSHPISA', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_hpi = hpi.resample('Y').mean()
         annual_hpi.index = annual_hpi.index.year
         annual_deaths['Home_Price_Index'] = annual_deaths['Year'].map(dict(zip(annual_hpi.index, annual_hpi.values)))
@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/33_income_inequality_disparities')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -35,7 +34,7 @@ def main():
 
     # Fetch Gini
     try:
-        gini = fred.get_series('SIPOVGINIUSA', observation_start='2012-01-01', observation_end='2023-12-31')
+        gini = get_series('SIPOVGINIUSA', observation_start='2012-01-01', observation_end='2023-12-31')
         if len(gini) > 0:
             gini_annual = gini.resample('Y').mean()
             gini_annual.index = gini_annual.index.year
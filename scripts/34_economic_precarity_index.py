@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/34_economic_precarity_index')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -26,7 +25,7 @@ def main():
     # Fetch multiple indicators
     indicators = {}
     try:
-        unemp = fred.get_series('UNRATE', observation_start='2012-01-01', observation_end='2023-12-31')
+        unemp = get_series('UNRATE', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_unemp = unemp.resample('Y').mean()
         annual_unemp.index = annual_unemp.index.year
         indicators['Unemployment'] = annual_unemp
@@ -35,7 +34,7 @@ def main():
         pass
 
     try:
-        lfpr = fred.get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
+        lfpr = get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_lfpr = lfpr.resample('Y').mean()
         annual_lfpr.index = annual_lfpr.index.year
         indicators['LFPR'] = annual_lfpr
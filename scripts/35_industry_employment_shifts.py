@@ -2,15 +2,14 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from fredapi import Fred
 from scipy import stats
 from pathlib import Path
 import os, sys
 
 sys.path.append(str(Path(__file__).parent.parent))
 from scripts.utils import load_overdose_data
+from scripts.fred_cache import get_series
 
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
 OUTPUT_DIR = Path('results/35_industry_employment_shifts')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -32,7 +31,7 @@ def main():
 
     for name, series_id in industries.items():
         try:
-            data = fred.get_series(series_id, observation_start='2012-01-01', observation_end='2023-12-31')
+            data = get_series(series_id, observation_start='2012-01-01', observation_end='2023-12-31')
             annual_data = data.resample('Y').mean()
             annual_data.index = annual_data.index.year
             annual_deaths[name] = annual_deaths['Year'].map(dict(zip(annual_data.index, annual_data.values)))
@@ -55,11 +55,10 @@ output_dir.mkdir(parents=True, exist_ok=True)
 
 print("Loading data...")
 
-# Load economic indicators using FRED API
-from fredapi import Fred
-import os
-
-fred = Fred(api_key=os.getenv('FRED_API_KEY'))
+# Load economic indicators from the local FRED cache
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from scripts.fred_cache import get_series
 
 # Try to load from existing Analysis 31 results first
 try:
@@ -69,7 +68,7 @@ try:
 except:
     # Fetch from FRED (national LFPR)
     try:
-        lfpr_series = fred.get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
+        lfpr_series = get_series('CIVPART', observation_start='2012-01-01', observation_end='2023-12-31')
         annual_lfpr = lfpr_series.resample('Y').mean()
         annual_lfpr.index = annual_lfpr.index.year
         lfpr = pd.DataFrame({'Year': annual_lfpr.index, 'LFPR': annual_lfpr.values})
@@ -81,7 +80,7 @@ except:
 # Fetch unemployment rate from FRED
 try:
     # National unemployment rate
-    unemp_series = fred.get_series('UNRATE', observation_start='2012-01-01', observation_end='2023-12-31')
+    unemp_series = get_series('UNRATE', observation_start='2012-01-01', observation_end='2023-12-31')
     annual_unemp = unemp_series.resample('Y').mean()
     annual_unemp.index = annual_unemp.index.year
     unemployment = pd.DataFrame({'Year': annual_unemp.index, 'Unemployment_Rate': annual_unemp.values})
@@ -73,9 +73,9 @@ rent_data = rent_data[rent_data['Year'].between(2012, 2023)].copy()
 # Load overdose data
 import sys
 sys.path.append('scripts')
-from utils import load_overdose_data
+from utils import load_overdose_data, normalize_zip
 
-df = load_overdose_data()
+df = load_overdose_data(columns=['DeathZip'])
 df = df[df['Year'].between(2012, 2023)].copy()
 
 # Calculate annual deaths
@@ -189,11 +189,8 @@ print("Creating ZIP × Year panel...")
 
 # Get ZIP-Year deaths
 # Filter to valid ZIP codes (5 digits, no commas/multiple values)
-df['DeathZip_Clean'] = df['DeathZip'].astype(str)
-df['DeathZip_Clean'] = df['DeathZip_Clean'].str.split(',').str[0].str.strip()  # Take first if multiple
-df['DeathZip_Clean'] = df['DeathZip_Clean'].str.split('.').str[0]  # Remove decimal
-df['DeathZip_Clean'] = pd.to_numeric(df['DeathZip_Clean'], errors='coerce')
-df_valid_zip = df[df['DeathZip_Clean'].notna() & (df['DeathZip_Clean'] >= 90001) & (df['DeathZip_Clean'] <= 93599)]
+df = normalize_zip(df, output_col='DeathZip_Clean')  # First ZIP if multiple
+df_valid_zip = df[df['ZIP_Valid']]
 
 zip_year_deaths = df_valid_zip.groupby(['DeathZip_Clean', 'Year']).size().reset_index(name='Deaths')
 zip_year_deaths.rename(columns={'DeathZip_Clean': 'DeathZip'}, inplace=True)
@@ -50,15 +50,14 @@ print(f"  ZIPs: {rent_df['ZIP'].nunique()}, Years: {rent_df['Year'].nunique()}")
 # Overdose deaths by ZIP-year
 import sys
 sys.path.append('scripts')
-from utils import load_overdose_data
+from utils import load_overdose_data, normalize_zip
 
-df = load_overdose_data()
+df = load_overdose_data(columns=['DeathZip'])
 df = df[df['Year'].between(2012, 2022)].copy()  # Match rent data years
 
 # Clean ZIP codes
-df['ZIP'] = df['DeathZip'].astype(str).str.split(',').str[0].str.strip().str.split('.').str[0]
-df['ZIP'] = pd.to_numeric(df['ZIP'], errors='coerce')
-df = df[(df['ZIP'] >= 90001) & (df['ZIP'] <= 93599)]
+df = normalize_zip(df)
+df = df[df['ZIP_Valid']]
 
 # Create ZIP-year panel
 deaths_zip_year = df.groupby(['ZIP', 'Year']).size().reset_index(name='Deaths')
@@ -23,6 +23,11 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import plots_enabled
+
 plt.style.use('default')
 sns.set_palette("husl")
 
@@ -351,124 +356,125 @@ print()
 # VISUALIZATION
 # ============================================================================
 
-print("Creating visualizations...")
-
-fig = plt.figure(figsize=(18, 12))
-gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.35)
-
-# Panel 1: Contemporaneous
-ax1 = fig.add_subplot(gs[0, 0])
-ax1.scatter(panel_lag['Median_Rent'], panel_lag['Rate_per_100k'],
-            alpha=0.3, s=30, color='steelblue', edgecolor='none')
-z = np.polyfit(panel_lag['Median_Rent'], panel_lag['Rate_per_100k'], 1)
-p_plot = np.poly1d(z)
-ax1.plot(panel_lag['Median_Rent'], p_plot(panel_lag['Median_Rent']),
-         "r--", alpha=0.8, linewidth=2.5)
-ax1.set_xlabel('Rent(t)', fontsize=11, fontweight='bold')
-ax1.set_ylabel('Overdose(t)', fontsize=11, fontweight='bold')
-ax1.set_title(f'CONTEMPORANEOUS\\nr = {r_contemp:.3f}',
-              fontsize=12, fontweight='bold', color='steelblue')
-ax1.grid(True, alpha=0.3)
-
-# Panel 2: Rent leads
-ax2 = fig.add_subplot(gs[0, 1])
-ax2.scatter(panel_lag['Rent_Lag1'], panel_lag['Rate_per_100k'],
-            alpha=0.3, s=30, color='darkgreen', edgecolor='none')
-z = np.polyfit(panel_lag['Rent_Lag1'], panel_lag['Rate_per_100k'], 1)
-p_plot = np.poly1d(z)
-ax2.plot(panel_lag['Rent_Lag1'], p_plot(panel_lag['Rent_Lag1']),
-         "r--", alpha=0.8, linewidth=2.5)
-ax2.set_xlabel('Rent(t-1)', fontsize=11, fontweight='bold')
-ax2.set_ylabel('Overdose(t)', fontsize=11, fontweight='bold')
-ax2.set_title(f'RENT LEADS\\nr = {r_rent_leads:.3f}',
-              fontsize=12, fontweight='bold', color='darkgreen')
-ax2.grid(True, alpha=0.3)
-
-# Panel 3: Overdose leads (reverse)
-ax3 = fig.add_subplot(gs[0, 2])
-ax3.scatter(panel_lag['Rate_Lag1'], panel_lag['Median_Rent'],
-            alpha=0.3, s=30, color='coral', edgecolor='none')
-z = np.polyfit(panel_lag['Rate_Lag1'], panel_lag['Median_Rent'], 1)
-p_plot = np.poly1d(z)
-ax3.plot(panel_lag['Rate_Lag1'], p_plot(panel_lag['Rate_Lag1']),
-         "r--", alpha=0.8, linewidth=2.5)
-ax3.set_xlabel('Overdose(t-1)', fontsize=11, fontweight='bold')
-ax3.set_ylabel('Rent(t)', fontsize=11, fontweight='bold')
-ax3.set_title(f'REVERSE (OD Leads)\\nr = {r_od_leads:.3f}',
-              fontsize=12, fontweight='bold', color='coral')
-ax3.grid(True, alpha=0.3)
-
-# Panel 4: Lag structure
-ax4 = fig.add_subplot(gs[1, :])
-lags = lag_df['Lag_Value'].values
-correlations = lag_df['Correlation'].values
-colors_lag = ['steelblue' if lag == 0 else 'darkgreen' for lag in lags]
-
-bars = ax4.bar(lag_df['Lag'], correlations, color=colors_lag, alpha=0.7,
-               edgecolor='black', linewidth=2)
-ax4.axhline(0, color='black', linestyle='-', linewidth=1)
-ax4.set_xlabel('Lag', fontsize=11, fontweight='bold')
-ax4.set_ylabel('Correlation (r)', fontsize=11, fontweight='bold')
-ax4.set_title('Correlation by Lag: Finding Optimal Temporal Relationship',
-              fontsize=12, fontweight='bold')
-ax4.grid(True, alpha=0.3, axis='y')
-
-for bar, val in zip(bars, correlations):
-    ax4.text(bar.get_x() + bar.get_width()/2, val + 0.02 * np.sign(val),
-             f'{val:.3f}', ha='center', va='bottom' if val > 0 else 'top',
-             fontsize=10, fontweight='bold')
-
-# Panel 5: Changes scatter
-ax5 = fig.add_subplot(gs[2, 0])
-ax5.scatter(panel_changes['Rent_Change'], panel_changes['Rate_Change'],
-            alpha=0.4, s=40, color='purple', edgecolor='black', linewidth=0.5)
-z = np.polyfit(panel_changes['Rent_Change'], panel_changes['Rate_Change'], 1)
-p_plot = np.poly1d(z)
-ax5.plot(panel_changes['Rent_Change'], p_plot(panel_changes['Rent_Change']),
-         "r--", alpha=0.8, linewidth=2.5)
-ax5.axhline(0, color='black', linestyle='-', linewidth=0.5)
-ax5.axvline(0, color='black', linestyle='-', linewidth=0.5)
-ax5.set_xlabel('Rent Change', fontsize=11, fontweight='bold')
-ax5.set_ylabel('Rate Change', fontsize=11, fontweight='bold')
-ax5.set_title(f'Changes (First Differences)\\nr = {r_change_contemp:.3f}',
-              fontsize=12, fontweight='bold')
-ax5.grid(True, alpha=0.3)
-
-# Panel 6: Granger causality
-ax6 = fig.add_subplot(gs[2, 1])
-models = ['AR(1)\\nRate(t-1) only', 'AR(1) + Rent(t-1)\\nAdds lagged rent']
-r2_values = [r2_model1, r2_model2]
-colors_model = ['lightcoral', 'lightgreen']
-
-bars = ax6.bar(models, r2_values, color=colors_model, alpha=0.7,
-               edgecolor='black', linewidth=2)
-ax6.set_ylabel('R² (Variance Explained)', fontsize=11, fontweight='bold')
-ax6.set_title(f'Granger Causality Test\\nIncremental R² = {r2_increment:.4f}',
-              fontsize=12, fontweight='bold')
-ax6.set_ylim([0, 1])
-ax6.grid(True, alpha=0.3, axis='y')
-
-for bar, val in zip(bars, r2_values):
-    ax6.text(bar.get_x() + bar.get_width()/2, val + 0.02,
-             f'{val:.4f}', ha='center', va='bottom',
-             fontsize=10, fontweight='bold')
-
-# Panel 7: Summary
-ax7 = fig.add_subplot(gs[2, 2])
-ax7.axis('off')
-
-# Determine verdict for summary
-if abs(r_rent_leads) > abs(r_contemp) and p_rent_leads < 0.05:
-    verdict = "✓ STRONG CAUSAL EVIDENCE"
-    color_verdict = 'darkgreen'
-elif p_rent_leads < 0.05 and p_od_leads > 0.05:
-    verdict = "✓ MODERATE CAUSAL EVIDENCE"
-    color_verdict = 'green'
-else:
-    verdict = "⚠ LIMITED CAUSAL EVIDENCE"
-    color_verdict = 'orange'
+if plots_enabled():
+    print("Creating visualizations...")
+
+    fig = plt.figure(figsize=(18, 12))
+    gs = fig.add_gridspec(3, 3, hspace=0.35, wspace=0.35)
+
+    # Panel 1: Contemporaneous
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.scatter(panel_lag['Median_Rent'], panel_lag['Rate_per_100k'],
+                alpha=0.3, s=30, color='steelblue', edgecolor='none')
+    z = np.polyfit(panel_lag['Median_Rent'], panel_lag['Rate_per_100k'], 1)
+    p_plot = np.poly1d(z)
+    ax1.plot(panel_lag['Median_Rent'], p_plot(panel_lag['Median_Rent']),
+             "r--", alpha=0.8, linewidth=2.5)
+    ax1.set_xlabel('Rent(t)', fontsize=11, fontweight='bold')
+    ax1.set_ylabel('Overdose(t)', fontsize=11, fontweight='bold')
+    ax1.set_title(f'CONTEMPORANEOUS\\nr = {r_contemp:.3f}',
+                  fontsize=12, fontweight='bold', color='steelblue')
+    ax1.grid(True, alpha=0.3)
+
+    # Panel 2: Rent leads
+    ax2 = fig.add_subplot(gs[0, 1])
+    ax2.scatter(panel_lag['Rent_Lag1'], panel_lag['Rate_per_100k'],
+                alpha=0.3, s=30, color='darkgreen', edgecolor='none')
+    z = np.polyfit(panel_lag['Rent_Lag1'], panel_lag['Rate_per_100k'], 1)
+    p_plot = np.poly1d(z)
+    ax2.plot(panel_lag['Rent_Lag1'], p_plot(panel_lag['Rent_Lag1']),
+             "r--", alpha=0.8, linewidth=2.5)
+    ax2.set_xlabel('Rent(t-1)', fontsize=11, fontweight='bold')
+    ax2.set_ylabel('Overdose(t)', fontsize=11, fontweight='bold')
+    ax2.set_title(f'RENT LEADS\\nr = {r_rent_leads:.3f}',
+                  fontsize=12, fontweight='bold', color='darkgreen')
+    ax2.grid(True, alpha=0.3)
+
+    # Panel 3: Overdose leads (reverse)
+    ax3 = fig.add_subplot(gs[0, 2])
+    ax3.scatter(panel_lag['Rate_Lag1'], panel_lag['Median_Rent'],
+                alpha=0.3, s=30, color='coral', edgecolor='none')
+    z = np.polyfit(panel_lag['Rate_Lag1'], panel_lag['Median_Rent'], 1)
+    p_plot = np.poly1d(z)
+    ax3.plot(panel_lag['Rate_Lag1'], p_plot(panel_lag['Rate_Lag1']),
+             "r--", alpha=0.8, linewidth=2.5)
+    ax3.set_xlabel('Overdose(t-1)', fontsize=11, fontweight='bold')
+    ax3.set_ylabel('Rent(t)', fontsize=11, fontweight='bold')
+    ax3.set_title(f'REVERSE (OD Leads)\\nr = {r_od_leads:.3f}',
+                  fontsize=12, fontweight='bold', color='coral')
+    ax3.grid(True, alpha=0.3)
+
+    # Panel 4: Lag structure
+    ax4 = fig.add_subplot(gs[1, :])
+    lags = lag_df['Lag_Value'].values
+    correlations = lag_df['Correlation'].values
+    colors_lag = ['steelblue' if lag == 0 else 'darkgreen' for lag in lags]
+
+    bars = ax4.bar(lag_df['Lag'], correlations, color=colors_lag, alpha=0.7,
+                   edgecolor='black', linewidth=2)
+    ax4.axhline(0, color='black', linestyle='-', linewidth=1)
+    ax4.set_xlabel('Lag', fontsize=11, fontweight='bold')
+    ax4.set_ylabel('Correlation (r)', fontsize=11, fontweight='bold')
+    ax4.set_title('Correlation by Lag: Finding Optimal Temporal Relationship',
+                  fontsize=12, fontweight='bold')
+    ax4.grid(True, alpha=0.3, axis='y')
+
+    for bar, val in zip(bars, correlations):
+        ax4.text(bar.get_x() + bar.get_width()/2, val + 0.02 * np.sign(val),
+                 f'{val:.3f}', ha='center', va='bottom' if val > 0 else 'top',
+                 fontsize=10, fontweight='bold')
+
+    # Panel 5: Changes scatter
+    ax5 = fig.add_subplot(gs[2, 0])
+    ax5.scatter(panel_changes['Rent_Change'], panel_changes['Rate_Change'],
+                alpha=0.4, s=40, color='purple', edgecolor='black', linewidth=0.5)
+    z = np.polyfit(panel_changes['Rent_Change'], panel_changes['Rate_Change'], 1)
+    p_plot = np.poly1d(z)
+    ax5.plot(panel_changes['Rent_Change'], p_plot(panel_changes['Rent_Change']),
+             "r--", alpha=0.8, linewidth=2.5)
+    ax5.axhline(0, color='black', linestyle='-', linewidth=0.5)
+    ax5.axvline(0, color='black', linestyle='-', linewidth=0.5)
+    ax5.set_xlabel('Rent Change', fontsize=11, fontweight='bold')
+    ax5.set_ylabel('Rate Change', fontsize=11, fontweight='bold')
+    ax5.set_title(f'Changes (First Differences)\\nr = {r_change_contemp:.3f}',
+                  fontsize=12, fontweight='bold')
+    ax5.grid(True, alpha=0.3)
+
+    # Panel 6: Granger causality
+    ax6 = fig.add_subplot(gs[2, 1])
+    models = ['AR(1)\\nRate(t-1) only', 'AR(1) + Rent(t-1)\\nAdds lagged rent']
+    r2_values = [r2_model1, r2_model2]
+    colors_model = ['lightcoral', 'lightgreen']
+
+    bars = ax6.bar(models, r2_values, color=colors_model, alpha=0.7,
+                   edgecolor='black', linewidth=2)
+    ax6.set_ylabel('R² (Variance Explained)', fontsize=11, fontweight='bold')
+    ax6.set_title(f'Granger Causality Test\\nIncremental R² = {r2_increment:.4f}',
+                  fontsize=12, fontweight='bold')
+    ax6.set_ylim([0, 1])
+    ax6.grid(True, alpha=0.3, axis='y')
+
+    for bar, val in zip(bars, r2_values):
+        ax6.text(bar.get_x() + bar.get_width()/2, val + 0.02,
+                 f'{val:.4f}', ha='center', va='bottom',
+                 fontsize=10, fontweight='bold')
+
+    # Panel 7: Summary
+    ax7 = fig.add_subplot(gs[2, 2])
+    ax7.axis('off')
+
+    # Determine verdict for summary
+    if abs(r_rent_leads) > abs(r_contemp) and p_rent_leads < 0.05:
+        verdict = "✓ STRONG CAUSAL EVIDENCE"
+        color_verdict = 'darkgreen'
+    elif p_rent_leads < 0.05 and p_od_leads > 0.05:
+        verdict = "✓ MODERATE CAUSAL EVIDENCE"
+        color_verdict = 'green'
+    else:
+        verdict = "⚠ LIMITED CAUSAL EVIDENCE"
+        color_verdict = 'orange'
 
-summary_text = f"""
+    summary_text = f"""
 {verdict}
 
 TEMPORAL PRECEDENCE:
@@ -492,15 +498,15 @@ CONTEXT:
   but NOT primary driver
 """
 
-ax7.text(0.05, 0.95, summary_text, transform=ax7.transAxes,
-         fontsize=9, verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
+    ax7.text(0.05, 0.95, summary_text, transform=ax7.transAxes,
+             fontsize=9, verticalalignment='top', fontfamily='monospace',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
 
-plt.suptitle('Lead-Lag Analysis: Does Rent Change PRECEDE Overdose Changes?\\nTesting Temporal Precedence for Causation',
-             fontsize=14, fontweight='bold', y=0.998)
+    plt.suptitle('Lead-Lag Analysis: Does Rent Change PRECEDE Overdose Changes?\\nTesting Temporal Precedence for Causation',
+                 fontsize=14, fontweight='bold', y=0.998)
 
-plt.savefig(output_dir / 'lead_lag_analysis.png', dpi=300, bbox_inches='tight')
-print(f"✓ Saved: {output_dir / 'lead_lag_analysis.png'}")
+    plt.savefig(output_dir / 'lead_lag_analysis.png', dpi=300, bbox_inches='tight')
+    print(f"✓ Saved: {output_dir / 'lead_lag_analysis.png'}")
 print()
 
 # ============================================================================
@@ -43,16 +43,15 @@ print("Loading monthly overdose data...")
 
 import sys
 sys.path.append('scripts')
-from utils import load_overdose_data
+from utils import load_overdose_data, normalize_zip
 
-df = load_overdose_data()
-df['Date'] = pd.to_datetime(df['DeathDate'], errors='coerce')
+df = load_overdose_data(columns=['DeathZip'])
+df['Date'] = df['Date of Death'].where(df['Date_Source'] == 'DeathDate')
 df = df[df['Date'].notna()].copy()
 
 # Clean ZIP codes
-df['ZIP'] = df['DeathZip'].astype(str).str.split(',').str[0].str.strip().str.split('.').str[0]
-df['ZIP'] = pd.to_numeric(df['ZIP'], errors='coerce')
-df = df[(df['ZIP'] >= 90001) & (df['ZIP'] <= 93599)].copy()
+df = normalize_zip(df)
+df = df[df['ZIP_Valid']].copy()
 
 # Create year-month
 df['YearMonth'] = df['Date'].dt.to_period('M')
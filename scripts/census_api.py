@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Census API Client
+Pooled, concurrent and cached access to api.census.gov for the fetch scripts
+
+CensusClient keeps one HTTP session whose connection pool is sized to the
+number of worker threads, so requests reuse connections instead of
+opening one per call. get_many() runs a batch of requests on a thread
+pool, so a full refresh takes about as long as the slowest request rather
+than the sum of all of them.
+
+Transient failures (connection errors, timeouts, HTTP 429 and 5xx) are
+retried with exponential backoff and jitter, honouring Retry-After. Other
+errors, such as an invalid key or an unknown variable, fail at once.
+
+Every successful response is written to data/.cache/census_api/ under a
+hash of its endpoint and parameters (not the API key). Rerunning after a
+partial failure therefore only requests what is still missing. ACS
+releases do not change once published, so cached responses do not
+expire; pass refresh=True (--refresh) to request them again.
+
+A TokenBucket (rate=...) caps the request rate across all worker threads
+while still allowing short bursts, instead of sleeping after every call.
+
+get_batched() goes further: requests for the same dataset and geography
+(B03002, B17001, B19013 and B01002 for one year, say) are merged into the
+fewest calls the MAX_VARIABLES limit allows, and each merged response is
+split back into one response per original request.
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+# EPI_CENSUS_URL points the fetch scripts at another server (a local
+# stand-in, for instance)
+CENSUS_URL = os.environ.get('EPI_CENSUS_URL') or 'https://api.census.gov/data'
+CACHE_DIR = os.path.join('data', '.cache', 'census_api')
+
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 1.0  # Seconds before the first retry; doubles each time
+MAX_BACKOFF = 30.0
+REQUEST_TIMEOUT = 30
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_VARIABLES = 50  # Variables the API accepts in one 'get'
+
+
+class CensusAPIError(Exception):
+    """
+    A request the Census API rejected, or that failed after every retry
+
+    `status` is the HTTP status of a rejected request (None otherwise).
+    """
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+    @property
+    def rejected(self):
+        """True for a non-retryable 4xx, e.g. an unknown or unpublished variable"""
+        return self.status is not None and 400 <= self.status < 500 \
+            and self.status not in RETRY_STATUS
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by threads: rate requests per second on average,
+    up to burst at once
+
+    Parameters:
+    -----------
+    rate : float
+        Tokens added per second
+    burst : int
+        Bucket size (requests allowed back to back after a pause)
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for a token and take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def request_key(endpoint, params):
+    """Cache key for a request: its endpoint and parameters, without the API key"""
+    query = sorted((k, str(v)) for k, v in params.items() if k != 'key')
+    return hashlib.sha256(json.dumps([endpoint, query]).encode()).hexdigest()
+
+
+def merge_requests(batch, limit=MAX_VARIABLES):
+    """
+    Plan the fewest calls that cover a batch of requests
+
+    Requests with the same endpoint and the same parameters apart from
+    'get' (same geography) share calls: their variables are combined,
+    without repeats, and split into calls of at most limit variables.
+
+    Parameters:
+    -----------
+    batch : dict
+        {label: (endpoint, params)} with params['get'] a comma-separated
+        variable list
+    limit : int
+        Most variables per call
+
+    Returns:
+    --------
+    tuple of (dict, dict)
+        The calls {call: (endpoint, params)}, keyed by (endpoint, geography,
+        part), and the routing {label: [calls it needs]}
+    """
+    groups = {}
+    for label, (endpoint, params) in batch.items():
+        geography = tuple(sorted((k, str(v)) for k, v in params.items() if k != 'get'))
+        variables, labels = groups.setdefault((endpoint, geography), ({}, []))
+        variables.update(dict.fromkeys(params['get'].split(',')))
+        labels.append(label)
+
+    calls, routing = {}, {}
+    for (endpoint, geography), (variables, labels) in groups.items():
+        variables = list(variables)
+        parts = {}
+        for part, first in enumerate(range(0, len(variables), limit)):
+            chunk = variables[first:first + limit]
+            call = (endpoint, geography, part)
+            calls[call] = (endpoint, dict(geography, get=','.join(chunk)))
+            parts[call] = set(chunk)
+        for label in labels:
+            wanted = set(batch[label][1]['get'].split(','))
+            routing[label] = [call for call, chunk in parts.items() if chunk & wanted]
+    return calls, routing
+
+
+def split_response(variables, parts):
+    """
+    Rows for one request, cut out of the merged responses that cover it
+
+    Parameters:
+    -----------
+    variables : list of str
+        The request's variables, in the order it asked for them
+    parts : list of (list of str, list of list)
+        For each merged call the request was routed to, the variables that
+        call asked for and its rows (header first)
+
+    Returns:
+    --------
+    list of list
+        Header (variables, then the geography columns) and one row per
+        geography present in every part
+    """
+    asked, rows = parts[0]
+    # Whatever a call returns beyond its variables identifies the geography
+    geography = [column for column in rows[0] if column not in set(asked)]
+    merged = None
+    for _, rows in parts:
+        header = rows[0]
+        keys = [header.index(column) for column in geography]
+        table = {tuple(row[i] for i in keys): dict(zip(header, row)) for row in rows[1:]}
+        if merged is None:
+            merged = table
+        else:
+            merged = {key: dict(merged[key], **table[key]) for key in merged if key in table}
+    return [list(variables) + geography] + \
+        [[values[v] for v in variables] + list(key) for key, values in merged.items()]
+
+
+class CensusClient:
+    """
+    Census API session with a connection pool, retries and a response cache
+
+    Parameters:
+    -----------
+    api_key : str, optional
+        Census API key, added to every request
+    workers : int
+        Concurrent requests in get_many(), and the connection pool size
+    retries : int
+        Retries for a transient failure before giving up
+    backoff : float
+        Seconds before the first retry; doubled on each further retry
+    refresh : bool
+        Ignore cached responses (new responses are still cached)
+    cache_dir : str or False, optional
+        Response cache folder (data/.cache/census_api under the repo root);
+        False turns the cache off, for callers that keep their own checkpoints
+    rate : float, optional
+        Most requests per second across all workers (no limit if None)
+    """
+
+    def __init__(self, api_key=None, workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                 backoff=DEFAULT_BACKOFF, refresh=False, cache_dir=None, rate=None):
+        self.api_key = api_key
+        self.workers = max(1, workers)
+        self.retries = retries
+        self.backoff = backoff
+        self.refresh = refresh
+        self.cache_dir = os.path.join(REPO_ROOT, CACHE_DIR) if cache_dir is None else cache_dir
+        self.limiter = TokenBucket(rate, burst=self.workers) if rate else None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.stats = {'requests': 0, 'cached': 0, 'retries': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _cache_path(self, endpoint, params):
+        key = request_key(endpoint, params)
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def cached(self, endpoint, params):
+        """Cached rows for a request, or None"""
+        if not self.cache_dir or self.refresh:
+            return None
+        path = self._cache_path(endpoint, params)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)['rows']
+        except (ValueError, KeyError):
+            return None  # Truncated by an interrupted write; fetch again
+
+    def _store(self, endpoint, params, rows):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'endpoint': endpoint,
+                       'params': {k: v for k, v in params.items() if k != 'key'},
+                       'fetched': datetime.now().isoformat(timespec='seconds'),
+                       'rows': rows}, f)
+        os.replace(tmp_path, path)
+
+    def _delay(self, attempt, response=None):
+        """Seconds to wait before retry number attempt (from 0)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_BACKOFF)
+        delay = self.backoff * 2 ** attempt
+        return min(delay + random.uniform(0, self.backoff), MAX_BACKOFF)
+
+    def get(self, endpoint, params):
+        """
+        Rows of a Census API response, from the cache when possible
+
+        Parameters:
+        -----------
+        endpoint : str
+            Dataset URL, e.g. https://api.census.gov/data/2019/acs/acs1
+        params : dict
+            Query parameters ('get', 'for', 'in', ...); the client's key is added
+
+        Returns:
+        --------
+        list of list
+            The JSON rows, header first
+
+        Raises:
+        -------
+        CensusAPIError
+            If the API rejects the request, or it still fails after the retries
+        """
+        rows = self.cached(endpoint, params)
+        if rows is not None:
+            self._count('cached')
+            return rows
+
+        query = dict(params)
+        if self.api_key:
+            query['key'] = self.api_key
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                if self.limiter:
+                    self.limiter.acquire()
+                self._count('requests')
+                response = self.session.get(endpoint, params=query, timeout=REQUEST_TIMEOUT)
+                if response.status_code not in RETRY_STATUS:
+                    break
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                error = f"{type(e).__name__}: {e}"
+            if attempt == self.retries:
+                raise CensusAPIError(f"{endpoint}: {error} after {self.retries} retries")
+            self._count('retries')
+            time.sleep(self._delay(attempt, response))
+
+        if response.status_code == 204:
+            raise CensusAPIError(f"{endpoint}: no data for {params.get('for')}")
+        if response.status_code != 200:
+            raise CensusAPIError(f"{endpoint}: HTTP {response.status_code}: "
+                                 f"{response.text.strip()[:200]}",
+                                 status=response.status_code)
+        try:
+            rows = response.json()
+        except ValueError:
+            # The API answers an invalid key with an HTML page
+            raise CensusAPIError(f"{endpoint}: response is not JSON "
+                                 f"({response.text.strip()[:200]!r})") from None
+        self._store(endpoint, params, rows)
+        return rows
+
+    def iter_many(self, batch):
+        """
+        Run requests concurrently, yielding each result as it arrives
+
+        Lets callers checkpoint progress request by request. A failed
+        request does not stop the others; it is yielded as its exception.
+
+        Parameters:
+        -----------
+        batch : dict
+            {label: (endpoint, params)}
+
+        Yields:
+        -------
+        tuple of (label, rows or CensusAPIError)
+            In completion order
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.get, endpoint, params): label
+                       for label, (endpoint, params) in batch.items()}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except CensusAPIError as e:
+                    yield futures[future], e
+
+    def get_many(self, batch):
+        """
+        Run requests concurrently on a pool of self.workers threads
+
+        A failed request does not stop the others; it is returned as its
+        exception, and every response that did arrive is cached.
+
+        Parameters:
+        -----------
+        batch : dict
+            {label: (endpoint, params)}
+
+        Returns:
+        --------
+        dict
+            {label: rows or CensusAPIError}, in the order of batch
+        """
+        results = dict(self.iter_many(batch))
+        return {label: results[label] for label in batch}
+
+    def get_batched(self, batch, limit=MAX_VARIABLES):
+        """
+        Like get_many(), but with requests merged into as few calls as possible
+
+        See merge_requests(). Each request still gets its own rows, laid
+        out as if it had been sent alone. When the API rejects a merged
+        call outright (a 4xx such as an unknown variable), the requests
+        routed to it are sent again on their own, so one bad variable only
+        fails the request that asked for it.
+
+        Parameters:
+        -----------
+        batch : dict
+            {label: (endpoint, params)}
+        limit : int
+            Most variables per call
+
+        Returns:
+        --------
+        dict
+            {label: rows or CensusAPIError}, in the order of batch
+        """
+        calls, routing = merge_requests(batch, limit)
+        self.stats['calls'] = len(calls)
+        responses = self.get_many(calls)
+
+        # Resend requests a rejected merged call covered, unless the call
+        # was the request itself
+        rejected = {call for call, rows in responses.items()
+                    if isinstance(rows, CensusAPIError) and rows.rejected}
+        retry = {label: batch[label] for label in batch
+                 if any(call in rejected for call in routing[label])
+                 and request_key(*batch[label]) not in
+                 {request_key(*calls[call]) for call in routing[label]}}
+        self.stats['fallbacks'] = len(retry)
+        fallback = self.get_many(retry) if retry else {}
+
+        results = {}
+        for label, (_, params) in batch.items():
+            if label in fallback:
+                results[label] = fallback[label]
+                continue
+            needed = routing[label]
+            failed = [responses[call] for call in needed if isinstance(responses[call], Exception)]
+            if failed:
+                results[label] = failed[0]
+                continue
+            parts = [(calls[call][1]['get'].split(','), responses[call]) for call in needed]
+            try:
+                results[label] = split_response(params['get'].split(','), parts)
+            except (ValueError, KeyError, IndexError) as e:
+                results[label] = CensusAPIError(f"{batch[label][0]}: unexpected response ({e})")
+        return results
+
+    def close(self):
+        self.session.close()
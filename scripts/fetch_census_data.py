@@ -11,115 +11,91 @@ Fetch ALL LA County Census Data from Census API
 Years: 2012-2023
 Geography: Los Angeles County, California
 Source: U.S. Census Bureau ACS 1-Year Estimates + 2020 Decennial Census
+
+All table/year requests go out together through census_api.CensusClient
+(pooled session, --workers concurrent requests, retries with backoff).
+The tables for one year share a dataset and geography, so their
+variables are merged into one call (split at the API's variable limit)
+and the response is divided back into the per-table CSVs: 12 calls
+instead of 45. Responses are cached in data/.cache/census_api/, so a rerun after a
+partial failure only requests what is still missing. A table is saved
+only when every one of its years arrived.
+
+Usage:
+    python scripts/fetch_census_data.py [--workers 8] [--retries 4] [--refresh]
 """
 
 import os
-import requests
+import sys
+import time
+import argparse
 import pandas as pd
 from dotenv import load_dotenv
 
-# Load API key
-load_dotenv()
-API_KEY = os.getenv('CENSUS_API_KEY')
-
-if not API_KEY:
-    raise ValueError("CENSUS_API_KEY not found in .env file")
-
-print("="*70)
-print("FETCHING ALL LA COUNTY CENSUS DATA FROM CENSUS API")
-print("="*70)
-print(f"API Key loaded: {API_KEY[:10]}...")
-print()
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from census_api import CENSUS_URL, DEFAULT_WORKERS, DEFAULT_RETRIES, CensusClient, CensusAPIError
 
 STATE_FIPS = "06"
 COUNTY_FIPS = "037"
+YEARS = range(2012, 2024)
+
+
+def _count(value, cast=int):
+    """A Census estimate, or None where the API has no value"""
+    return cast(value) if value not in ['-', None] else None
 
 # ============================================================================
-# FUNCTION: Fetch Population Data
+# TABLE: Population
 # ============================================================================
 
-def fetch_population_data(year):
+def population_request(year):
     """
-    Fetch population by race
+    Population by race
     Table B03002: Hispanic or Latino Origin by Race
     """
-    print(f"  Population data...", end=" ")
-
-    base_url = "https://api.census.gov/data"
-
     # For 2020, use Decennial Census instead of ACS
     if year == 2020:
-        endpoint = f"{base_url}/2020/dec/dhc"
+        endpoint = f"{CENSUS_URL}/2020/dec/dhc"
         variables = {
-            'P5_001N': 'Total',
+            'P5_001N': 'TOTAL',
             'P5_003N': 'WHITE',   # Not Hispanic, White alone
             'P5_004N': 'BLACK',   # Not Hispanic, Black alone
             'P5_006N': 'ASIAN',   # Not Hispanic, Asian alone
             'P5_002N': 'LATINE'   # Hispanic or Latino
         }
     else:
-        endpoint = f"{base_url}/{year}/acs/acs1"
+        endpoint = f"{CENSUS_URL}/{year}/acs/acs1"
         variables = {
-            'B03002_001E': 'Total',
+            'B03002_001E': 'TOTAL',
             'B03002_003E': 'WHITE',      # Not Hispanic, White alone
             'B03002_004E': 'BLACK',      # Not Hispanic, Black alone
             'B03002_006E': 'ASIAN',      # Not Hispanic, Asian alone
             'B03002_012E': 'LATINE'      # Hispanic or Latino
         }
+    return endpoint, variables
 
-    var_list = ','.join(variables.keys())
-
-    params = {
-        'get': var_list,
-        'for': f'county:{COUNTY_FIPS}',
-        'in': f'state:{STATE_FIPS}',
-        'key': API_KEY
-    }
-
-    try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-        values = data[1]
-
-        result = {
-            'Year': year,
-            'TOTAL': int(values[0]),
-            'WHITE': int(values[1]),
-            'BLACK': int(values[2]),
-            'ASIAN': int(values[3]),
-            'LATINE': int(values[4])
-        }
 
-        print(f"✓ (Total: {result['TOTAL']:,})")
-        return result
-
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return None
+def parse_population(year, values):
+    result = {'Year': year}
+    for race in ['TOTAL', 'WHITE', 'BLACK', 'ASIAN', 'LATINE']:
+        result[race] = int(values[race])
+    return result, f"Total: {result['TOTAL']:,}"
 
 # ============================================================================
-# FUNCTION: Fetch Poverty Data
+# TABLE: Poverty
 # ============================================================================
 
-def fetch_poverty_data(year):
+def poverty_request(year):
     """
-    Fetch poverty rates by race
+    Poverty rates by race
     Table B17001: Poverty Status in the Past 12 Months
     """
-    print(f"  Poverty rates...", end=" ")
-
-    base_url = "https://api.census.gov/data"
-    endpoint = f"{base_url}/{year}/acs/acs1"
-
     # B17001X_001E = Total population for whom poverty status is determined
     # B17001X_002E = Population below poverty level
     # H = White alone, not Hispanic
     # B = Black alone
     # I = Hispanic or Latino
     # D = Asian alone
-
     variables = {
         'B17001H_001E': 'WHITE_Total',
         'B17001H_002E': 'WHITE_Below_Poverty',
@@ -130,156 +106,149 @@ def fetch_poverty_data(year):
         'B17001D_001E': 'ASIAN_Total',
         'B17001D_002E': 'ASIAN_Below_Poverty'
     }
+    return f"{CENSUS_URL}/{year}/acs/acs1", variables
 
-    var_list = ','.join(variables.keys())
-
-    params = {
-        'get': var_list,
-        'for': f'county:{COUNTY_FIPS}',
-        'in': f'state:{STATE_FIPS}',
-        'key': API_KEY
-    }
-
-    try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-        values = data[1]
-
-        result = {
-            'Year': year,
-            'WHITE_Poverty_Rate': (int(values[1]) / int(values[0]) * 100) if int(values[0]) > 0 else None,
-            'BLACK_Poverty_Rate': (int(values[3]) / int(values[2]) * 100) if int(values[2]) > 0 else None,
-            'LATINE_Poverty_Rate': (int(values[5]) / int(values[4]) * 100) if int(values[4]) > 0 else None,
-            'ASIAN_Poverty_Rate': (int(values[7]) / int(values[6]) * 100) if int(values[6]) > 0 else None,
-        }
-
-        print(f"✓ (BLACK: {result['BLACK_Poverty_Rate']:.1f}%)")
-        return result
 
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return None
+def parse_poverty(year, values):
+    result = {'Year': year}
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        total = int(values[f'{race}_Total'])
+        below = int(values[f'{race}_Below_Poverty'])
+        result[f'{race}_Poverty_Rate'] = (below / total * 100) if total > 0 else None
+    rate = result['BLACK_Poverty_Rate']
+    return result, f"BLACK: {rate:.1f}%" if rate is not None else "BLACK: n/a"
 
 # ============================================================================
-# FUNCTION: Fetch Income Data
+# TABLE: Income
 # ============================================================================
 
-def fetch_income_data(year):
+def income_request(year):
     """
-    Fetch median household income by race
+    Median household income by race
     Table B19013: Median Household Income in the Past 12 Months
     """
-    print(f"  Median income...", end=" ")
-
-    base_url = "https://api.census.gov/data"
-    endpoint = f"{base_url}/{year}/acs/acs1"
-
     variables = {
         'B19013H_001E': 'WHITE_Median_Income',
         'B19013B_001E': 'BLACK_Median_Income',
         'B19013I_001E': 'LATINE_Median_Income',
         'B19013D_001E': 'ASIAN_Median_Income'
     }
+    return f"{CENSUS_URL}/{year}/acs/acs1", variables
 
-    var_list = ','.join(variables.keys())
-
-    params = {
-        'get': var_list,
-        'for': f'county:{COUNTY_FIPS}',
-        'in': f'state:{STATE_FIPS}',
-        'key': API_KEY
-    }
-
-    try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
-
-        data = response.json()
-        values = data[1]
-
-        result = {
-            'Year': year,
-            'WHITE_Median_Income': int(values[0]) if values[0] not in ['-', None] else None,
-            'BLACK_Median_Income': int(values[1]) if values[1] not in ['-', None] else None,
-            'LATINE_Median_Income': int(values[2]) if values[2] not in ['-', None] else None,
-            'ASIAN_Median_Income': int(values[3]) if values[3] not in ['-', None] else None,
-        }
 
-        print(f"✓ (BLACK: ${result['BLACK_Median_Income']:,})")
-        return result
-
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return None
+def parse_income(year, values):
+    result = {'Year': year}
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        result[f'{race}_Median_Income'] = _count(values[f'{race}_Median_Income'])
+    income = result['BLACK_Median_Income']
+    return result, f"BLACK: ${income:,}" if income is not None else "BLACK: n/a"
 
 # ============================================================================
-# FUNCTION: Fetch Age Distribution
+# TABLE: Age Distribution
 # ============================================================================
 
-def fetch_age_distribution(year):
+def age_request(year):
     """
-    Fetch median age by race
+    Median age by race
     Table B01002: Median Age by Sex
     """
-    print(f"  Median age...", end=" ")
-
-    base_url = "https://api.census.gov/data"
-    endpoint = f"{base_url}/{year}/acs/acs1"
-
     variables = {
         'B01002H_001E': 'WHITE_Median_Age',
         'B01002B_001E': 'BLACK_Median_Age',
         'B01002I_001E': 'LATINE_Median_Age',
         'B01002D_001E': 'ASIAN_Median_Age'
     }
+    return f"{CENSUS_URL}/{year}/acs/acs1", variables
 
-    var_list = ','.join(variables.keys())
 
-    params = {
-        'get': var_list,
-        'for': f'county:{COUNTY_FIPS}',
-        'in': f'state:{STATE_FIPS}',
-        'key': API_KEY
-    }
-
-    try:
-        response = requests.get(endpoint, params=params)
-        response.raise_for_status()
+def parse_age(year, values):
+    result = {'Year': year}
+    for race in ['WHITE', 'BLACK', 'LATINE', 'ASIAN']:
+        result[f'{race}_Median_Age'] = _count(values[f'{race}_Median_Age'], float)
+    age = result['BLACK_Median_Age']
+    return result, f"BLACK: {age:.1f} yrs" if age is not None else "BLACK: n/a"
 
-        data = response.json()
-        values = data[1]
+# Tables in output order: (name, progress label, request, parse, available in 2020)
+# 2020 has no ACS 1-Year release; only population comes from the Decennial Census
+TABLES = [
+    ('population', 'Population data', population_request, parse_population, True),
+    ('poverty', 'Poverty rates', poverty_request, parse_poverty, False),
+    ('income', 'Median income', income_request, parse_income, False),
+    ('age', 'Median age', age_request, parse_age, False),
+]
 
-        result = {
-            'Year': year,
-            'WHITE_Median_Age': float(values[0]) if values[0] not in ['-', None] else None,
-            'BLACK_Median_Age': float(values[1]) if values[1] not in ['-', None] else None,
-            'LATINE_Median_Age': float(values[2]) if values[2] not in ['-', None] else None,
-            'ASIAN_Median_Age': float(values[3]) if values[3] not in ['-', None] else None,
-        }
 
-        print(f"✓ (BLACK: {result['BLACK_Median_Age']:.1f} yrs)")
-        return result
+def plan_requests(years=YEARS):
+    """
+    Every table/year request for LA County
 
-    except Exception as e:
-        print(f"✗ Error: {e}")
-        return None
+    Returns:
+    --------
+    dict
+        {(table, year): (endpoint, params, variables)} with variables the
+        {Census variable: column} mapping used to read the response
+    """
+    plan = {}
+    for year in years:
+        for table, _, request, _, in_2020 in TABLES:
+            if year == 2020 and not in_2020:
+                continue
+            endpoint, variables = request(year)
+            params = {
+                'get': ','.join(variables.keys()),
+                'for': f'county:{COUNTY_FIPS}',
+                'in': f'state:{STATE_FIPS}'
+            }
+            plan[(table, year)] = (endpoint, params, variables)
+    return plan
 
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
 def main():
-    years = range(2012, 2024)
+    parser = argparse.ArgumentParser(description='Fetch LA County Census tables')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent requests (default {DEFAULT_WORKERS})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'Retries per request on transient errors (default {DEFAULT_RETRIES})')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached responses and request everything again')
+    args = parser.parse_args()
+
+    # Load API key
+    load_dotenv()
+    API_KEY = os.getenv('CENSUS_API_KEY')
+
+    if not API_KEY:
+        raise ValueError("CENSUS_API_KEY not found in .env file")
+
+    print("="*70)
+    print("FETCHING ALL LA COUNTY CENSUS DATA FROM CENSUS API")
+    print("="*70)
+    print(f"API Key loaded: {API_KEY[:10]}...")
+    print()
+
+    plan = plan_requests()
+    client = CensusClient(API_KEY, workers=args.workers, retries=args.retries,
+                          refresh=args.refresh)
+    start = time.perf_counter()
+    responses = client.get_batched({key: (endpoint, params)
+                                    for key, (endpoint, params, _) in plan.items()})
+    client.close()
+    print(f"{len(plan)} table requests in {client.stats['calls']} calls, "
+          f"{time.perf_counter() - start:.1f}s "
+          f"({client.stats['cached']} from cache, {client.stats['retries']} retries, "
+          f"{args.workers} workers)")
+    if client.stats['fallbacks']:
+        print(f"  {client.stats['fallbacks']} request(s) resent on their own after "
+              f"a merged call was rejected")
 
     # Initialize data collectors
-    population_data = []
-    poverty_data = []
-    income_data = []
-    age_data = []
+    collected = {table: [] for table, *_ in TABLES}
+    failed = {table: 0 for table, *_ in TABLES}
 
-    for year in years:
+    for year in YEARS:
         print(f"\n{'='*70}")
         print(f"YEAR {year}")
         print(f"{'='*70}")
@@ -288,24 +257,29 @@ def main():
             print("Note: 2020 uses Decennial Census for population; no ACS 1-Year data for SES")
             print()
 
-        # Population (works for 2020 via Decennial Census)
-        pop = fetch_population_data(year)
-        if pop:
-            population_data.append(pop)
-
-        # SES data (skip 2020 - no ACS 1-Year)
-        if year != 2020:
-            pov = fetch_poverty_data(year)
-            if pov:
-                poverty_data.append(pov)
-
-            inc = fetch_income_data(year)
-            if inc:
-                income_data.append(inc)
-
-            age = fetch_age_distribution(year)
-            if age:
-                age_data.append(age)
+        for table, label, _, parse, _ in TABLES:
+            if (table, year) not in plan:
+                continue
+            print(f"  {label}...", end=" ")
+            rows = responses[(table, year)]
+            try:
+                if isinstance(rows, CensusAPIError):
+                    raise rows
+                variables = plan[(table, year)][2]
+                values = {variables[code]: value for code, value in zip(rows[0], rows[1])
+                          if code in variables}
+                result, summary = parse(year, values)
+            except (CensusAPIError, IndexError, KeyError, ValueError) as e:
+                print(f"✗ Error: {e}")
+                failed[table] += 1
+                continue
+            collected[table].append(result)
+            print(f"✓ ({summary})")
+
+    population_data = collected['population'] if not failed['population'] else []
+    poverty_data = collected['poverty'] if not failed['poverty'] else []
+    income_data = collected['income'] if not failed['income'] else []
+    age_data = collected['age'] if not failed['age'] else []
 
     # ========================================================================
     # SAVE ALL DATASETS
@@ -315,6 +289,12 @@ def main():
     print("SAVING DATA TO FILES")
     print("="*70)
 
+    # A table missing some years is left as it was; the responses that did
+    # arrive are cached, so a rerun only requests the failed ones
+    for table, count in failed.items():
+        if count:
+            print(f"✗ Not saved: {table} ({count} year(s) failed; rerun to fetch only those)")
+
     # 1. Population
     if population_data:
         df_pop = pd.DataFrame(population_data)
@@ -431,6 +411,10 @@ def main():
     print("\n2. Create SES context figure:")
     print("   python scripts/12_ses_context_figure.py")
     print("\n" + "="*70)
+    if any(failed.values()):
+        print(f"INCOMPLETE: {sum(failed.values())} request(s) failed")
+        print("="*70)
+        sys.exit(1)
     print("DONE!")
     print("="*70)
 
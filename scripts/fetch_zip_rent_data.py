@@ -10,31 +10,97 @@ from various public sources:
 4. Census Data Portal
 
 Goal: Create ZIP × Year panel for 2012-2023
+
+ACS years are requested concurrently through census_api.CensusClient,
+paced by a token bucket (--rate requests per second) rather than a fixed
+sleep. Each year is checkpointed to data/zip_rent/acs5/<year>.csv (every
+ZCTA in the country) as soon as it arrives, so an interrupted run resumes
+with the missing years only and both scopes share the checkpoints.
+
+The Zillow file (national, one column per month) is streamed in chunks:
+non-target ZIPs are dropped as they are read, months outside 2012-2023
+are never parsed, and the ZIP x year means are accumulated chunk by
+chunk, so memory does not grow with the file. A URL is read from the
+open HTTP response rather than handed to pandas, which would download
+the whole body into memory first.
+
+Usage:
+    python scripts/fetch_zip_rent_data.py                # LA County ZIPs
+    python scripts/fetch_zip_rent_data.py --scope ca     # every California ZCTA
+    python scripts/fetch_zip_rent_data.py --refresh      # refetch checkpointed ACS years
+    python scripts/fetch_zip_rent_data.py --zillow Zip_zori_uc_sfrcondomfr_sm_month.csv
 """
 
 import pandas as pd
 import numpy as np
-import requests
 import os
+import sys
 import time
+import argparse
+import functools
+import contextlib
 from pathlib import Path
+import requests
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils import load_overdose_data, normalize_zip
+from census_api import CENSUS_URL, DEFAULT_WORKERS, CensusClient, CensusAPIError
+
+# California ZIP codes run from 90001 to 96162
+CA_ZIP_RANGE = (90001, 96162)
+ACS_RATE = 4.0  # Census requests per second
+ACS_CHECKPOINT_DIR = Path('data/zip_rent/acs5')
+ZORI_CHUNK_ROWS = 2000  # Zillow rows (ZIPs) per chunk
+ZORI_TIMEOUT = 60  # Seconds to wait for the Zillow server between reads
+
+parser = argparse.ArgumentParser(description='Fetch ZIP-level rent data')
+parser.add_argument('--scope', choices=['la', 'ca'], default='la',
+                    help="ZIPs to keep: 'la' (ZIPs in the overdose data, default) "
+                         "or 'ca' (every California ZCTA, written to data/zip_rent_ca/)")
+parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                    help=f'Concurrent Census requests (default {DEFAULT_WORKERS})')
+parser.add_argument('--rate', type=float, default=ACS_RATE,
+                    help=f'Census requests per second (default {ACS_RATE:g})')
+parser.add_argument('--refresh', action='store_true',
+                    help='Refetch ACS years that already have a checkpoint')
+parser.add_argument('--zillow', metavar='PATH_OR_URL',
+                    help='Zillow ZIP-level ZORI CSV to read (default: the Zillow download URLs)')
+args = parser.parse_args()
+
 print("=" * 80)
 print("FETCHING ZIP-LEVEL RENT DATA")
 print("=" * 80)
 print()
 
-output_dir = Path('data/zip_rent')
+if args.scope == 'ca':
+    output_dir = Path('data/zip_rent_ca')
+    panel_path = 'data/zip_rent_panel_ca.csv'
+    scope_label = 'California'
+else:
+    output_dir = Path('data/zip_rent')
+    panel_path = 'data/zip_rent_panel.csv'
+    scope_label = 'LA County'
 output_dir.mkdir(parents=True, exist_ok=True)
 
-# LA County ZIP codes from our overdose data
-df = pd.read_csv('data/2012-01-2024-08-overdoses.csv', low_memory=False)
-df['DeathZip_Clean'] = df['DeathZip'].astype(str).str.split(',').str[0].str.strip().str.split('.').str[0]
-df['DeathZip_Clean'] = pd.to_numeric(df['DeathZip_Clean'], errors='coerce')
-la_zips = sorted(df[(df['DeathZip_Clean'] >= 90001) & (df['DeathZip_Clean'] <= 93599)]['DeathZip_Clean'].dropna().unique().astype(int))
-print(f"Target: {len(la_zips)} LA County ZIP codes")
+
+def in_scope(zips):
+    """Boolean mask of the ZIPs (numeric Series) kept for this run"""
+    if args.scope == 'ca':
+        return zips.between(*CA_ZIP_RANGE)
+    return zips.isin(la_zips)
+
+
+if args.scope == 'ca':
+    la_zips = None
+    print(f"Target: every California ZIP/ZCTA ({CA_ZIP_RANGE[0]}-{CA_ZIP_RANGE[1]})")
+else:
+    # LA County ZIP codes from our overdose data
+    df = load_overdose_data(columns=['DeathZip'])
+    df = normalize_zip(df)
+    la_zips = sorted(df.loc[df['ZIP_Valid'], 'ZIP'].unique().astype(int))
+    print(f"Target: {len(la_zips)} LA County ZIP codes")
 print()
 
 # ============================================================================
@@ -52,59 +118,117 @@ print()
 
 zillow_success = False
 
+# Zillow identifier columns; every other column is a month (YYYY-MM-DD)
+ZORI_ID_COLUMNS = ['RegionID', 'RegionName', 'SizeRank', 'RegionType', 'StateName']
+
+
+@functools.lru_cache(maxsize=None)
+def zori_column(column):
+    """Read identifier columns and the 2012-2023 months; skip the rest
+
+    Cached: pandas asks again for every chunk.
+    """
+    if column in ZORI_ID_COLUMNS:
+        return True
+    year = pd.to_datetime(column, errors='coerce').year
+    return 2012 <= year <= 2023 if not pd.isna(year) else False
+
+
+@contextlib.contextmanager
+def open_zori(source):
+    """
+    A file object for the ZORI CSV that read_csv can consume chunk by chunk
+
+    pd.read_csv(url) reads the entire HTTP response into memory before
+    parsing, so URLs are opened here as a stream instead. Local paths are
+    passed through unchanged.
+    """
+    if not str(source).startswith(('http://', 'https://')):
+        yield source
+        return
+    with requests.get(source, stream=True, timeout=ZORI_TIMEOUT) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # Undo any gzip transfer encoding
+        yield response.raw
+
+
+def stream_zori(source, chunksize=ZORI_CHUNK_ROWS):
+    """
+    ZIP x year mean ZORI from a Zillow ZIP file, read in chunks
+
+    Rows outside the target ZIPs are dropped as each chunk is read, only
+    the kept rows are melted, and monthly values are folded into running
+    per ZIP-year sums and counts, so memory stays flat however many ZIPs
+    and months the file holds. URLs are streamed (see open_zori).
+
+    Parameters:
+    -----------
+    source : str
+        Local path or URL of the ZORI CSV
+    chunksize : int
+        Rows per chunk
+
+    Returns:
+    --------
+    tuple of (pd.DataFrame, dict)
+        ZIP, Year, Median_Rent (mean of the monthly values) and
+        {'rows', 'chunks', 'zips'} read statistics
+    """
+    totals = None
+    years = None
+    stats = {'rows': 0, 'chunks': 0, 'zips': 0}
+    with open_zori(source) as handle:
+        for chunk in pd.read_csv(handle, usecols=zori_column, chunksize=chunksize):
+            stats['rows'] += len(chunk)
+            stats['chunks'] += 1
+            chunk = chunk[in_scope(pd.to_numeric(chunk['RegionName'], errors='coerce'))]
+            if chunk.empty:
+                continue
+            stats['zips'] += len(chunk)
+            if years is None:
+                # Year of each month column, parsed once
+                years = {c: pd.Timestamp(c).year for c in chunk.columns
+                         if c not in ZORI_ID_COLUMNS}
+            long = chunk.melt(id_vars=['RegionName'], value_vars=list(years),
+                              var_name='Date', value_name='Rent')
+            long['Year'] = long['Date'].map(years)
+            part = long.groupby(['RegionName', 'Year'])['Rent'].agg(['sum', 'count'])
+            totals = part if totals is None else totals.add(part, fill_value=0)
+
+    if totals is None:
+        return pd.DataFrame(columns=['ZIP', 'Year', 'Median_Rent']), stats
+    annual = (totals['sum'] / totals['count']).rename('Median_Rent').reset_index()
+    annual = annual.rename(columns={'RegionName': 'ZIP'})
+    annual['Year'] = annual['Year'].astype(int)
+    return annual, stats
+
+
 try:
     # Zillow publishes ZORI data publicly
     # Multiple file formats available - try the ZIP code level file
+    # (--zillow reads a downloaded copy instead)
 
-    urls_to_try = [
+    urls_to_try = [args.zillow] if args.zillow else [
         "https://files.zillowstatic.com/research/public_csvs/zori/Zip_ZORI_AllHomesPlusMultifamily_Smoothed.csv",
         "https://files.zillowstatic.com/research/public_csvs/zori/Zip_ZORI_AllHomes_Smoothed.csv",
     ]
 
-    zillow_df = None
+    zillow_annual = None
 
     for url in urls_to_try:
         print(f"Trying: {url}")
         try:
-            zillow_df = pd.read_csv(url)
-            print(f"✓ Downloaded successfully!")
-            print(f"  Shape: {zillow_df.shape}")
-            print(f"  Columns: {list(zillow_df.columns[:10])}...")
+            start = time.perf_counter()
+            zillow_annual, read_stats = stream_zori(url)
+            print(f"✓ Read {read_stats['rows']:,} ZIPs in {read_stats['chunks']} chunk(s) "
+                  f"({time.perf_counter() - start:.1f}s)")
+            print(f"  Kept {read_stats['zips']} {scope_label} ZIPs")
             break
         except Exception as e:
             print(f"  ✗ Failed: {e}")
             continue
 
-    if zillow_df is not None:
-        # Process Zillow data
-        print()
-        print("Processing Zillow data...")
-
-        # Zillow format: RegionID, RegionName (ZIP), ... monthly columns
-        # Filter to LA County ZIPs
-        zillow_df = zillow_df[zillow_df['RegionName'].isin(la_zips)]
-        print(f"  Filtered to {len(zillow_df)} LA County ZIPs")
-
-        # Melt to long format
-        id_cols = ['RegionID', 'RegionName', 'SizeRank', 'RegionType', 'StateName']
-        id_cols_present = [c for c in id_cols if c in zillow_df.columns]
-
-        date_cols = [col for col in zillow_df.columns if col not in id_cols_present]
-
-        zillow_long = zillow_df.melt(id_vars=id_cols_present,
-                                      value_vars=date_cols,
-                                      var_name='Date', value_name='Rent')
-
-        # Convert date to year
-        zillow_long['Date'] = pd.to_datetime(zillow_long['Date'], errors='coerce')
-        zillow_long['Year'] = zillow_long['Date'].dt.year
-
-        # Filter to 2012-2023
-        zillow_long = zillow_long[(zillow_long['Year'] >= 2012) & (zillow_long['Year'] <= 2023)]
-
-        # Annual average
-        zillow_annual = zillow_long.groupby(['RegionName', 'Year'])['Rent'].mean().reset_index()
-        zillow_annual.rename(columns={'RegionName': 'ZIP', 'Rent': 'Median_Rent'}, inplace=True)
+    if zillow_annual is not None:
         zillow_annual['Source'] = 'Zillow_ZORI'
 
         print(f"  Final shape: {zillow_annual.shape}")
@@ -158,51 +282,67 @@ try:
 
     acs_years = range(2012, 2023)  # 2012-2022
 
-    all_acs_data = []
-
-    for year in acs_years:
-        print(f"Fetching ACS {year} (5-year estimates)...")
-
-        # API endpoint
-        base_url = f"https://api.census.gov/data/{year}/acs/acs5"
-
-        # Parameters
-        params = {
-            'get': 'NAME,B25064_001E',  # ZCTA name, Median Gross Rent
-            'for': 'zip code tabulation area:*',  # All ZCTAs
-            'key': census_api_key
-        }
-
-        try:
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Convert to DataFrame
-            df_year = pd.DataFrame(data[1:], columns=data[0])
-            df_year['Year'] = year
-            df_year.rename(columns={
-                'B25064_001E': 'Median_Rent',
-                'zip code tabulation area': 'ZCTA'
-            }, inplace=True)
-
-            # Convert to numeric
-            df_year['ZCTA'] = pd.to_numeric(df_year['ZCTA'], errors='coerce')
-            df_year['Median_Rent'] = pd.to_numeric(df_year['Median_Rent'], errors='coerce')
-
-            # Filter to LA County ZCTAs (approximate match to ZIPs)
-            df_year = df_year[df_year['ZCTA'].isin(la_zips)]
+    def read_checkpoint(year):
+        year_df = pd.read_csv(ACS_CHECKPOINT_DIR / f'{year}.csv')
+        year_df['Year'] = year
+        return year_df
+
+    ACS_CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+    pending = [year for year in acs_years
+               if args.refresh or not (ACS_CHECKPOINT_DIR / f'{year}.csv').exists()]
+    if len(pending) < len(acs_years):
+        print(f"Resuming: {len(acs_years) - len(pending)} year(s) already in {ACS_CHECKPOINT_DIR}/")
+
+    # Every ZCTA in the country, one call per year (ZCTAs are not nested in
+    # states from 2020 on, so the scope is applied afterwards)
+    batch = {year: (f"{CENSUS_URL}/{year}/acs/acs5",
+                    {'get': 'NAME,B25064_001E',  # ZCTA name, Median Gross Rent
+                     'for': 'zip code tabulation area:*'})
+             for year in pending}
+    client = CensusClient(census_api_key, workers=args.workers, rate=args.rate, cache_dir=False)
+    start = time.perf_counter()
+
+    for year, data in client.iter_many(batch):
+        if isinstance(data, CensusAPIError):
+            print(f"  ✗ Failed for {year}: {data}")
+            continue
 
-            all_acs_data.append(df_year)
+        # Convert to DataFrame
+        df_year = pd.DataFrame(data[1:], columns=data[0])
+        df_year.rename(columns={
+            'B25064_001E': 'Median_Rent',
+            'zip code tabulation area': 'ZCTA'
+        }, inplace=True)
+
+        # Convert to numeric
+        df_year['ZCTA'] = pd.to_numeric(df_year['ZCTA'], errors='coerce')
+        df_year['Median_Rent'] = pd.to_numeric(df_year['Median_Rent'], errors='coerce')
+
+        # Checkpoint the whole year before filtering, atomically
+        checkpoint = ACS_CHECKPOINT_DIR / f'{year}.csv'
+        tmp_path = checkpoint.with_suffix(f'.{os.getpid()}.tmp')
+        df_year[['ZCTA', 'Median_Rent']].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, checkpoint)
+        print(f"  ✓ ACS {year}: {len(df_year):,} ZCTAs checkpointed")
+    client.close()
+    if pending:
+        print(f"  {len(pending)} year(s) fetched in {time.perf_counter() - start:.1f}s "
+              f"({client.stats['retries']} retries)")
 
-            print(f"  ✓ {len(df_year)} LA County ZCTAs")
+    all_acs_data = []
+    for year in acs_years:
+        if not (ACS_CHECKPOINT_DIR / f'{year}.csv').exists():
+            continue
+        df_year = read_checkpoint(year)
 
-            time.sleep(0.5)  # Rate limiting
+        # Filter to the target ZCTAs (approximate match to ZIPs)
+        df_year = df_year[in_scope(df_year['ZCTA'])]
+        all_acs_data.append(df_year)
+        print(f"  ✓ {year}: {len(df_year)} {scope_label} ZCTAs")
 
-        except Exception as e:
-            print(f"  ✗ Failed for {year}: {e}")
-            continue
+    missing = len(acs_years) - len(all_acs_data)
+    if missing:
+        print(f"  ✗ {missing} year(s) missing; rerun to fetch only those")
 
     if all_acs_data:
         acs_df = pd.concat(all_acs_data, ignore_index=True)
@@ -322,7 +462,8 @@ if combined_data:
 
     print(f"DEDUPLICATED (best source per ZIP-year):")
     print(f"  Records: {len(combined_dedup)}")
-    print(f"  ZIP-Year coverage: {len(combined_dedup)} / {len(la_zips) * 12} possible ({len(combined_dedup) / (len(la_zips) * 12) * 100:.1f}%)")
+    n_zips = len(la_zips) if la_zips is not None else combined_dedup['ZIP'].nunique()
+    print(f"  ZIP-Year coverage: {len(combined_dedup)} / {n_zips * 12} possible ({len(combined_dedup) / (n_zips * 12) * 100:.1f}%)")
     print()
 
     # Summary statistics
@@ -340,8 +481,8 @@ if combined_data:
     print()
 
     # Also save in main data directory for easy access
-    combined_dedup.to_csv('data/zip_rent_panel.csv', index=False)
-    print(f"✓ Saved: data/zip_rent_panel.csv")
+    combined_dedup.to_csv(panel_path, index=False)
+    print(f"✓ Saved: {panel_path}")
 
 else:
     print("✗ No data sources succeeded")
@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Figure Queue
+Deferred, parallel rendering of analysis figures
+
+A script hands each figure over as a spec: a plotting function plus the
+small data it draws (usually an aggregated frame the script also writes
+to CSV):
+
+    def plot_timeline(annual_counts):
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ...
+        return fig
+
+    figure(plot_timeline, 'results/01_fentanyl_timeline/timeline.png',
+           annual_counts)
+
+By default the figure is drawn and saved right away. With EPI_DEFER_FIGURES
+set (run_all_analyses.py --defer-figures sets it) the spec is pickled to
+results/_figures/queue/ instead, and render_queue() later draws every
+queued spec in a process pool on the Agg backend. The numeric results are
+then complete before any figure is rasterized, and rasterization uses all
+cores.
+
+The plotting function must be defined at module level in a file that can
+be loaded without running the analysis (scripts whose work happens in a
+main() guarded by `if __name__ == "__main__"`, or a plotting module); the
+renderer loads that file by path and looks the function up by name. It
+receives the data as its only argument and returns a matplotlib Figure
+(or a plotnine ggplot); if it returns None the current figure is saved.
+
+With EPI_SKIP_PLOTS set, figure() does nothing (see utils.plots_enabled).
+
+Figure cache:
+    Each saved figure is recorded under results/_figures/cache/ with a key
+    hashed from the plotted data, the plotting code (the function's source
+    and the module constants it reads, or a whole script file) and the
+    style (savefig arguments and matplotlib rcParams). When figure() sees a
+    key that matches the recorded one and the file is still on disk, it
+    keeps the old file instead of drawing (or queueing) it again, so a
+    rerun with unchanged data renders nothing. Scripts that draw inline
+    use figure_key() / figure_current() / record_figure() directly. Set
+    EPI_NO_FIGURE_CACHE=1 to always redraw.
+
+Usage (render whatever is queued):
+    python scripts/figure_queue.py [--jobs N] [--list]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import runpy
+import pickle
+import inspect
+import hashlib
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from utils import plots_enabled
+import results_store
+
+DEFER_FIGURES_ENV = 'EPI_DEFER_FIGURES'
+NO_FIGURE_CACHE_ENV = 'EPI_NO_FIGURE_CACHE'
+QUEUE_DIR = os.path.join('results', '_figures', 'queue')
+CACHE_DIR = os.path.join('results', '_figures', 'cache')
+
+# rcParams that describe the session rather than the figure
+_SESSION_RCPARAMS = ('backend', 'interactive', 'webagg.', 'savefig.directory',
+                     'keymap.', 'toolbar', 'timezone')
+
+# savefig arguments used by the analyses unless a spec overrides them
+SAVEFIG_DEFAULTS = {'dpi': 300, 'bbox_inches': 'tight'}
+
+# Files loaded by this process to find plotting functions {path: namespace}
+_MODULES = {}
+
+
+def _env_flag(name):
+    """True if the environment variable is set to anything but '', 0, false, no"""
+    return os.environ.get(name, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def figures_deferred():
+    """True when figure() should queue specs instead of rendering them"""
+    return _env_flag(DEFER_FIGURES_ENV)
+
+
+def queue_path(directory=None):
+    """Absolute path of the queue folder"""
+    return os.path.join(REPO_ROOT, directory or QUEUE_DIR)
+
+
+def _hash_data(value, digest):
+    """Feed a stable representation of plotted data into digest"""
+    import pandas as pd
+    import numpy as np
+
+    if isinstance(value, pd.DataFrame):
+        digest.update(repr(('DataFrame', value.shape, list(value.columns),
+                            [str(t) for t in value.dtypes])).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(repr(('Series', value.shape, value.name, str(value.dtype))).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.shape, str(value.dtype))).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b'{')
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _hash_data(value[key], digest)
+        digest.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}[{len(value)}]'.encode())
+        for item in value:
+            _hash_data(item, digest)
+    else:
+        digest.update(pickle.dumps(value, protocol=4))
+
+
+def _hash_code(code, digest):
+    """Feed a plotting function (or a script path) into digest"""
+    if isinstance(code, str):
+        with open(code, 'rb') as f:
+            digest.update(f.read())
+        return
+    digest.update(inspect.getsource(code).encode())
+    # Module-level constants the function reads, e.g. a colour dict
+    for name in sorted(code.__code__.co_names):
+        value = code.__globals__.get(name)
+        if isinstance(value, (dict, list, tuple, str, int, float)):
+            digest.update(f'{name}={value!r}'.encode())
+
+
+def _style():
+    """Current matplotlib rcParams that affect how a figure looks"""
+    if 'matplotlib' not in sys.modules:
+        return {}
+    import matplotlib
+    return {key: repr(value) for key, value in sorted(matplotlib.rcParams.items())
+            if not key.startswith(_SESSION_RCPARAMS)}
+
+
+def figure_key(data, code, **savefig_kwargs):
+    """
+    Cache key for a figure: plotted data + plotting code + style
+
+    Parameters:
+    -----------
+    data : object
+        What is plotted; DataFrames, Series, arrays, dicts and lists are
+        hashed by content, anything else by its pickle
+    code : function or str
+        Plotting function, or the path of a script that draws the figure
+        (typically __file__)
+    **savefig_kwargs
+        savefig arguments (dpi, bbox_inches, ...)
+
+    Returns:
+    --------
+    str
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    _hash_data(data, digest)
+    _hash_code(code, digest)
+    digest.update(repr(sorted(savefig_kwargs.items())).encode())
+    digest.update(repr(_style()).encode())
+    return digest.hexdigest()
+
+
+def _cache_record_path(output_path):
+    name = hashlib.sha256(os.path.abspath(output_path).encode()).hexdigest()[:16]
+    return os.path.join(REPO_ROOT, CACHE_DIR, f"{name}.json")
+
+
+def figure_current(output_path, key):
+    """
+    Whether output_path was last saved with this key and is unchanged
+
+    Parameters:
+    -----------
+    output_path : str
+        Figure file
+    key : str
+        From figure_key()
+
+    Returns:
+    --------
+    bool
+        False when the cache is disabled (EPI_NO_FIGURE_CACHE)
+    """
+    if _env_flag(NO_FIGURE_CACHE_ENV):
+        return False
+    try:
+        with open(_cache_record_path(output_path)) as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if record.get('key') != key:
+        return False
+    path = os.path.join(REPO_ROOT, output_path)
+    if not os.path.exists(path) and results_store.store_mode():
+        # Released by the runner before this script started; the stored
+        # copy is still the figure for this key
+        results_store.restore([output_path], results_store.store_mode())
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return record.get('size') == stat.st_size and record.get('mtime_ns') == stat.st_mtime_ns
+
+
+def record_figure(output_path, key):
+    """Remember that output_path was just saved with this key"""
+    stat = os.stat(os.path.join(REPO_ROOT, output_path))
+    path = _cache_record_path(output_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'output': output_path, 'key': key, 'size': stat.st_size,
+                   'mtime_ns': stat.st_mtime_ns}, f)
+    os.replace(path + '.tmp', path)
+
+
+def figure(draw, output_path, data=None, **savefig_kwargs):
+    """
+    Render a figure now, or queue it for the render pool
+
+    Parameters:
+    -----------
+    draw : function
+        Module-level plotting function called as draw(data)
+    output_path : str
+        Where to save the figure (relative to the repo root)
+    data : object, optional
+        Data the figure needs; must be picklable and should be small
+    **savefig_kwargs
+        Passed to savefig (defaults: dpi=300, bbox_inches='tight')
+
+    Returns:
+    --------
+    str or None
+        Path of the saved (or unchanged) figure or of the queued spec;
+        None when plots are skipped
+    """
+    if not plots_enabled():
+        return None
+    if draw.__qualname__ != draw.__name__:
+        raise ValueError(f"{draw.__qualname__} must be a module-level function "
+                         "so the render pool can find it")
+
+    savefig_kwargs = dict(SAVEFIG_DEFAULTS, **savefig_kwargs)
+    key = figure_key(data, draw, **savefig_kwargs)
+    if figure_current(output_path, key):
+        print(f"Unchanged: {os.path.basename(output_path)}")
+        return output_path
+
+    spec = {
+        'module': os.path.abspath(draw.__code__.co_filename),
+        'function': draw.__name__,
+        'data': data,
+        'output': output_path,
+        'savefig': savefig_kwargs,
+        'key': key,
+        'queued': time.time()
+    }
+
+    if not figures_deferred():
+        _save(draw(data), spec)
+        record_figure(output_path, key)
+        print(f"Saved: {os.path.basename(output_path)}")
+        return output_path
+
+    directory = queue_path()
+    os.makedirs(directory, exist_ok=True)
+    # One spec per output, so a rerun replaces what it queued before
+    key = hashlib.sha256(os.path.abspath(output_path).encode()).hexdigest()[:16]
+    path = os.path.join(directory, f"{key}.pkl")
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + '.tmp', path)
+    print(f"Queued: {os.path.basename(output_path)}")
+    return path
+
+
+def _save(result, spec):
+    """Save what a plotting function drew, then close it"""
+    import matplotlib.pyplot as plt
+
+    output = os.path.join(REPO_ROOT, spec['output'])
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    if result is None:
+        result = plt.gcf()
+    # Written beside the target and renamed over it, so a figure linked
+    # into the results store is replaced rather than overwritten in place
+    stem, extension = os.path.splitext(output)
+    tmp_path = f"{stem}.{os.getpid()}.tmp{extension}"
+    if hasattr(result, 'savefig'):
+        result.savefig(tmp_path, **spec['savefig'])
+    else:
+        # plotnine ggplot
+        result.save(tmp_path, verbose=False, **spec['savefig'])
+    os.replace(tmp_path, output)
+    plt.close('all')
+
+
+def _load_function(module_path, name):
+    """Load a plotting function's file once per process and return it"""
+    if module_path not in _MODULES:
+        _MODULES[module_path] = runpy.run_path(module_path, run_name='__figure__')
+    return _MODULES[module_path][name]
+
+
+def pending(directory=None):
+    """Queued spec files, oldest first"""
+    paths = glob.glob(os.path.join(queue_path(directory), '*.pkl'))
+    return sorted(paths, key=os.path.getmtime)
+
+
+def _start_worker():
+    """Render pool initializer: Agg backend, repo root as working directory"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    os.chdir(REPO_ROOT)
+    os.environ.pop(DEFER_FIGURES_ENV, None)
+
+
+def render_spec(path):
+    """
+    Render one queued spec and remove it from the queue
+
+    Parameters:
+    -----------
+    path : str
+        Spec file written by figure()
+
+    Returns:
+    --------
+    tuple of (str, float, str or None)
+        Output path, seconds spent and the traceback if rendering failed
+    """
+    start = time.perf_counter()
+    output = path
+    try:
+        with open(path, 'rb') as f:
+            spec = pickle.load(f)
+        output = spec['output']
+        draw = _load_function(spec['module'], spec['function'])
+        _save(draw(spec['data']), spec)
+        record_figure(output, spec['key'])
+    except Exception:
+        return output, time.perf_counter() - start, traceback.format_exc()
+    os.remove(path)
+    return output, time.perf_counter() - start, None
+
+
+def render_queue(jobs=None, directory=None):
+    """
+    Render every queued figure in a process pool
+
+    Specs that fail stay in the queue so they can be retried.
+
+    Parameters:
+    -----------
+    jobs : int, optional
+        Worker processes (default: CPU count)
+    directory : str, optional
+        Queue folder relative to the repo root (default: QUEUE_DIR)
+
+    Returns:
+    --------
+    dict
+        {'rendered': [(output, seconds)], 'failed': [(output, traceback)],
+         'seconds': wall time}
+    """
+    specs = pending(directory)
+    results = {'rendered': [], 'failed': [], 'seconds': 0.0}
+    if not specs:
+        return results
+
+    start = time.perf_counter()
+    jobs = max(1, min(jobs or os.cpu_count(), len(specs)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_start_worker) as pool:
+        futures = [pool.submit(render_spec, path) for path in specs]
+        for future in as_completed(futures):
+            output, seconds, error = future.result()
+            if error is None:
+                results['rendered'].append((output, seconds))
+                print(f"✓ {output} ({seconds:.1f}s)")
+            else:
+                results['failed'].append((output, error))
+                print(f"✗ {output}\n{error}")
+    results['seconds'] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render queued figures')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--list', action='store_true',
+                        help='List queued figures, then exit')
+    args = parser.parse_args()
+
+    specs = pending()
+    if args.list:
+        for path in specs:
+            with open(path, 'rb') as f:
+                spec = pickle.load(f)
+            print(f"  {spec['output']:<70} {spec['function']}")
+        print(f"{len(specs)} figure(s) queued")
+        return
+
+    print(f"Rendering {len(specs)} queued figure(s) with {args.jobs} workers...")
+    results = render_queue(jobs=args.jobs)
+    print(f"\n{len(results['rendered'])} rendered, {len(results['failed'])} failed "
+          f"in {results['seconds']:.1f}s")
+    sys.exit(1 if results['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+FRED Series Cache
+One local copy of every FRED series the economic analyses use
+
+Scripts 28-35 and 42 call get_series() instead of building their own
+fredapi client. Each series is stored once under data/fred/, keyed by
+series ID and vintage:
+
+    data/fred/UNRATE/latest.csv        observations as of the last refresh
+    data/fred/UNRATE/latest.json       when and where they were fetched
+    data/fred/UNRATE/2024-01-31.csv    the series as published on that date
+
+The full series is cached and the requested window is cut locally, so
+scripts asking for different date ranges share one download. `latest` is
+refreshed once it is older than the TTL (EPI_FRED_TTL_DAYS, default 7); a
+pinned vintage never changes and never expires. If a refresh fails the
+cached copy is used with a warning.
+
+Settings:
+    FRED_API_KEY        API key, needed only to download
+    EPI_FRED_OFFLINE=1  Never touch the network; a series missing from the
+                        cache raises FredCacheMiss
+    EPI_FRED_TTL_DAYS   Age after which `latest` is refreshed
+    EPI_FRED_DIR        Cache folder (default data/fred)
+    EPI_FRED_URL        API root, e.g. a replay server started with `serve`
+
+The replay server answers /fred/series/observations from the cache in
+FRED's JSON format, so the analyses (or a copy of the cache) can be
+exercised without an API key or network access:
+
+    python scripts/fred_cache.py serve --port 8765 &
+    EPI_FRED_URL=http://127.0.0.1:8765/fred EPI_FRED_DIR=/tmp/fred \\
+        python scripts/28_unemployment_overdose_correlation.py
+
+Usage:
+    python scripts/fred_cache.py                        # same as `fetch` (pipeline step)
+    python scripts/fred_cache.py fetch                  # every series in FRED_SERIES
+    python scripts/fred_cache.py fetch UNRATE CAUR --refresh
+    python scripts/fred_cache.py fetch UNRATE --vintage 2024-01-31
+    python scripts/fred_cache.py list
+    python scripts/fred_cache.py serve [--port 8765]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+FRED_DIR = os.path.join('data', 'fred')
+FRED_URL = 'https://api.stlouisfed.org/fred'
+LATEST = 'latest'
+DEFAULT_TTL_DAYS = 7
+REQUEST_TIMEOUT = 30
+PAGE_LIMIT = 100000  # FRED's maximum observations per request
+
+API_KEY_ENV = 'FRED_API_KEY'
+OFFLINE_ENV = 'EPI_FRED_OFFLINE'
+TTL_ENV = 'EPI_FRED_TTL_DAYS'
+DIR_ENV = 'EPI_FRED_DIR'
+URL_ENV = 'EPI_FRED_URL'
+
+# Series used by the economic analyses, fetched by `fetch` with no arguments
+FRED_SERIES = {
+    'UNRATE': 'Unemployment rate, national (28, 34, 42)',
+    'CAUR': 'Unemployment rate, California (28)',
+    'LES1252881600Q': 'Median usual weekly real earnings (30)',
+    'CIVPART': 'Labor force participation rate (31, 34, 42)',
+    'MORTGAGE30US': '30-year fixed mortgage rate (32)',
+    'CSUSHPISA': 'Case-Shiller national home price index (32)',
+    'SIPOVGINIUSA': 'Gini index, United States (33)',
+    'MANEMP': 'Manufacturing employment (35)',
+    'USCONS': 'Construction employment (35)',
+    'CES7000000001': 'Leisure and hospitality employment (35)',
+}
+
+
+class FredCacheMiss(LookupError):
+    """A series is not in the cache and the network may not be used"""
+
+
+def _flag(name):
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes')
+
+
+def cache_dir():
+    """Cache folder (EPI_FRED_DIR, or data/fred under the repo root)"""
+    return os.environ.get(DIR_ENV) or os.path.join(REPO_ROOT, FRED_DIR)
+
+
+def normalize_vintage(vintage=None):
+    """'latest' or the vintage date as YYYY-MM-DD"""
+    if vintage is None or str(vintage).lower() == LATEST:
+        return LATEST
+    return pd.Timestamp(vintage).strftime('%Y-%m-%d')
+
+
+def series_path(series_id, vintage=LATEST, directory=None):
+    """Cached observations file for a series and vintage"""
+    return os.path.join(directory or cache_dir(), series_id.upper(),
+                        f"{normalize_vintage(vintage)}.csv")
+
+
+def read_cached(series_id, vintage=LATEST, directory=None):
+    """
+    Read a series from the cache
+
+    Returns:
+    --------
+    tuple of (pd.Series, dict) or (None, None)
+        Observations indexed by date and the metadata written with them,
+        or (None, None) when the series is not cached
+    """
+    path = series_path(series_id, vintage, directory)
+    if not os.path.exists(path):
+        return None, None
+    frame = pd.read_csv(path, parse_dates=['date'])
+    series = pd.Series(frame['value'].to_numpy(dtype='float64'),
+                       index=pd.DatetimeIndex(frame['date'], name=None), name=series_id.upper())
+    meta = {}
+    meta_path = path[:-len('.csv')] + '.json'
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+    return series, meta
+
+
+def _replace(path, write):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_cached(series, series_id, vintage=LATEST, source=None, directory=None):
+    """Store a series (and when and where it came from) in the cache"""
+    path = series_path(series_id, vintage, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    frame = pd.DataFrame({'date': series.index.strftime('%Y-%m-%d'), 'value': series.to_numpy()})
+    _replace(path, lambda p: frame.to_csv(p, index=False))
+    meta = {
+        'series_id': series_id.upper(),
+        'vintage': normalize_vintage(vintage),
+        'fetched': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        'observations': int(len(series)),
+        'first': frame['date'].iloc[0] if len(frame) else None,
+        'last': frame['date'].iloc[-1] if len(frame) else None,
+    }
+
+    def dump(p):
+        with open(p, 'w') as f:
+            json.dump(meta, f, indent=1)
+            f.write('\n')
+    _replace(path[:-len('.csv')] + '.json', dump)
+    return meta
+
+
+def _api_url():
+    return os.environ.get(URL_ENV) or FRED_URL
+
+
+def fetch_series(series_id, vintage=LATEST, url=None, api_key=None):
+    """
+    Download every observation of a series from the FRED API
+
+    Parameters:
+    -----------
+    series_id : str
+        FRED series ID
+    vintage : str
+        'latest' or a date; a date fetches the series as published then
+    url : str, optional
+        API root (EPI_FRED_URL, or the FRED API)
+    api_key : str, optional
+        FRED API key (FRED_API_KEY); not needed for a replay server
+
+    Returns:
+    --------
+    pd.Series
+        Float observations indexed by date, NaN where FRED has '.'
+
+    Raises:
+    -------
+    ValueError
+        If no API key is set for the FRED API, or FRED rejects the request
+    OSError
+        On network errors
+    """
+    url = url or _api_url()
+    api_key = api_key or os.environ.get(API_KEY_ENV)
+    if not api_key:
+        if url == FRED_URL:
+            raise ValueError(f"{API_KEY_ENV} is not set; get a free key at "
+                             f"https://fred.stlouisfed.org/docs/api/api_key.html")
+        api_key = 'replay'
+    params = {'series_id': series_id, 'api_key': api_key, 'file_type': 'json',
+              'limit': PAGE_LIMIT}
+    vintage = normalize_vintage(vintage)
+    if vintage != LATEST:
+        params['realtime_start'] = params['realtime_end'] = vintage
+
+    observations = []
+    while True:
+        params['offset'] = len(observations)
+        request = f"{url.rstrip('/')}/series/observations?{urllib.parse.urlencode(params)}"
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.load(e).get('error_message', e.reason)
+            except ValueError:
+                message = e.reason
+            raise ValueError(f"FRED {series_id}: {message}") from None
+        page = payload.get('observations', [])
+        observations += page
+        if not page or len(observations) >= int(payload.get('count', 0)):
+            break
+
+    dates = pd.DatetimeIndex([o['date'] for o in observations])
+    values = pd.to_numeric(pd.Series([o['value'] for o in observations]), errors='coerce')
+    return pd.Series(values.to_numpy(dtype='float64'), index=dates, name=series_id.upper())
+
+
+def _age_days(meta):
+    try:
+        fetched = datetime.fromisoformat(meta['fetched'])
+    except (KeyError, TypeError, ValueError):
+        return float('inf')
+    return (datetime.now() - fetched).total_seconds() / 86400
+
+
+def get_series(series_id, observation_start=None, observation_end=None, vintage=None,
+               ttl=None, offline=None, refresh=False):
+    """
+    A FRED series from the local cache, downloaded when missing or stale
+
+    Drop-in for fredapi's Fred.get_series(series_id, observation_start,
+    observation_end).
+
+    Parameters:
+    -----------
+    series_id : str
+        FRED series ID, e.g. 'UNRATE'
+    observation_start, observation_end : str or datetime, optional
+        Window of observations to return (inclusive)
+    vintage : str, optional
+        Date the series was published (YYYY-MM-DD); 'latest' if None
+    ttl : float, optional
+        Days before `latest` is refreshed (EPI_FRED_TTL_DAYS, default 7)
+    offline : bool, optional
+        Never use the network (EPI_FRED_OFFLINE)
+    refresh : bool
+        Download even if the cached copy is fresh
+
+    Returns:
+    --------
+    pd.Series
+        Float observations indexed by date, named series_id
+
+    Raises:
+    -------
+    FredCacheMiss
+        If offline and the series is not cached
+    ValueError, OSError
+        If the download fails and there is no cached copy
+    """
+    series_id = series_id.upper()
+    vintage = normalize_vintage(vintage)
+    offline = _flag(OFFLINE_ENV) if offline is None else offline
+    if ttl is None:
+        ttl = float(os.environ.get(TTL_ENV) or DEFAULT_TTL_DAYS)
+
+    series, meta = read_cached(series_id, vintage)
+    stale = series is not None and vintage == LATEST and _age_days(meta) > ttl
+    if series is None or stale or refresh:
+        if offline:
+            if series is None:
+                raise FredCacheMiss(f"{series_id} ({vintage}) is not in {cache_dir()} "
+                                    f"and {OFFLINE_ENV} is set")
+        else:
+            try:
+                fetched = fetch_series(series_id, vintage)
+            except (OSError, ValueError) as e:
+                if series is None:
+                    raise
+                print(f"  ✗ Could not refresh {series_id} ({e}); "
+                      f"using the copy cached {meta.get('fetched', 'earlier')}")
+            else:
+                write_cached(fetched, series_id, vintage, _api_url())
+                series = fetched
+
+    start = pd.Timestamp(observation_start) if observation_start is not None else None
+    end = pd.Timestamp(observation_end) if observation_end is not None else None
+    return series.loc[start:end]
+
+
+# ============================================================================
+# Replay server
+# ============================================================================
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answers FRED observation requests from the cache (server.directory)"""
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urllib.parse.urlparse(self.path)
+        query = dict(urllib.parse.parse_qsl(parsed.query))
+        if not parsed.path.rstrip('/').endswith('/series/observations'):
+            self._send(404, {'error_code': 404, 'error_message': 'Not Found.'})
+            return
+        series_id = query.get('series_id', '')
+        vintage = query.get('realtime_end', LATEST)
+        series, _ = read_cached(series_id, vintage, self.server.directory) if series_id else (None, None)
+        if series is None:
+            self._send(400, {'error_code': 400, 'error_message':
+                             f'Bad Request.  The series {series_id} ({vintage}) is not cached.'})
+            return
+        offset = int(query.get('offset', 0))
+        limit = int(query.get('limit', PAGE_LIMIT))
+        page = series.iloc[offset:offset + limit]
+        self._send(200, {
+            'realtime_start': vintage, 'realtime_end': vintage,
+            'count': len(series), 'offset': offset, 'limit': limit,
+            'observations': [{'realtime_start': vintage, 'realtime_end': vintage,
+                              'date': date.strftime('%Y-%m-%d'),
+                              'value': '.' if pd.isna(value) else repr(float(value))}
+                             for date, value in page.items()],
+        })
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def start_replay_server(port=0, directory=None, verbose=False):
+    """
+    Serve the cache over HTTP in a background thread
+
+    Parameters:
+    -----------
+    port : int
+        Port to listen on (0 picks a free one)
+    directory : str, optional
+        Cache folder to replay (cache_dir() if None)
+    verbose : bool
+        Log each request
+
+    Returns:
+    --------
+    tuple of (ThreadingHTTPServer, str)
+        The server (call shutdown() when done) and its API root, for EPI_FRED_URL
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), ReplayHandler)
+    server.directory = directory or cache_dir()
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/fred"
+
+
+def list_cached(directory=None):
+    """Metadata of every cached series and vintage"""
+    directory = directory or cache_dir()
+    entries = []
+    if not os.path.isdir(directory):
+        return entries
+    for series_id in sorted(os.listdir(directory)):
+        folder = os.path.join(directory, series_id)
+        if not os.path.isdir(folder):
+            continue
+        for name in sorted(os.listdir(folder)):
+            if name.endswith('.csv'):
+                series, meta = read_cached(series_id, name[:-len('.csv')], directory)
+                entries.append(dict({'series_id': series_id, 'vintage': name[:-len('.csv')],
+                                     'observations': len(series)}, **meta))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local cache of FRED series')
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('fetch', help='Download series into the cache')
+    p.add_argument('series', nargs='*', help='Series IDs (default: FRED_SERIES)')
+    p.add_argument('--vintage', default=LATEST, help="'latest' or YYYY-MM-DD")
+    p.add_argument('--refresh', action='store_true', help='Download even if fresh')
+    sub.add_parser('list', help='List cached series')
+    p = sub.add_parser('serve', help='Replay the cache as a FRED API server')
+    p.add_argument('--port', type=int, default=8765)
+    p.add_argument('--verbose', action='store_true', help='Log each request')
+    # With no command (as run_all_analyses.py runs it), refresh every series
+    parser.set_defaults(command='fetch', series=[], vintage=LATEST, refresh=False)
+    args = parser.parse_args()
+
+    if args.command == 'fetch':
+        failed = 0
+        for series_id in args.series or list(FRED_SERIES):
+            try:
+                series = get_series(series_id, vintage=args.vintage, refresh=args.refresh)
+            except (LookupError, OSError, ValueError) as e:
+                print(f"✗ {series_id}: {e}")
+                failed += 1
+                continue
+            print(f"✓ {series_id:<16} {len(series):>6} observations "
+                  f"({series.index.min():%Y-%m-%d} to {series.index.max():%Y-%m-%d})")
+        sys.exit(1 if failed else 0)
+
+    elif args.command == 'list':
+        entries = list_cached()
+        if not entries:
+            print(f"No series cached in {cache_dir()}")
+        for entry in entries:
+            age = _age_days(entry)
+            age = f"{age:5.1f} days old" if age != float('inf') else '     unknown age'
+            print(f"{entry['series_id']:<16} {entry['vintage']:<11} {entry['observations']:>6} obs  "
+                  f"{entry.get('first') or '':>10} to {entry.get('last') or '':<10}  {age}")
+
+    else:
+        server, url = start_replay_server(args.port, verbose=args.verbose)
+        print(f"Replaying {cache_dir()} at {url}")
+        print(f"  export {URL_ENV}={url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Golden Output Regression Check
+Proves that a faster implementation still produces the same tables
+
+`snapshot` copies every CSV under results/ from a trusted reference run
+into results/_golden/<name>/, with a SHA-256 per file. `compare` checks
+the current results/ against it:
+    - files whose bytes are unchanged are accepted from the hash alone
+    - other files are read and aligned on their key columns (Year, Race,
+      ZIP, ... whichever identify rows uniquely in both tables; by position
+      otherwise), then compared column by column: numbers within
+      |new - old| <= atol + rtol * |old|, everything else exactly
+    - a concise drift report lists, per drifted file, the columns that
+      moved, how many rows, the largest difference and where it is
+
+Exit status is 1 when any file drifted or went missing, so the check can
+gate a performance change:
+
+    python scripts/golden_outputs.py snapshot                 # on the reference code
+    python scripts/run_all_analyses.py --skip-plots --force all
+    python scripts/golden_outputs.py compare --rtol 1e-6
+
+Usage:
+    python scripts/golden_outputs.py snapshot [--name NAME] [PATH ...]
+    python scripts/golden_outputs.py compare [--name NAME] [--atol A] [--rtol R]
+                                             [--keys Year,Race,ZIP] [--json FILE] [PATH ...]
+    python scripts/golden_outputs.py list
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+RESULTS_DIR = 'results'
+GOLDEN_DIR = os.path.join(RESULTS_DIR, '_golden')
+DEFAULT_NAME = 'reference'
+
+# Columns that identify rows, tried in this order; those present in both
+# tables are used if together they are unique
+KEY_COLUMNS = ['Year', 'Month', 'Period', 'Race', 'Race_Ethnicity_Cleaned',
+               'Race/Ethnicity', 'ZIP', 'Substance', 'Age_Group',
+               'Age_Group_Custom', 'Metric', 'Model', 'Component']
+
+DEFAULT_ATOL = 1e-9
+DEFAULT_RTOL = 1e-6
+EXAMPLES_SHOWN = 3  # Drifted columns listed per file
+MISSING_KEY = '<NA>'  # Text of a missing key value, whatever its dtype
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def csv_files(paths=(RESULTS_DIR,)):
+    """
+    CSV files under paths, relative to results/
+
+    Folders starting with '_' or '.' (run reports, the golden copies, the
+    results store) are skipped.
+    """
+    found = []
+    for path in paths:
+        path = os.path.join(REPO_ROOT, path)
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(('_', '.')))
+            found += [os.path.join(root, n) for n in sorted(names) if n.endswith('.csv')]
+    results_root = os.path.join(REPO_ROOT, RESULTS_DIR)
+    return [os.path.relpath(p, results_root).replace(os.sep, '/') for p in found]
+
+
+def golden_path(name=DEFAULT_NAME):
+    return os.path.join(REPO_ROOT, GOLDEN_DIR, name)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def snapshot(name=DEFAULT_NAME, paths=(RESULTS_DIR,)):
+    """
+    Copy the CSVs under paths into the golden set name
+
+    Files are copied, not linked, so a later run cannot change the
+    reference by rewriting an output in place.
+
+    Returns:
+    --------
+    dict
+        The golden index {'name', 'created', 'commit', 'files': {relative path: sha256}}
+    """
+    directory = golden_path(name)
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    files = {}
+    for relative in csv_files(paths):
+        target = os.path.join(directory, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(os.path.join(REPO_ROOT, RESULTS_DIR, relative), target)
+        files[relative] = _sha256(target)
+    index = {'name': name, 'created': datetime.now().isoformat(timespec='seconds'),
+             'commit': _git_commit(), 'files': files}
+    with open(os.path.join(directory, 'golden.json'), 'w') as f:
+        json.dump(index, f, indent=1)
+        f.write('\n')
+    return index
+
+
+def load_golden(name=DEFAULT_NAME):
+    path = os.path.join(golden_path(name), 'golden.json')
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"no golden set {name!r}; create it with "
+                                f"`python scripts/golden_outputs.py snapshot --name {name}`")
+    with open(path) as f:
+        return json.load(f)
+
+
+def _key_text(values):
+    """
+    A key column as text that does not depend on its dtype
+
+    Integral numbers lose their '.0', so 2019 and 2019.0 (or Int32 and
+    float ZIPs) give the same text, and every kind of missing value maps
+    to MISSING_KEY.
+    """
+    missing = values.isna()
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.astype('float64')
+        integral = ~missing & (numbers % 1 == 0)
+        text = numbers.astype(str).where(
+            ~integral, numbers.where(integral, 0).astype('int64').astype(str))
+    else:
+        text = values.astype(str)
+    return text.where(~missing, MISSING_KEY)
+
+
+def _align(old, new, keys):
+    """
+    Line up the rows of two tables
+
+    Returns:
+    --------
+    tuple
+        (old rows, new rows, key columns used, rows only in old, rows only
+        in new); the row frames share an index
+    """
+    keys = [k for k in keys if k in old.columns and k in new.columns]
+    if keys:
+        # Compare keys as text so 90001 and '90001' (or 2019 and 2019.0) match
+        old_keys = old[keys].apply(_key_text)
+        new_keys = new[keys].apply(_key_text)
+        if not old_keys.duplicated().any() and not new_keys.duplicated().any():
+            old = old.set_index(pd.MultiIndex.from_frame(old_keys))
+            new = new.set_index(pd.MultiIndex.from_frame(new_keys))
+            common = old.index.intersection(new.index, sort=False)
+            return (old.loc[common], new.loc[common], keys,
+                    old.index.difference(new.index), new.index.difference(old.index))
+    n = min(len(old), len(new))
+    return (old.iloc[:n].reset_index(drop=True), new.iloc[:n].reset_index(drop=True), [],
+            range(n, len(old)), range(n, len(new)))
+
+
+def compare_frames(old, new, atol=DEFAULT_ATOL, rtol=DEFAULT_RTOL, keys=KEY_COLUMNS):
+    """
+    Compare two tables column by column
+
+    Parameters:
+    -----------
+    old, new : pd.DataFrame
+        Reference and candidate tables
+    atol, rtol : float
+        Numbers match when |new - old| <= atol + rtol * |old| (NaN matches NaN)
+    keys : list of str
+        Candidate key columns for row alignment
+
+    Returns:
+    --------
+    dict
+        {'keys', 'rows_removed', 'rows_added', 'columns_removed',
+         'columns_added', 'columns': [{'column', 'rows', 'of', 'max_abs',
+         'max_rel', 'where'}]} with one 'columns' entry per drifted column
+    """
+    old_rows, new_rows, used_keys, removed, added = _align(old, new, keys)
+    report = {
+        'keys': used_keys,
+        'rows_removed': len(removed),
+        'rows_added': len(added),
+        'columns_removed': [c for c in old.columns if c not in new.columns],
+        'columns_added': [c for c in new.columns if c not in old.columns],
+        'columns': [],
+    }
+    for column in old.columns:
+        if column not in new.columns or column in used_keys:
+            continue
+        a, b = old_rows[column], new_rows[column]
+        entry = {'column': column, 'of': len(a), 'max_abs': None, 'max_rel': None}
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b) \
+                and not pd.api.types.is_bool_dtype(a):
+            x = a.to_numpy(dtype='float64', na_value=np.nan)
+            y = b.to_numpy(dtype='float64', na_value=np.nan)
+            differs = ~np.isclose(y, x, rtol=rtol, atol=atol, equal_nan=True)
+            if differs.any():
+                delta = np.abs(y - x)
+                delta[~differs] = 0
+                # NaN on one side only counts as an infinite difference
+                delta = np.where(np.isnan(delta) & differs, np.inf, delta)
+                worst = int(np.argmax(delta))
+                entry['max_abs'] = float(delta[worst])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    entry['max_rel'] = float(np.nanmax(np.where(differs, delta / np.abs(x), 0)))
+        else:
+            differs = (a.astype(str).to_numpy() != b.astype(str).to_numpy())
+            worst = int(np.argmax(differs)) if differs.any() else 0
+        if differs.any():
+            entry['rows'] = int(differs.sum())
+            label = old_rows.index[worst]
+            if used_keys:
+                label = ', '.join(f"{k}={v}" for k, v in zip(used_keys, np.atleast_1d(label)))
+            else:
+                label = f"row {label}"
+            entry['where'] = f"{label}: {_show(a.iloc[worst])} -> {_show(b.iloc[worst])}"
+            report['columns'].append(entry)
+    report['columns'].sort(key=lambda e: -e['rows'])
+    return report
+
+
+def _show(value):
+    """A table cell as it would read in the CSV"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if pd.isna(value):
+        return 'NaN'
+    return repr(value)
+
+
+def _drifted(report):
+    return bool(report['columns'] or report['rows_added'] or report['rows_removed']
+                or report['columns_added'] or report['columns_removed'])
+
+
+def compare(name=DEFAULT_NAME, paths=(RESULTS_DIR,), atol=DEFAULT_ATOL,
+            rtol=DEFAULT_RTOL, keys=KEY_COLUMNS):
+    """
+    Compare the current results with a golden set
+
+    Parameters:
+    -----------
+    name : str
+        Golden set to compare with
+    paths : list of str
+        Limit the check to these files or folders
+    atol, rtol : float
+        Numeric tolerances (see compare_frames)
+    keys : list of str
+        Candidate key columns for row alignment
+
+    Returns:
+    --------
+    dict
+        {'identical', 'within_tolerance', 'missing', 'new' (lists of
+        files), 'drifted': {file: compare_frames report}, 'errors': {file: message}}
+    """
+    golden = load_golden(name)
+    current = set(csv_files(paths))
+    if list(paths) == [RESULTS_DIR]:
+        expected = golden['files']
+    else:
+        prefixes = [os.path.relpath(os.path.join(REPO_ROOT, p), os.path.join(REPO_ROOT, RESULTS_DIR))
+                    .replace(os.sep, '/') for p in paths]
+        expected = {f: sha for f, sha in golden['files'].items()
+                    if any(f == p or f.startswith(p.rstrip('/') + '/') for p in prefixes)}
+
+    outcome = {'identical': [], 'within_tolerance': [], 'missing': [], 'drifted': {},
+               'errors': {}, 'new': sorted(current - set(golden['files']))}
+    for relative, sha in sorted(expected.items()):
+        path = os.path.join(REPO_ROOT, RESULTS_DIR, relative)
+        if relative not in current:
+            outcome['missing'].append(relative)
+            continue
+        if _sha256(path) == sha:
+            outcome['identical'].append(relative)
+            continue
+        try:
+            report = compare_frames(pd.read_csv(os.path.join(golden_path(name), relative)),
+                                    pd.read_csv(path), atol, rtol, keys)
+        except (ValueError, pd.errors.ParserError) as e:
+            outcome['errors'][relative] = str(e)
+            continue
+        if _drifted(report):
+            outcome['drifted'][relative] = report
+        else:
+            outcome['within_tolerance'].append(relative)
+    return outcome
+
+
+def print_report(outcome, golden, atol, rtol):
+    """Print the drift report; return True if the results match"""
+    print(f"GOLDEN OUTPUT CHECK: {golden['name']} (created {golden['created']}"
+          f"{', commit ' + golden['commit'] if golden.get('commit') else ''}; "
+          f"atol={atol:g}, rtol={rtol:g})")
+    print(f"  ✓ {len(outcome['identical'])} identical, "
+          f"{len(outcome['within_tolerance'])} within tolerance")
+    bad = len(outcome['drifted']) + len(outcome['missing']) + len(outcome['errors'])
+    if bad:
+        print(f"  ✗ {len(outcome['drifted'])} drifted, {len(outcome['missing'])} missing, "
+              f"{len(outcome['errors'])} unreadable")
+    if outcome['new']:
+        print(f"  + {len(outcome['new'])} not in the golden set (ignored)")
+
+    for relative, report in outcome['drifted'].items():
+        aligned = f"aligned on {', '.join(report['keys'])}" if report['keys'] else 'aligned by row'
+        print(f"\n✗ {relative} ({aligned})")
+        if report['rows_added'] or report['rows_removed']:
+            print(f"    rows: +{report['rows_added']} / -{report['rows_removed']}")
+        if report['columns_added'] or report['columns_removed']:
+            print(f"    columns: " + ', '.join([f"+{c}" for c in report['columns_added']]
+                                                + [f"-{c}" for c in report['columns_removed']]))
+        for entry in report['columns'][:EXAMPLES_SHOWN]:
+            size = ''
+            if entry['max_abs'] == float('inf'):
+                size = ', NaN on one side'
+            elif entry['max_abs'] is not None:
+                size = f", max |Δ| {entry['max_abs']:.3g} (rel {entry['max_rel']:.3g})"
+            print(f"    {entry['column']}: {entry['rows']}/{entry['of']} rows{size}")
+            print(f"        e.g. {entry['where']}")
+        if len(report['columns']) > EXAMPLES_SHOWN:
+            more = report['columns'][EXAMPLES_SHOWN:]
+            print(f"    ... and {len(more)} more column(s): {', '.join(e['column'] for e in more)}")
+    for relative in outcome['missing']:
+        print(f"\n✗ {relative} is missing")
+    for relative, message in outcome['errors'].items():
+        print(f"\n✗ {relative} could not be compared: {message}")
+
+    print(f"\n{'✓ Results match the golden set' if not bad else '✗ Results drifted from the golden set'}")
+    return not bad
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden-output numeric regression check')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('snapshot', help='Save the current CSVs as a golden set')
+    p.add_argument('paths', nargs='*', default=[RESULTS_DIR])
+    p.add_argument('--name', default=DEFAULT_NAME)
+    p = sub.add_parser('compare', help='Compare the current CSVs with a golden set')
+    p.add_argument('paths', nargs='*', default=[RESULTS_DIR])
+    p.add_argument('--name', default=DEFAULT_NAME)
+    p.add_argument('--atol', type=float, default=DEFAULT_ATOL,
+                   help=f'Absolute tolerance (default {DEFAULT_ATOL:g})')
+    p.add_argument('--rtol', type=float, default=DEFAULT_RTOL,
+                   help=f'Relative tolerance (default {DEFAULT_RTOL:g})')
+    p.add_argument('--keys', default=','.join(KEY_COLUMNS),
+                   help='Candidate key columns for row alignment, comma-separated')
+    p.add_argument('--json', metavar='FILE', help='Also write the full comparison as JSON')
+    sub.add_parser('list', help='List golden sets')
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        index = snapshot(args.name, args.paths)
+        print(f"✓ Golden set {args.name}: {len(index['files'])} CSVs "
+              f"-> {os.path.relpath(golden_path(args.name), REPO_ROOT)}/")
+
+    elif args.command == 'list':
+        directory = os.path.join(REPO_ROOT, GOLDEN_DIR)
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+        for name in names:
+            golden = load_golden(name)
+            print(f"{name:<20} {len(golden['files']):>4} CSVs  {golden['created']}  "
+                  f"{golden.get('commit') or ''}")
+
+    else:
+        try:
+            golden = load_golden(args.name)
+        except FileNotFoundError as e:
+            print(f"✗ {e}")
+            sys.exit(2)
+        keys = [k.strip() for k in args.keys.split(',') if k.strip()]
+        outcome = compare(args.name, args.paths, args.atol, args.rtol, keys)
+        ok = print_report(outcome, golden, args.atol, args.rtol)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(outcome, f, indent=1, default=str)
+        sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Import-Time Budgets
+Measures how long each analysis spends importing modules before it starts
+
+For every selected script the top-level import statements are run in a
+fresh interpreter under `python -X importtime`, and the self times it
+reports are summed (minus a bare interpreter's own startup imports). The
+result is compared with the budget recorded for the script in
+import_budgets.json, so a new eager import of a heavy package shows up as
+a regression. Modules that should only load on some code paths belong
+behind utils.lazy_import().
+
+Usage:
+    python scripts/measure_import_time.py                 # all scripts
+    python scripts/measure_import_time.py 00 08 27 --top 5
+    python scripts/measure_import_time.py --check         # exit 1 if over budget
+    python scripts/measure_import_time.py --update        # rewrite the budgets
+"""
+
+import os
+import sys
+import ast
+import json
+import subprocess
+import argparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+BUDGETS_PATH = os.path.join(SCRIPTS_DIR, 'import_budgets.json')
+
+sys.path.append(SCRIPTS_DIR)
+from run_all_analyses import iter_pipeline, resolve_scripts
+
+# Budget = measured time * BUDGET_FACTOR, but at least BUDGET_SLACK_MS above
+# it, so machine noise does not trip the check
+BUDGET_FACTOR = 1.5
+BUDGET_SLACK_MS = 100
+
+
+def import_statements(script):
+    """
+    Source of a script's top-level import statements
+
+    Parameters:
+    -----------
+    script : str
+        File name in scripts/
+
+    Returns:
+    --------
+    list of str
+    """
+    path = os.path.join(SCRIPTS_DIR, script)
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return [ast.get_source_segment(source, node) for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def _program(statements):
+    """Python source that runs each import, noting the ones that fail"""
+    lines = [
+        'import sys',
+        f'sys.path[:0] = [{SCRIPTS_DIR!r}, {REPO_ROOT!r}]',
+        'missing = []',
+    ]
+    for statement in statements:
+        lines += ['try:',
+                  '    ' + statement.replace('\n', '\n    '),
+                  'except ImportError as e:',
+                  '    missing.append(getattr(e, "name", None) or str(e))']
+    lines.append('print("\\n".join(m for m in missing if m))')
+    return '\n'.join(lines)
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output
+
+    Returns:
+    --------
+    list of tuple (str, int, int, int)
+        Module, self time (us), cumulative time (us) and nesting depth
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def _run(statements):
+    env = dict(os.environ, MPLBACKEND='Agg')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _program(statements)],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    missing = [m for m in result.stdout.splitlines() if m]
+    return parse_importtime(result.stderr), missing
+
+
+def baseline():
+    """
+    Imports of a bare interpreter (site, encodings, ...)
+
+    Returns:
+    --------
+    tuple of (float, set of str)
+        Milliseconds spent and the modules imported
+    """
+    entries, _ = _run([])
+    return sum(e[1] for e in entries) / 1000, {e[0] for e in entries}
+
+
+def measure(script, startup=(0.0, ()), repeat=1):
+    """
+    Measure the import time of one script
+
+    Parameters:
+    -----------
+    script : str
+        File name in scripts/
+    startup : tuple of (float, set of str)
+        Interpreter startup to leave out (see baseline)
+    repeat : int
+        Runs to take the fastest of
+
+    Returns:
+    --------
+    dict
+        {'ms': total, 'modules': [(top-level module, cumulative ms)],
+         'missing': modules that could not be imported}
+    """
+    statements = import_statements(script)
+    best = None
+    for _ in range(repeat):
+        entries, missing = _run(statements)
+        total = sum(e[1] for e in entries) / 1000 - startup[0]
+        if best is None or total < best['ms']:
+            best = {'ms': max(total, 0.0), 'entries': entries, 'missing': missing}
+
+    top_level = {}
+    for name, _, cumulative, depth in best['entries']:
+        if depth == 0 and name not in startup[1]:
+            root = name.split('.')[0]
+            top_level[root] = top_level.get(root, 0) + cumulative / 1000
+    modules = sorted(top_level.items(), key=lambda item: -item[1])
+    return {'ms': best['ms'], 'modules': modules, 'missing': best['missing']}
+
+
+def load_budgets():
+    if not os.path.exists(BUDGETS_PATH):
+        return {}
+    with open(BUDGETS_PATH) as f:
+        return json.load(f)
+
+
+def budget_for(ms):
+    """Budget to record for a measured import time"""
+    return round(max(ms * BUDGET_FACTOR, ms + BUDGET_SLACK_MS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure per-script import time against budgets')
+    parser.add_argument('scripts', nargs='*', default=['all'],
+                        help='Scripts to measure (ids, numbers or ranges; default all)')
+    parser.add_argument('--top', type=int, default=3,
+                        help='Heaviest top-level modules to list per script')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per script; the fastest is kept')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with status 1 if any script is over budget')
+    parser.add_argument('--update', action='store_true',
+                        help='Record new budgets for the measured scripts')
+    args = parser.parse_args()
+
+    analyses = [analysis for _, analysis in iter_pipeline()]
+    try:
+        scripts = resolve_scripts(args.scripts, analyses)
+    except ValueError as e:
+        parser.error(str(e))
+
+    budgets = load_budgets()
+    startup = baseline()
+    print(f"Interpreter startup: {startup[0]:.0f} ms (subtracted)\n")
+    print(f"{'Script':<45} {'Import':>8} {'Budget':>8}  Heaviest modules")
+
+    over = []
+    for script in sorted(scripts):
+        result = measure(script, startup, args.repeat)
+        budget = budgets.get(script)
+        status = ''
+        if budget is not None and result['ms'] > budget:
+            status = ' ✗ over budget'
+            over.append(script)
+        heaviest = ', '.join(f"{name} {ms:.0f}" for name, ms in result['modules'][:args.top])
+        budget_text = f"{budget:>6}ms" if budget is not None else '       -'
+        print(f"{script:<45} {result['ms']:>6.0f}ms {budget_text}  {heaviest}{status}")
+        if result['missing']:
+            # The measurement is too low without them; keep the old budget
+            print(f"{'':<45} not installed: {', '.join(result['missing'])}"
+                  f"{' (budget not updated)' if args.update else ''}")
+        elif args.update:
+            budgets[script] = budget_for(result['ms'])
+
+    if args.update:
+        with open(BUDGETS_PATH, 'w') as f:
+            json.dump(dict(sorted(budgets.items())), f, indent=2)
+            f.write('\n')
+        print(f"\n✓ Budgets written to {os.path.relpath(BUDGETS_PATH, REPO_ROOT)}")
+
+    if over:
+        print(f"\n✗ {len(over)} script(s) over their import-time budget: {', '.join(over)}")
+        if args.check:
+            sys.exit(1)
+    elif budgets:
+        print("\n✓ All measured scripts are within budget")
+
+
+if __name__ == "__main__":
+    main()
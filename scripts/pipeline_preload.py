@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Forkserver Preload
+Imported once by the forkserver started for `run_all_analyses.py --forkserver`
+
+Importing this module imports the scientific stack and loads the overdose
+extracts named in EPI_PRELOAD_EXTRACTS (plus the full_data_processing
+frame), so every analysis forked from the server inherits them.
+"""
+
+import os
+import time
+
+_start = time.perf_counter()
+import pipeline_worker
+_imported = time.perf_counter() - _start
+
+pipeline_worker.prepare(
+    extracts=[path for path in
+              os.environ.get(pipeline_worker.PRELOAD_EXTRACTS_ENV, '').split(os.pathsep)
+              if path],
+    modules=pipeline_worker.PRELOAD_MODULES,
+    processed=True
+)
+# Count utils/pandas, imported with pipeline_worker above
+pipeline_worker.PREPARE_TIMINGS['imports'] += _imported
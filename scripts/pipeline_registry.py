@@ -0,0 +1,557 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Pipeline Registry
+Declares every script run by run_all_analyses.py
+
+Each entry has:
+    name         Short label used in progress output
+    script       File name in scripts/
+    description  One-line summary
+    tags         Topics for selection with --tag (see TAGS)
+    inputs       Files the script reads
+    outputs      Files it writes; a trailing '/' means the whole folder
+    required     (optional) False for steps whose failure should not stop
+                 the pipeline; defaults to True
+    always       (optional) True for steps that check their own freshness
+                 (e.g. a cache refresh) and so run on every invocation;
+                 scripts reading their outputs still rebuild only if the
+                 outputs changed
+
+Paths are relative to the repo root unless absolute. The runner derives
+the dependency graph by matching one script's outputs against another's
+inputs, so keep these in sync with the scripts' read_csv/to_csv calls.
+"""
+
+import os
+
+# Overdose extract: 00_data_quality and 01-11 read the shared copy,
+# everything else reads the repo-relative one
+OVERDOSE_CSV = 'data/2012-01-2024-08-overdoses.csv'
+OVERDOSE_CSV_SHARED = '/data2/fabricehc/epi/data/2012-01-2024-08-overdoses.csv'
+
+# Census tables written by fetch_census_data.py
+CENSUS_POPULATION = 'data/la_county_population_census.csv'
+CENSUS_POVERTY = 'data/la_county_poverty_by_race.csv'
+CENSUS_INCOME = 'data/la_county_income_by_race.csv'
+CENSUS_AGE = 'data/la_county_age_by_race.csv'
+
+# Derived tables written by 17_real_income_cost_of_living.py
+REAL_INCOME = 'data/la_county_income_real_nominal.csv'
+HOUSING_COSTS = 'data/la_county_housing_costs.csv'
+
+# Hand-cleaned copy of data/zip_rent_panel.csv (not produced by any script)
+ZIP_RENT_PANEL = 'data/zip_rent_panel_clean.csv'
+
+# FRED series cached by fred_cache.py (in EPI_FRED_DIR if set), by series
+# ID; the 'fred' step refreshes stale ones before the analyses are
+# fingerprinted, and a refreshed series reruns the analyses that read it
+FRED_DIR = (os.environ.get('EPI_FRED_DIR') or 'data/fred').rstrip('/')
+FRED = {series_id: f'{FRED_DIR}/{series_id}/latest.csv' for series_id in (
+    'UNRATE', 'CAUR', 'LES1252881600Q', 'CIVPART', 'MORTGAGE30US',
+    'CSUSHPISA', 'SIPOVGINIUSA', 'MANEMP', 'USCONS', 'CES7000000001')}
+
+# The 51/51b/51c/51d chain shares one results folder
+PANEL_DIR = 'results/51_rent_spatial_panel_analysis'
+
+# Tags in use, for --tag and --list
+TAGS = {
+    'fetch': 'Downloads data from external APIs',
+    'census': 'Uses Census population/SES tables',
+    'fred': 'Pulls economic series from FRED',
+    'spatial': 'ZIP-level or geographic analysis',
+    'panel': 'ZIP x year rent panel chain (51-51d)',
+    'housing': 'Housing costs or homelessness',
+    'substance': 'Substance-specific patterns',
+    'demographic': 'Age/race/gender structure',
+    'temporal': 'Seasonal or temporal correlation',
+    'covid': 'COVID-19 period effects',
+    'descriptive': 'Descriptive tables and data quality',
+}
+
+# Define analysis pipeline
+PIPELINE = {
+    'census': {
+        'name': 'Census Data Fetching',
+        'script': 'fetch_census_data.py',
+        'required': True,
+        'description': 'Fetch population and SES data from Census API',
+        'tags': ['fetch', 'census'],
+        'inputs': [],
+        'outputs': [CENSUS_POPULATION, CENSUS_POVERTY, CENSUS_INCOME, CENSUS_AGE,
+                    'data/la_county_population_dict.py']
+    },
+    'descriptive': {
+        'name': 'Descriptive Statistics',
+        'script': '00_descriptive_table_and_plots.py',
+        'required': False,
+        'description': 'Create Table 1 and raincloud plots',
+        'tags': ['descriptive'],
+        'inputs': [OVERDOSE_CSV],
+        'outputs': ['results/00_descriptive_statistics/', 'results/Table_1.csv']
+    },
+    'data_quality': {
+        'name': 'Data Quality Report',
+        'script': '00_data_quality_report.py',
+        'required': False,
+        'description': 'Sample derivation and data completeness',
+        'tags': ['descriptive'],
+        'inputs': [OVERDOSE_CSV_SHARED],
+        'outputs': ['results/data_quality/']
+    },
+    'basic_analyses': [
+        {
+            'name': 'Fentanyl Timeline',
+            'script': '01_fentanyl_crisis_timeline.py',
+            'description': 'Fentanyl emergence and co-occurrence patterns',
+            'tags': ['substance'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/01_fentanyl_timeline/']
+        },
+        {
+            'name': 'Polysubstance Trends',
+            'script': '02_polysubstance_trends.py',
+            'description': 'Polysubstance involvement and combinations',
+            'tags': ['substance'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/02_polysubstance_trends/']
+        },
+        {
+            'name': 'Demographics',
+            'script': '03_demographic_shifts.py',
+            'description': 'Age, race, and gender trends',
+            'tags': ['demographic'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/03_demographic_shifts/']
+        },
+        {
+            'name': 'Homelessness',
+            'script': '04_homelessness_analysis.py',
+            'description': 'Housing status and substance patterns',
+            'tags': ['housing'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/04_homelessness_analysis/']
+        },
+        {
+            'name': 'Geographic Analysis',
+            'script': '05_geographic_analysis.py',
+            'description': 'ZIP code and spatial analysis',
+            'tags': ['spatial'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/05_geographic_analysis/']
+        },
+        {
+            'name': 'Seasonal Patterns',
+            'script': '06_seasonal_patterns.py',
+            'description': 'Monthly and day-of-week patterns',
+            'tags': ['temporal'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/06_seasonal_patterns/']
+        },
+        {
+            'name': 'COVID Impact',
+            'script': '07_covid_impact.py',
+            'description': 'Pre/during/post COVID comparisons',
+            'tags': ['covid'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/07_covid_impact/']
+        },
+        {
+            'name': 'Geospatial Statistics',
+            'script': '08_geospatial_statistical_analysis.py',
+            'description': 'Center of gravity and clustering',
+            'tags': ['spatial'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/08_geospatial_statistics/']
+        }
+    ],
+    'advanced_analyses': [
+        {
+            'name': 'Race-Stratified Trends',
+            'script': '09_race_substance_trends.py',
+            'description': 'Substance trends by race/ethnicity',
+            'tags': ['substance', 'demographic'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/09_race_substance_trends/']
+        },
+        {
+            'name': 'Age-Race Analysis',
+            'script': '10_age_race_figure.py',
+            'description': 'Age patterns by race (addresses reviewer concern)',
+            'tags': ['demographic'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/10_age_race_figure/']
+        },
+        {
+            'name': 'Population-Adjusted Rates',
+            'script': '11_population_adjusted_rates.py',
+            'description': 'Overdose rates per 100k with disparity ratios',
+            'tags': ['demographic'],
+            'inputs': [OVERDOSE_CSV_SHARED],
+            'outputs': ['results/11_population_adjusted_rates/']
+        },
+        {
+            'name': 'SES Context Figure',
+            'script': '12_ses_context_figure.py',
+            'description': 'Poverty, income, and age context',
+            'tags': ['census'],
+            'inputs': ['results/12_ses_context_figure/race_rates_annual.csv',
+                       CENSUS_POVERTY, CENSUS_INCOME, CENSUS_AGE],
+            'outputs': ['results/12_ses_context_figure/ses_context_figure.png',
+                        'results/12_ses_context_figure/ses_comparison_2023.csv']
+        },
+        {
+            'name': 'Temporal Correlations',
+            'script': '13_temporal_correlation_analysis.py',
+            'description': 'SES changes vs overdose rate changes',
+            'tags': ['census', 'temporal'],
+            'inputs': ['results/13_temporal_correlation/race_rates_annual.csv',
+                       CENSUS_POVERTY, CENSUS_INCOME, CENSUS_AGE],
+            'outputs': ['results/13_temporal_correlation/temporal_correlation_scatterplots.png',
+                        'results/13_temporal_correlation/temporal_correlations.csv']
+        },
+        {
+            'name': 'YPLL Analysis',
+            'script': '14_years_potential_life_lost.py',
+            'description': 'Years of potential life lost by race',
+            'tags': ['census', 'demographic'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/14_ypll_analysis/']
+        },
+        {
+            'name': 'Disparity Decomposition',
+            'script': '15_disparity_decomposition.py',
+            'description': 'SES-explained vs structural factors',
+            'tags': ['census'],
+            'inputs': ['results/15_disparity_decomposition/race_rates_annual.csv',
+                       CENSUS_POVERTY, CENSUS_INCOME, CENSUS_AGE],
+            'outputs': ['results/15_disparity_decomposition/disparity_decomposition.png',
+                        'results/15_disparity_decomposition/disparity_decomposition_annual.csv']
+        },
+        {
+            'name': 'Comprehensive Figure',
+            'script': '16_comprehensive_publication_figure.py',
+            'description': 'Combined publication figure',
+            'tags': ['census'],
+            'inputs': ['results/16_comprehensive_publication/race_rates_annual.csv',
+                       'results/16_comprehensive_publication/ypll_by_race_year.csv',
+                       'results/16_comprehensive_publication/disparity_decomposition_annual.csv',
+                       CENSUS_POVERTY, CENSUS_INCOME],
+            'outputs': ['results/16_comprehensive_publication/COMPREHENSIVE_PUBLICATION_FIGURE.png']
+        },
+        {
+            'name': 'Real Income Analysis',
+            'script': '17_real_income_cost_of_living.py',
+            'description': 'Inflation-adjusted income and housing costs',
+            'tags': ['census', 'housing'],
+            'inputs': ['results/17_real_income_analysis/race_rates_annual.csv',
+                       CENSUS_INCOME],
+            'outputs': ['results/17_real_income_analysis/real_income_cost_of_living.png',
+                        'results/17_real_income_analysis/income_housing_burden.csv',
+                        REAL_INCOME, HOUSING_COSTS]
+        }
+    ],
+    'ses_analyses': [
+        {
+            'name': 'Age-Standardized Rates',
+            'script': '18_age_standardized_rates.py',
+            'description': 'Direct age standardization by race/ethnicity',
+            'tags': ['census', 'demographic'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/18_age_standardized_rates/']
+        },
+        {
+            'name': 'Substance-Specific SES',
+            'script': '19_substance_specific_ses_patterns.py',
+            'description': 'SES-overdose relationship by substance',
+            'tags': ['census', 'substance'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION, CENSUS_INCOME, CENSUS_POVERTY],
+            'outputs': ['results/19_substance_specific_ses/']
+        },
+        {
+            'name': 'Housing-Homelessness Pipeline',
+            'script': '20_housing_homelessness_pipeline.py',
+            'description': 'Housing burden, homelessness and overdose',
+            'tags': ['housing'],
+            'inputs': [OVERDOSE_CSV,
+                       HOUSING_COSTS,
+                       'results/20_housing_homelessness/income_housing_burden.csv'],
+            'outputs': ['results/20_housing_homelessness/']
+        },
+        {
+            'name': 'Geographic SES Inequality',
+            'script': '21_geographic_ses_inequality.py',
+            'description': 'ZIP-level overdose burden vs ACS poverty/income',
+            'tags': ['spatial', 'census'],
+            'inputs': [OVERDOSE_CSV],
+            'outputs': ['results/21_geographic_ses_inequality/']
+        },
+        {
+            'name': 'Counterfactual SES Matching',
+            'script': '22_counterfactual_ses_matching.py',
+            'description': 'Do aggregate SES measures explain disparities?',
+            'tags': ['census'],
+            'inputs': ['results/11_population_adjusted_rates/race_rates_annual.csv',
+                       CENSUS_POVERTY,
+                       CENSUS_INCOME,
+                       CENSUS_AGE],
+            'outputs': ['results/22_counterfactual_ses_matching/']
+        },
+        {
+            'name': 'COVID Economic Shock',
+            'script': '23_covid_economic_shock.py',
+            'description': 'COVID-19 economic disruption by race and SES',
+            'tags': ['census', 'covid'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION, CENSUS_INCOME, CENSUS_POVERTY],
+            'outputs': ['results/23_covid_economic_shock/']
+        },
+        {
+            'name': 'Cumulative Disadvantage',
+            'script': '24_cumulative_disadvantage.py',
+            'description': 'Composite SES disadvantage score',
+            'tags': ['census', 'housing'],
+            'inputs': [OVERDOSE_CSV,
+                       CENSUS_POPULATION,
+                       CENSUS_INCOME,
+                       CENSUS_POVERTY,
+                       HOUSING_COSTS],
+            'outputs': ['results/24_cumulative_disadvantage/']
+        },
+        {
+            'name': 'Housing Costs',
+            'script': '25_housing_costs_analysis.py',
+            'description': 'Rent and home values vs overdose mortality',
+            'tags': ['census', 'housing'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION, CENSUS_INCOME, HOUSING_COSTS],
+            'outputs': ['results/25_housing_costs/']
+        },
+        {
+            'name': 'Income Volatility',
+            'script': '26_income_volatility.py',
+            'description': 'Year-to-year income instability',
+            'tags': ['census'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION, REAL_INCOME],
+            'outputs': ['results/26_income_volatility/']
+        },
+        {
+            'name': 'Poverty-Age Interaction',
+            'script': '27_poverty_age_interaction.py',
+            'description': 'Poverty effect on overdose risk by age',
+            'tags': ['census', 'demographic'],
+            'inputs': [OVERDOSE_CSV,
+                       CENSUS_POPULATION,
+                       CENSUS_INCOME,
+                       CENSUS_POVERTY,
+                       CENSUS_AGE],
+            'outputs': ['results/27_poverty_age_interaction/']
+        }
+    ],
+    'fred': {
+        'name': 'FRED Series Refresh',
+        'script': 'fred_cache.py',
+        'required': False,
+        'always': True,
+        'description': 'Download missing or stale FRED series into the cache',
+        'tags': ['fetch', 'fred'],
+        'inputs': [],
+        'outputs': list(FRED.values())
+    },
+    'fred_analyses': [
+        {
+            'name': 'Unemployment Correlation',
+            'script': '28_unemployment_overdose_correlation.py',
+            'description': 'Unemployment rates vs overdose deaths by race',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV, FRED['UNRATE'], FRED['CAUR']],
+            'outputs': ['results/28_unemployment_overdose_correlation/']
+        },
+        {
+            'name': 'Recession Impact',
+            'script': '29_economic_recession_impact.py',
+            'description': 'Overdoses across economic periods',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV],
+            'outputs': ['results/29_economic_recession_impact/']
+        },
+        {
+            'name': 'Real Wages',
+            'script': '30_real_wages_deaths_despair.py',
+            'description': 'Real earnings vs deaths of despair',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV, FRED['LES1252881600Q']],
+            'outputs': ['results/30_real_wages_deaths_despair/']
+        },
+        {
+            'name': 'Labor Force Participation',
+            'script': '31_labor_force_participation.py',
+            'description': 'Labor force participation vs overdoses',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV, FRED['CIVPART']],
+            'outputs': ['results/31_labor_force_participation/']
+        },
+        {
+            'name': 'Housing Market Stress',
+            'script': '32_housing_market_stress.py',
+            'description': 'Mortgage rates and home prices vs overdoses',
+            'tags': ['fred', 'housing'],
+            'inputs': [OVERDOSE_CSV, FRED['MORTGAGE30US'], FRED['CSUSHPISA']],
+            'outputs': ['results/32_housing_market_stress/']
+        },
+        {
+            'name': 'Income Inequality',
+            'script': '33_income_inequality_disparities.py',
+            'description': 'Gini index vs racial disparity trends',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV,
+                       'results/11_population_adjusted_rates/race_rates_annual.csv',
+                       FRED['SIPOVGINIUSA']],
+            'outputs': ['results/33_income_inequality_disparities/']
+        },
+        {
+            'name': 'Economic Precarity Index',
+            'script': '34_economic_precarity_index.py',
+            'description': 'Composite unemployment/participation index',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV, FRED['UNRATE'], FRED['CIVPART']],
+            'outputs': ['results/34_economic_precarity_index/']
+        },
+        {
+            'name': 'Industry Employment',
+            'script': '35_industry_employment_shifts.py',
+            'description': 'Industry employment shifts vs overdoses',
+            'tags': ['fred'],
+            'inputs': [OVERDOSE_CSV,
+                       FRED['MANEMP'], FRED['USCONS'], FRED['CES7000000001']],
+            'outputs': ['results/35_industry_employment_shifts/']
+        },
+        {
+            'name': 'Labor Force Non-Participation',
+            'script': '42_labor_force_nonparticipation.py',
+            'description': 'Discouraged workers and overdoses',
+            'tags': ['fred', 'census'],
+            'inputs': [OVERDOSE_CSV,
+                       CENSUS_POPULATION,
+                       'results/31_labor_force_participation/lfpr_deaths_annual.csv',
+                       FRED['CIVPART'], FRED['UNRATE']],
+            'outputs': ['results/42_labor_force_nonparticipation/']
+        }
+    ],
+    'extended_analyses': [
+        {
+            'name': 'Age-Risk Profiles',
+            'script': '37_age_risk_profile_curves.py',
+            'description': 'Age-specific risk curves by race',
+            'tags': ['census', 'demographic'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/37_age_risk_profile_curves/']
+        },
+        {
+            'name': 'Cocaine-Fentanyl Cohort',
+            'script': '43_cocaine_fentanyl_cohort.py',
+            'description': 'Cocaine + fentanyl "collision of epidemics"',
+            'tags': ['substance'],
+            'inputs': [OVERDOSE_CSV],
+            'outputs': ['results/43_cocaine_fentanyl_cohort/']
+        },
+        {
+            'name': 'COVID Acceleration by Race',
+            'script': '45_covid_acceleration_by_race.py',
+            'description': '2019-2020 acceleration and excess deaths',
+            'tags': ['census', 'covid'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/45_covid_acceleration_by_race/']
+        },
+        {
+            'name': 'LA vs Other Metros',
+            'script': '48_la_vs_other_metros.py',
+            'description': 'LA County alongside other US metros',
+            'tags': ['census'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/48_la_vs_other_metros/']
+        },
+        {
+            'name': 'Supply vs Demand',
+            'script': '49_supply_vs_demand_framework.py',
+            'description': 'Supply-side vs demand-side model comparison',
+            'tags': ['census', 'substance'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POVERTY, CENSUS_INCOME, CENSUS_POPULATION],
+            'outputs': ['results/49_supply_vs_demand_framework/']
+        },
+        {
+            'name': 'Temporal Paradox',
+            'script': '50_temporal_paradox_mechanisms.py',
+            'description': 'Within-group poverty-overdose paradox',
+            'tags': ['census'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POVERTY, CENSUS_INCOME, CENSUS_POPULATION],
+            'outputs': ['results/50_temporal_paradox_mechanisms/']
+        },
+        {
+            'name': 'Heroin-Fentanyl Transition',
+            'script': '52_heroin_fentanyl_transition.py',
+            'description': 'Heroin-to-fentanyl transition by race',
+            'tags': ['substance'],
+            'inputs': [OVERDOSE_CSV],
+            'outputs': ['results/52_heroin_fentanyl_transition/']
+        },
+        {
+            'name': 'Polysubstance Complexity',
+            'script': '53_polysubstance_complexity.py',
+            'description': 'Substances per death as adulteration proxy',
+            'tags': ['census', 'substance'],
+            'inputs': [OVERDOSE_CSV, CENSUS_POPULATION],
+            'outputs': ['results/53_polysubstance_complexity/']
+        }
+    ],
+    'panel_analyses': [
+        {
+            'name': 'ZIP Rent Fetching',
+            'script': 'fetch_zip_rent_data.py',
+            'description': 'Download ZIP-level rent (Zillow, ACS, HUD)',
+            'tags': ['fetch', 'panel', 'spatial'],
+            'inputs': [OVERDOSE_CSV],
+            'outputs': ['data/zip_rent/', 'data/hud_fmr/', 'data/zip_rent_panel.csv']
+        },
+        {
+            'name': 'Rent Spatial Panel',
+            'script': '51_rent_spatial_panel_analysis.py',
+            'description': 'County rent-overdose trend vs ZIP panel',
+            'tags': ['panel', 'spatial', 'housing', 'census'],
+            'inputs': [OVERDOSE_CSV, HOUSING_COSTS, CENSUS_POPULATION],
+            'outputs': [f'{PANEL_DIR}/rent_spatial_panel_analysis.png',
+                        f'{PANEL_DIR}/correlation_results.csv',
+                        f'{PANEL_DIR}/zip_year_panel.csv',
+                        f'{PANEL_DIR}/annual_data_with_detrended.csv',
+                        f'{PANEL_DIR}/README.md']
+        },
+        {
+            'name': 'ZIP Panel Regression',
+            'script': '51b_zip_panel_regression.py',
+            'description': 'Within-ZIP fixed-effects regression',
+            'tags': ['panel', 'spatial', 'census'],
+            'inputs': [OVERDOSE_CSV, ZIP_RENT_PANEL, CENSUS_POPULATION],
+            'outputs': [f'{PANEL_DIR}/zip_panel_regression.png',
+                        f'{PANEL_DIR}/panel_regression_results.csv',
+                        f'{PANEL_DIR}/zip_year_panel_with_rent.csv']
+        },
+        {
+            'name': 'Lead-Lag Analysis',
+            'script': '51c_lead_lag_analysis.py',
+            'description': 'Does rent precede overdose changes?',
+            'tags': ['panel', 'spatial'],
+            'inputs': [f'{PANEL_DIR}/zip_year_panel_with_rent.csv'],
+            'outputs': [f'{PANEL_DIR}/lead_lag_analysis.png',
+                        f'{PANEL_DIR}/lead_lag_results.csv',
+                        f'{PANEL_DIR}/optimal_lag_analysis.csv']
+        },
+        {
+            'name': 'Monthly Lead-Lag',
+            'script': '51d_monthly_lead_lag.py',
+            'description': 'Lead-lag at monthly resolution',
+            'tags': ['panel', 'spatial', 'census'],
+            'inputs': [OVERDOSE_CSV, ZIP_RENT_PANEL, CENSUS_POPULATION],
+            'outputs': [f'{PANEL_DIR}/monthly_lead_lag_analysis.png',
+                        f'{PANEL_DIR}/monthly_lag_results.csv']
+        }
+    ]
+}
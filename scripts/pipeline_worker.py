@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Pipeline Worker
+Runs analysis scripts inside an interpreter that has already loaded the data
+
+Two modes are used by run_all_analyses.py:
+    --in-process  The runner calls prepare() itself, loading the overdose
+                  extract with utils frame sharing turned on, then forks one
+                  child per analysis.
+    --forkserver  A multiprocessing forkserver imports pipeline_preload,
+                  which runs prepare() with the scientific stack
+                  (PRELOAD_MODULES) and the full_data_processing frame.
+                  Each analysis is forked from that server, so the runner
+                  itself stays light and forks happen from a clean,
+                  single-threaded process.
+
+Either way children inherit the imported modules and loaded frames
+copy-on-write, so they skip interpreter startup, imports and the
+CSV/Parquet read. prepare() also turns on pandas copy-on-write, so the
+frame each child gets is a shallow copy and only the pages it modifies
+are duplicated.
+
+A script is run through the first entry point it defines:
+    run(context)  called with an AnalysisContext
+    main()        scripts that guard main() with `if __name__ == "__main__"`
+    module body   scripts written top to bottom run as they are executed
+
+Usage (runs the given scripts one after another in this process; a failed
+script is reported and the rest still run):
+    python scripts/pipeline_worker.py 05 07 11
+"""
+
+import os
+import sys
+import time
+import runpy
+import traceback
+import multiprocessing
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import utils
+import profiling
+from pipeline_registry import OVERDOSE_CSV, OVERDOSE_CSV_SHARED
+
+# Overdose extracts the registry knows about, preloaded when selected
+OVERDOSE_EXTRACTS = [OVERDOSE_CSV, OVERDOSE_CSV_SHARED]
+
+# Modules the analyses import, preloaded by the forkserver (missing ones
+# are skipped)
+PRELOAD_MODULES = [
+    'numpy', 'pandas', 'pyarrow.parquet',
+    'matplotlib', 'matplotlib.pyplot', 'matplotlib.patches', 'seaborn',
+    'scipy.stats', 'sklearn.linear_model', 'sklearn.preprocessing',
+    'sklearn.metrics', 'sklearn.neighbors',
+    'statsmodels.api', 'statsmodels.formula.api',
+    'plotnine', 'ptitprince', 'tableone', 'requests',
+]
+
+# Environment handed to the forkserver's pipeline_preload import
+PRELOAD_EXTRACTS_ENV = 'EPI_PRELOAD_EXTRACTS'
+
+# Seconds spent in prepare() by this process ({'imports', 'data'})
+PREPARE_TIMINGS = {'imports': 0.0, 'data': 0.0}
+
+
+class AnalysisContext:
+    """
+    What the runner hands to an analysis's run(context)
+
+    Attributes:
+    -----------
+    script : str
+        File name of the analysis being run
+    repo_root : str
+        Repository root (also the working directory)
+    """
+
+    def __init__(self, script, repo_root=REPO_ROOT):
+        self.script = script
+        self.repo_root = repo_root
+
+    def load_overdose_data(self, *args, **kwargs):
+        """utils.load_overdose_data, served from the shared frames"""
+        return utils.load_overdose_data(*args, **kwargs)
+
+    def full_data_processing(self, *args, **kwargs):
+        """utils.full_data_processing, served from the shared frames"""
+        return utils.full_data_processing(*args, **kwargs)
+
+
+def selected_extracts(analyses=None):
+    """Overdose extracts read by the selected analyses that exist on disk"""
+    wanted = OVERDOSE_EXTRACTS
+    if analyses is not None:
+        wanted = [path for path in OVERDOSE_EXTRACTS
+                  if any(path in a.get('inputs', []) for a in analyses)]
+    return [path for path in wanted
+            if os.path.exists(os.path.join(REPO_ROOT, path))]
+
+
+def preload_modules(modules=PRELOAD_MODULES):
+    """
+    Import modules so forked children inherit them
+
+    Parameters:
+    -----------
+    modules : list of str
+        Module names; any that are not installed are skipped
+
+    Returns:
+    --------
+    list of str
+        Modules that were imported
+    """
+    imported = []
+    for name in modules:
+        try:
+            __import__(name)
+            imported.append(name)
+        except ImportError:
+            pass
+    return imported
+
+
+def prepare(analyses=None, extracts=None, modules=(), processed=False):
+    """
+    Set up this process so analyses can run in it (or in forks of it)
+
+    Switches to the repo root, turns on utils frame sharing and pandas
+    copy-on-write, aliases `scripts.utils` to `utils` (scripts 28-35 import
+    it by that name) and loads each overdose extract the selected analyses
+    read.
+
+    Parameters:
+    -----------
+    analyses : list of dict, optional
+        Selected pipeline entries, used to pick the extracts to load
+    extracts : list of str, optional
+        Extracts to load instead of deriving them from analyses
+    modules : list of str
+        Modules to import up front (see PRELOAD_MODULES)
+    processed : bool
+        Also build the full_data_processing frame for the repo extract
+
+    Returns:
+    --------
+    float
+        Seconds spent preparing (split in PREPARE_TIMINGS)
+    """
+    start = time.perf_counter()
+    os.chdir(REPO_ROOT)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    sys.modules.setdefault('scripts.utils', utils)
+    utils.enable_frame_sharing()
+    utils.enable_copy_on_write()
+    preload_modules(modules)
+    loaded = time.perf_counter()
+
+    if extracts is None:
+        extracts = selected_extracts(analyses)
+    for path in extracts:
+        utils.load_overdose_data(path)
+    if processed and OVERDOSE_CSV in extracts:
+        utils.full_data_processing(OVERDOSE_CSV)
+
+    PREPARE_TIMINGS['imports'] = loaded - start
+    PREPARE_TIMINGS['data'] = time.perf_counter() - loaded
+    return time.perf_counter() - start
+
+
+def run_analysis(script, context=None):
+    """
+    Run one analysis script in the current process
+
+    Parameters:
+    -----------
+    script : str
+        File name in scripts/
+    context : AnalysisContext, optional
+        Passed to run(context); created if not given
+    """
+    script_path = os.path.join(SCRIPTS_DIR, script)
+    context = context or AnalysisContext(script)
+    sys.argv = [script_path]
+    # Cover plotting libraries imported since utils was
+    utils.install_plot_gate()
+
+    def execute():
+        namespace = runpy.run_path(script_path, run_name='__pipeline__')
+        if callable(namespace.get('run')):
+            namespace['run'](context)
+        elif callable(namespace.get('main')):
+            namespace['main']()
+
+    if profiling.profile_modes():
+        profiling.profile_call(script, execute)
+    else:
+        execute()
+
+    if 'matplotlib.pyplot' in sys.modules:
+        sys.modules['matplotlib.pyplot'].close('all')
+
+
+def _usage(wall_start, cpu_start):
+    """Wall time, CPU time and peak RSS of this process since the given start"""
+    return {'wall_seconds': time.perf_counter() - wall_start,
+            'cpu_seconds': time.process_time() - cpu_start,
+            'peak_rss_mb': utils.peak_rss_mb()}
+
+
+def _child(script, stdout_path, stderr_path, conn, launched, env):
+    """Forked child: report startup, send output to the runner's files, run,
+    then report resource usage"""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    conn.send({'latency': time.time() - launched,
+               'preload': sum(PREPARE_TIMINGS.values())})
+    os.environ.update(env or {})
+    for path, fd in ((stdout_path, 1), (stderr_path, 2)):
+        target = os.open(path, os.O_WRONLY | os.O_APPEND)
+        os.dup2(target, fd)
+        os.close(target)
+    try:
+        run_analysis(script)
+    except Exception:
+        # Same report and exit code as a script run by the interpreter
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.send({'usage': _usage(wall_start, cpu_start)})
+        conn.close()
+
+
+def _ready(conn):
+    """Forkserver warm-up child: report what the server preloaded"""
+    conn.send(dict(PREPARE_TIMINGS, modules=len(
+        [m for m in PRELOAD_MODULES if m in sys.modules])))
+    conn.close()
+
+
+def start_forkserver(analyses=None):
+    """
+    Start the preloaded forkserver and wait until it is ready
+
+    The server imports pipeline_preload, which calls prepare() with
+    PRELOAD_MODULES, the selected extracts and the full_data_processing
+    frame. A no-op child is forked once so the preload cost is paid (and
+    reported) here rather than by the first analysis.
+
+    Parameters:
+    -----------
+    analyses : list of dict, optional
+        Selected pipeline entries, used to pick the extracts to preload
+
+    Returns:
+    --------
+    dict
+        Server preload timings {'imports', 'data', 'modules'}
+    """
+    os.chdir(REPO_ROOT)
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    os.environ[PRELOAD_EXTRACTS_ENV] = os.pathsep.join(selected_extracts(analyses))
+    # The server does not inherit sys.path, and silently skips preload
+    # modules it cannot import
+    python_path = [SCRIPTS_DIR] + [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]
+    os.environ['PYTHONPATH'] = os.pathsep.join(dict.fromkeys(python_path))
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['pipeline_preload'])
+
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_ready, args=(sender,), name='warm-up')
+    process.start()
+    sender.close()
+    timings = receiver.recv()
+    process.join()
+    return timings
+
+
+class ForkedAnalysis:
+    """
+    One analysis running in a forked child
+
+    Mirrors the subprocess.Popen interface the runner polls (poll() and
+    returncode), so forked and subprocess jobs are scheduled the same way.
+    `startup` holds the child's reported launch latency and the preload
+    time it inherited, once the child has started; `usage` its wall time,
+    CPU time and peak RSS once it has finished. Peak RSS includes the
+    pages inherited from the parent, since the child maps them too.
+    """
+
+    def __init__(self, script, stdout, stderr, method='fork', env=None):
+        sys.stdout.flush()
+        sys.stderr.flush()
+        context = multiprocessing.get_context(method)
+        self._receiver, sender = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_child,
+            args=(script, stdout.name, stderr.name, sender, time.time(), env),
+            name=script
+        )
+        self.process.start()
+        sender.close()
+        self.returncode = None
+        self.startup = None
+        self.usage = None
+
+    def _receive(self):
+        """Read the messages the child has sent so far"""
+        try:
+            while self._receiver.poll():
+                message = self._receiver.recv()
+                if 'usage' in message:
+                    self.usage = message['usage']
+                else:
+                    self.startup = message
+        except (EOFError, OSError):
+            pass
+        if self.startup is None and not self.process.is_alive():
+            self.startup = {}
+
+    def poll(self):
+        if self.returncode is None:
+            self._receive()
+            if not self.process.is_alive():
+                self.process.join()
+                self._receive()
+                self.returncode = self.process.exitcode
+                self._receiver.close()
+        return self.returncode
+
+
+def fork_supported(method='fork'):
+    """True if this platform can start workers with method (not Windows)"""
+    return method in multiprocessing.get_all_start_methods()
+
+
+def run_sequence(analyses):
+    """
+    Run analyses one after another in this process (standalone mode)
+
+    Each script gets its own argv and the working directory, sys.path and
+    matplotlib rcParams are restored after it, so one script's settings do
+    not leak into the next. A failing script is reported and the sequence
+    moves on. Module-level state of imported helpers is still shared; the
+    runner's --in-process and --forkserver modes fork each script instead.
+
+    Parameters:
+    -----------
+    analyses : list of dict
+        Pipeline entries to run, in order
+
+    Returns:
+    --------
+    dict
+        Script -> 'success' or 'failed'
+    """
+    import matplotlib
+
+    status = {}
+    for analysis in analyses:
+        script = analysis['script']
+        print("\n" + "="*70)
+        print(f"RUNNING: {analysis['name']} ({script})")
+        print("="*70)
+        cwd, argv, path = os.getcwd(), sys.argv, list(sys.path)
+        start = time.perf_counter()
+        try:
+            with matplotlib.rc_context():
+                run_analysis(script)
+            status[script] = 'success'
+        except SystemExit as e:
+            status[script] = 'success' if e.code in (None, 0) else 'failed'
+        except Exception:
+            traceback.print_exc()
+            status[script] = 'failed'
+        finally:
+            os.chdir(cwd)
+            sys.argv = argv
+            sys.path[:] = path
+            if 'matplotlib.pyplot' in sys.modules:
+                sys.modules['matplotlib.pyplot'].close('all')
+
+        elapsed = time.perf_counter() - start
+        if status[script] == 'success':
+            print(f"✓ {analysis['name']} completed in {elapsed:.1f}s")
+        else:
+            print(f"✗ {analysis['name']} failed after {elapsed:.1f}s")
+    return status
+
+
+def main():
+    from run_all_analyses import iter_pipeline, resolve_scripts
+
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+
+    analyses = [analysis for _, analysis in iter_pipeline()]
+    try:
+        scripts = resolve_scripts(sys.argv[1:], analyses)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(2)
+    selected = [a for a in analyses if a['script'] in scripts]
+
+    print(f"Preparing shared data for {len(selected)} analyses...")
+    print(f"  ready in {prepare(selected):.1f}s")
+
+    status = run_sequence(selected)
+    failed = [script for script, result in status.items() if result == 'failed']
+    print(f"\n{len(status) - len(failed)}/{len(status)} analyses succeeded")
+    for script in failed:
+        print(f"  ✗ {script}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
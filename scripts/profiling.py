@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Script Profiling
+Runs an analysis under a CPU profiler and/or a memory tracker
+
+EPI_PROFILE selects what is collected (comma-separated):
+    cpu   cProfile (deterministic, every call) plus a stack sampler
+    mem   tracemalloc allocation sites and peak RSS
+    all   both
+
+tracemalloc slows every allocation down, so with both modes on the CPU
+tables mostly measure its overhead; the summary says so. Profile with
+cpu and mem in separate runs when the CPU numbers matter.
+
+For each script the results go to results/_profiles/ (overwritten on the
+next profiled run):
+    <script>.prof        cProfile stats (snakeviz, `python -m pstats`)
+    <script>.collapsed   sampled stacks, one `frame;frame;frame count` line
+                         per stack (flamegraph.pl, speedscope)
+    <script>.txt         wall/CPU time, peak RSS and the top-N functions by
+                         cumulative and own time and the top-N allocation
+                         sites
+
+The runner profiles every script it starts when run with --profile (or
+with EPI_PROFILE set), whichever way it starts them.
+
+Usage:
+    python scripts/profiling.py 08 --mode cpu --top 30
+    EPI_PROFILE=mem python scripts/profiling.py 14_years_potential_life_lost.py
+"""
+
+import os
+import sys
+import time
+import runpy
+import pstats
+import cProfile
+import argparse
+import threading
+import tracemalloc
+import collections
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from utils import peak_rss_mb
+
+PROFILE_ENV = 'EPI_PROFILE'
+PROFILE_TOP_ENV = 'EPI_PROFILE_TOP'
+PROFILE_DIR = os.path.join('results', '_profiles')
+PROFILE_MODES = ('cpu', 'mem')
+
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples
+TRACEMALLOC_FRAMES = 25  # Frames kept per allocation
+
+
+def profile_modes(value=None):
+    """
+    Parse a profile mode setting ('cpu', 'mem', 'cpu,mem' or 'all')
+
+    Parameters:
+    -----------
+    value : str, optional
+        Setting to parse; defaults to EPI_PROFILE
+
+    Returns:
+    --------
+    tuple of str
+        Modes in PROFILE_MODES order; empty when profiling is off
+
+    Raises:
+    -------
+    ValueError
+        If a mode is not recognised
+    """
+    if value is None:
+        value = os.environ.get(PROFILE_ENV, '')
+    modes = {m.strip().lower() for m in value.split(',') if m.strip()}
+    modes.discard('0')
+    if 'all' in modes:
+        modes = set(PROFILE_MODES)
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"unknown profile mode(s): {', '.join(sorted(unknown))} "
+                         f"(use {', '.join(PROFILE_MODES)} or all)")
+    return tuple(m for m in PROFILE_MODES if m in modes)
+
+
+def _frame_label(code):
+    """`module/file.py:function` for a code object, short enough to read"""
+    filename = code.co_filename
+    for marker in ('site-packages' + os.sep, REPO_ROOT + os.sep):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples the main thread's stack from a background thread
+
+    Counts are kept per collapsed stack (outermost frame first), the
+    format flame graph tools read. Frames above `root` (the profiler's
+    own caller chain) are left out.
+    """
+
+    def __init__(self, root=None, interval=SAMPLE_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.counts = collections.Counter()
+        self._thread_id = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame is not self.root:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ScriptProfiler:
+    """
+    Collects a CPU profile and/or memory statistics for one script
+
+    Parameters:
+    -----------
+    name : str
+        Script file name, used for the output files
+    modes : tuple of str
+        Any of PROFILE_MODES
+    top : int
+        Rows in each top-N table of the summary
+    """
+
+    def __init__(self, name, modes=('cpu',), top=25):
+        self.name = os.path.splitext(os.path.basename(name))[0]
+        self.modes = modes
+        self.top = top
+        self.profile = None
+        self.sampler = None
+        self.snapshot = None
+        self.traced_peak_mb = None
+
+    def start(self):
+        if 'mem' in self.modes:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        if 'cpu' in self.modes:
+            self.sampler = StackSampler(root=sys._getframe(1))
+            self.sampler.start()
+            self.profile = cProfile.Profile()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        if self.profile is not None:
+            self.profile.enable()
+
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        self.wall_seconds = time.perf_counter() - self._wall
+        self.cpu_seconds = time.process_time() - self._cpu
+        if self.sampler is not None:
+            self.sampler.stop()
+        if 'mem' in self.modes:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.traced_peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+
+    def write(self, directory=None):
+        """
+        Write the profile files and summary
+
+        Returns:
+        --------
+        str
+            Path of the summary
+        """
+        directory = directory or os.path.join(REPO_ROOT, PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.name)
+
+        # tracemalloc's per-allocation hook dominates timings taken with it on
+        distorted = 'mem' in self.modes
+        note = ' (inflated by tracemalloc)' if distorted else ''
+        lines = [
+            f"Profile: {self.name} ({', '.join(self.modes)})",
+            f"Wall time: {self.wall_seconds:.2f}s{note}",
+            f"CPU time:  {self.cpu_seconds:.2f}s{note}",
+        ]
+        peak_rss = peak_rss_mb()
+        if peak_rss is not None:
+            lines.append(f"Peak RSS:  {peak_rss:.0f} MB")
+
+        if self.profile is not None:
+            self.profile.dump_stats(base + '.prof')
+            self.sampler.write(base + '.collapsed')
+            if distorted:
+                lines += ['', "WARNING: cpu and mem were profiled in the same run, so the",
+                          "function timings below (and the sampled stacks) mostly measure",
+                          "tracemalloc overhead. Rerun with --mode cpu for CPU numbers."]
+            for sort, title in (('cumulative', 'cumulative time'), ('tottime', 'own time')):
+                lines += ['', f"Top {self.top} functions by {title}{note}:", '']
+                lines.append(self._stats_table(sort))
+
+        if self.snapshot is not None:
+            lines += ['', f"Peak traced memory: {self.traced_peak_mb:.1f} MB",
+                      f"Top {self.top} allocation sites still held at exit:", '']
+            for stat in self.snapshot.statistics('lineno')[:self.top]:
+                frame = stat.traceback[0]
+                where = f"{os.path.relpath(frame.filename, REPO_ROOT)}:{frame.lineno}"
+                lines.append(f"  {stat.size / 1e6:9.1f} MB {stat.count:>9} blocks  {where}")
+
+        summary = base + '.txt'
+        with open(summary, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        return summary
+
+    def _stats_table(self, sort):
+        import io
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(self.top)
+        # Drop pstats' header, keep the table
+        text = stream.getvalue()
+        start = text.find('   ncalls')
+        return text[start:].rstrip() if start >= 0 else text.rstrip()
+
+
+def profile_call(name, function, modes=None, top=None):
+    """
+    Call function() under a ScriptProfiler and write its results
+
+    Parameters:
+    -----------
+    name : str
+        Script file name, used for the output files
+    function : callable
+        What to profile (runs the script)
+    modes : tuple of str, optional
+        Defaults to EPI_PROFILE
+    top : int, optional
+        Defaults to EPI_PROFILE_TOP or 25
+
+    Returns:
+    --------
+    object
+        Whatever function returned
+    """
+    modes = profile_modes() if modes is None else modes
+    top = top or int(os.environ.get(PROFILE_TOP_ENV, 25))
+    profiler = ScriptProfiler(name, modes, top)
+    profiler.start()
+    try:
+        return function()
+    finally:
+        profiler.stop()
+        summary = profiler.write()
+        print(f"Profile written: {os.path.relpath(summary, REPO_ROOT)}", file=sys.stderr)
+
+
+def run_script(script_path, modes=None, top=None):
+    """
+    Run a script as __main__ under the profiler
+
+    sys.argv and sys.path are set up as if the script were started
+    directly, so relative paths and `from utils import ...` still work.
+    """
+    script_path = os.path.abspath(script_path)
+    sys.argv = [script_path]
+    sys.path.insert(0, os.path.dirname(script_path))
+    return profile_call(script_path,
+                        lambda: runpy.run_path(script_path, run_name='__main__'),
+                        modes, top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile one analysis script')
+    parser.add_argument('script', help='Script path, file name or registry id/number')
+    parser.add_argument('--mode', default=None,
+                        help=f"cpu, mem, cpu,mem or all (default: {PROFILE_ENV} or cpu)")
+    parser.add_argument('--top', type=int, default=None,
+                        help='Rows per top-N table (default: 25)')
+    args = parser.parse_args()
+
+    try:
+        modes = profile_modes(args.mode if args.mode is not None
+                              else os.environ.get(PROFILE_ENV) or 'cpu')
+    except ValueError as e:
+        parser.error(str(e))
+
+    script = args.script
+    if not os.path.exists(script):
+        sys.path.append(SCRIPTS_DIR)
+        from run_all_analyses import iter_pipeline, resolve_scripts
+        try:
+            matches = resolve_scripts([script], [a for _, a in iter_pipeline()])
+        except ValueError as e:
+            parser.error(str(e))
+        if len(matches) != 1:
+            parser.error(f"{script} matches {len(matches)} scripts: {', '.join(sorted(matches))}")
+        script = os.path.join(SCRIPTS_DIR, matches.pop())
+
+    run_script(script, modes, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Content-Addressed Results Store
+Keeps one copy of each distinct output file and links results/ to it
+
+Outputs are stored once per content hash in results/.store/objects/ and a
+manifest (results/.store/manifest.json) maps each logical path, such as
+results/11_population_adjusted_rates/race_rates_annual.csv, to its blob.
+The files under results/ become links to the blobs, so identical tables
+(race_rates_annual.csv is in seven folders) take the space of one, and an
+output a rerun reproduces unchanged costs no extra disk.
+
+The manifest carries a digest of all its entries: two manifests (or run
+reports, which record it) describe identical results exactly when their
+digests match, without reading any output.
+
+Link modes:
+    hardlink  default; results/ files share the blob's inode and look
+              unchanged to scripts, git and spreadsheet tools (falls back
+              to copy across filesystems)
+    symlink   relative links into the store; visible as links to git
+    copy      plain copies, so results/ can be rewritten freely (no space
+              saved, manifest and digest still kept); for people who rerun
+              scripts by hand
+
+Blobs are read-only. With hardlink or symlink, a linked output must never
+be rewritten in place: the write would go through to the blob and to
+every path sharing it. The runner releases a script's outputs before
+starting it (run_all_analyses.py --store, or
+EPI_RESULTS_STORE=hardlink|symlink|copy) and ingests them only if it
+succeeds. Run `release` before rerunning a script by hand, or by the
+runner without --store, or keep the store in copy mode.
+
+Usage:
+    python scripts/results_store.py ingest [PATH ...]       # default: results/
+    python scripts/results_store.py status
+    python scripts/results_store.py release results/08_geospatial_statistics/
+    python scripts/results_store.py materialize [--mode symlink]
+    python scripts/results_store.py snapshot before-refresh
+    python scripts/results_store.py diff before-refresh [OTHER]
+    python scripts/results_store.py verify
+    python scripts/results_store.py gc
+"""
+
+import os
+import sys
+import json
+import stat
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+RESULTS_DIR = 'results'
+STORE_DIR = os.path.join(RESULTS_DIR, '.store')
+SNAPSHOT_DIR = os.path.join(STORE_DIR, 'snapshots')
+STORE_ENV = 'EPI_RESULTS_STORE'
+LINK_MODES = ('copy', 'hardlink', 'symlink')
+DEFAULT_MODE = 'hardlink'  # copy is the opt-in for hand-run scripts
+MANIFEST_VERSION = 1
+
+
+def store_mode(value=None):
+    """
+    Link mode selected by EPI_RESULTS_STORE (or value)
+
+    Returns:
+    --------
+    str or None
+        One of LINK_MODES ('1'/'true'/'yes' mean DEFAULT_MODE), or None
+        when the store is off
+
+    Raises:
+    -------
+    ValueError
+        If the setting is not recognised
+    """
+    if value is None:
+        value = os.environ.get(STORE_ENV, '')
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return None
+    if value in ('1', 'true', 'yes'):
+        return DEFAULT_MODE
+    if value not in LINK_MODES:
+        raise ValueError(f"unknown results store mode {value!r} (use {', '.join(LINK_MODES)})")
+    return value
+
+
+def _abs(path):
+    return os.path.join(REPO_ROOT, path)
+
+
+def _logical(path):
+    """Repo-relative path used as the manifest key"""
+    return os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, '/')
+
+
+def blob_path(sha):
+    return _abs(os.path.join(STORE_DIR, 'objects', sha[:2], sha[2:]))
+
+
+def manifest_path(name=None):
+    """The live manifest, or a named snapshot"""
+    if name is None:
+        return _abs(os.path.join(STORE_DIR, 'manifest.json'))
+    return _abs(os.path.join(SNAPSHOT_DIR, f"{name}.json"))
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_digest(files):
+    """Digest over every (logical path, blob) pair; equal digests mean equal results"""
+    digest = hashlib.sha256()
+    for logical in sorted(files):
+        digest.update(f"{logical}\0{files[logical]['sha256']}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest(name=None):
+    """
+    Read the live manifest or a snapshot (empty if there is none)
+
+    Parameters:
+    -----------
+    name : str, optional
+        Snapshot name or manifest file path; the live manifest if None
+
+    Returns:
+    --------
+    dict
+        {'version', 'digest', 'updated', 'files': {logical: {'sha256', 'size'}}}
+    """
+    path = manifest_path(name)
+    if name is not None and os.path.isfile(name):
+        path = name
+    if not os.path.exists(path):
+        if name is not None:
+            raise FileNotFoundError(f"no manifest snapshot {name!r} ({path})")
+        return {'version': MANIFEST_VERSION, 'digest': manifest_digest({}), 'files': {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(files, name=None):
+    """Write the manifest (or a snapshot) atomically and return it"""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'digest': manifest_digest(files),
+        'updated': datetime.now().isoformat(timespec='seconds'),
+        'files': dict(sorted(files.items())),
+    }
+    path = manifest_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def _excluded(logical):
+    """Store internals and machine-local folders (results/_runs, .store, ...)"""
+    return any(part.startswith(('.', '_')) for part in logical.split('/')[1:])
+
+
+def iter_files(paths):
+    """Logical paths of the files under paths (files or folders)"""
+    for path in paths:
+        path = _abs(path)
+        if os.path.isfile(path):
+            logical = _logical(path)
+            if not _excluded(logical):
+                yield logical
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(('.', '_')))
+            for name in sorted(names):
+                logical = _logical(os.path.join(root, name))
+                if not _excluded(logical) and not name.endswith('.tmp'):
+                    yield logical
+
+
+def _is_linked(path, sha=None):
+    """Whether path is a link to a store blob (for sha, if given)"""
+    if os.path.islink(path):
+        target = os.path.realpath(path)
+        return target.startswith(_abs(STORE_DIR) + os.sep) and \
+            (sha is None or target == os.path.realpath(blob_path(sha)))
+    if sha is None:
+        return os.path.exists(path) and os.stat(path).st_nlink > 1
+    try:
+        return os.path.samefile(path, blob_path(sha))
+    except OSError:
+        return False
+
+
+def _is_stored_copy(path, entry):
+    """Whether path is an unmodified copy of its manifest entry's blob"""
+    try:
+        return os.path.getsize(path) == entry['size'] and hash_file(path) == entry['sha256']
+    except OSError:
+        return False
+
+
+def _link(sha, path, mode):
+    """Point path at blob sha (replacing whatever is there)"""
+    blob = blob_path(sha)
+    tmp_path = f"{path}.{os.getpid()}.link.tmp"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if mode == 'symlink':
+        os.symlink(os.path.relpath(blob, os.path.dirname(path)), tmp_path)
+    elif mode == 'hardlink':
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            # Other filesystem, or links unsupported
+            shutil.copyfile(blob, tmp_path)
+    else:
+        shutil.copyfile(blob, tmp_path)
+    os.replace(tmp_path, path)
+    if os.path.lexists(tmp_path):
+        # rename() is a no-op when both names are links to the same file
+        os.remove(tmp_path)
+
+
+def _add_blob(path, sha, mode):
+    """Add a file's content to the store, sharing its inode only when linking"""
+    blob = blob_path(sha)
+    os.makedirs(os.path.dirname(blob), exist_ok=True)
+    tmp_path = f"{blob}.{os.getpid()}.tmp"
+    try:
+        if mode != 'hardlink':
+            raise OSError  # Keep the file under results/ independent
+        os.link(path, tmp_path)
+    except OSError:
+        shutil.copyfile(path, tmp_path)
+    os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp_path, blob)
+
+
+def ingest(paths=(RESULTS_DIR,), mode=DEFAULT_MODE, manifest=None, save=True):
+    """
+    Store the files under paths and link them to their blobs
+
+    Parameters:
+    -----------
+    paths : list of str
+        Files or folders, relative to the repo root
+    mode : str
+        One of LINK_MODES
+    manifest : dict, optional
+        Manifest to update (loaded if not given)
+    save : bool
+        Write the manifest afterwards
+
+    Returns:
+    --------
+    dict
+        {'manifest', 'new', 'deduplicated', 'unchanged' (lists of logical
+        paths), 'bytes_saved'}
+    """
+    manifest = manifest or load_manifest()
+    files = dict(manifest['files'])
+    result = {'new': [], 'deduplicated': [], 'unchanged': [], 'bytes_saved': 0}
+
+    for logical in iter_files(paths):
+        path = _abs(logical)
+        known = files.get(logical)
+        if known and _is_linked(path, known['sha256']):
+            result['unchanged'].append(logical)
+            continue
+        sha = hash_file(path)
+        size = os.path.getsize(path)
+        if mode == 'copy' and known and known['sha256'] == sha \
+                and os.path.exists(blob_path(sha)):
+            result['unchanged'].append(logical)
+            continue
+        if os.path.exists(blob_path(sha)):
+            result['deduplicated'].append(logical)
+            if mode != 'copy':
+                result['bytes_saved'] += size
+        else:
+            _add_blob(path, sha, mode)
+            result['new'].append(logical)
+        if mode != 'copy':
+            _link(sha, path, mode)
+        files[logical] = {'sha256': sha, 'size': size}
+
+    result['manifest'] = save_manifest(files) if save else dict(manifest, files=files)
+    return result
+
+
+def release(paths, manifest=None, keep=()):
+    """
+    Remove stored files under paths so a script can write fresh files
+
+    Removes links into the store and unmodified copies of stored files
+    (copy mode); edited files are left alone. Files a script does not
+    rewrite come back with restore().
+
+    Parameters:
+    -----------
+    paths : list of str
+        Files or folders, relative to the repo root
+    manifest : dict, optional
+        Manifest to read (loaded if not given)
+    keep : list of str
+        Files or folders to leave in place, e.g. inputs the script reads
+        from its own output folder
+
+    Returns:
+    --------
+    list of str
+        Logical paths removed
+    """
+    files = (manifest or load_manifest())['files']
+    kept = set(iter_files(keep))
+    removed = []
+    for logical in iter_files(paths):
+        if logical not in files or logical in kept:
+            continue
+        path = _abs(logical)
+        if _is_linked(path) or _is_stored_copy(path, files[logical]):
+            os.remove(path)
+            removed.append(logical)
+    return removed
+
+
+def forget(logicals, manifest=None, save=True):
+    """
+    Drop manifest entries, e.g. outputs a script no longer writes
+
+    The blobs stay until gc() finds them unreferenced.
+
+    Parameters:
+    -----------
+    logicals : list of str
+        Logical paths to drop
+    manifest : dict, optional
+        Manifest to update (loaded if not given)
+    save : bool
+        Write the manifest afterwards
+
+    Returns:
+    --------
+    dict
+        The updated manifest
+    """
+    manifest = manifest or load_manifest()
+    drop = set(logicals)
+    if not drop & set(manifest['files']):
+        return manifest
+    files = {k: v for k, v in manifest['files'].items() if k not in drop}
+    return save_manifest(files) if save else dict(manifest, files=files)
+
+
+def restore(paths=(RESULTS_DIR,), mode=DEFAULT_MODE, manifest=None, relink=False):
+    """
+    Recreate manifest entries under paths that are missing on disk
+
+    Parameters:
+    -----------
+    paths : list of str
+        Files or folders, relative to the repo root
+    mode : str
+        One of LINK_MODES
+    manifest : dict, optional
+        Manifest to read (loaded if not given)
+    relink : bool
+        Also replace existing files with links in this mode (materialize)
+
+    Returns:
+    --------
+    list of str
+        Logical paths written
+    """
+    files = (manifest or load_manifest())['files']
+    prefixes = [_logical(_abs(p)) for p in paths]
+    written = []
+    for logical, entry in files.items():
+        if not any(logical == p or logical.startswith(p.rstrip('/') + '/') for p in prefixes):
+            continue
+        path = _abs(logical)
+        if os.path.lexists(path) and not relink:
+            continue
+        if relink and mode != 'copy' and _is_linked(path, entry['sha256']) and \
+                os.path.islink(path) == (mode == 'symlink'):
+            continue  # Already linked this way
+        if not os.path.exists(blob_path(entry['sha256'])):
+            print(f"  ✗ blob missing for {logical}")
+            continue
+        if relink and os.path.exists(path) and not _is_linked(path):
+            if mode == 'copy' or hash_file(path) != entry['sha256']:
+                continue  # Already a copy, or edited since it was stored
+        _link(entry['sha256'], path, mode)
+        written.append(logical)
+    return written
+
+
+def compare(old, new):
+    """
+    Differences between two manifests
+
+    Identical digests short-circuit without looking at the entries.
+
+    Returns:
+    --------
+    dict
+        {'added', 'removed', 'changed'} lists of logical paths (all empty
+        when the results are identical)
+    """
+    if old.get('digest') == new.get('digest'):
+        return {'added': [], 'removed': [], 'changed': []}
+    a, b = old['files'], new['files']
+    return {
+        'added': sorted(set(b) - set(a)),
+        'removed': sorted(set(a) - set(b)),
+        'changed': sorted(k for k in set(a) & set(b) if a[k]['sha256'] != b[k]['sha256']),
+    }
+
+
+def verify(manifest=None):
+    """Blobs whose content no longer matches their hash (or that are missing)"""
+    files = (manifest or load_manifest())['files']
+    bad = []
+    for sha in sorted({entry['sha256'] for entry in files.values()}):
+        blob = blob_path(sha)
+        if not os.path.exists(blob) or hash_file(blob) != sha:
+            bad.append(sha)
+    return bad
+
+
+def gc(manifest=None):
+    """
+    Delete blobs no manifest or snapshot refers to
+
+    Returns:
+    --------
+    tuple of (int, int)
+        Blobs removed and bytes freed
+    """
+    referenced = {entry['sha256'] for entry in (manifest or load_manifest())['files'].values()}
+    snapshots = _abs(SNAPSHOT_DIR)
+    if os.path.isdir(snapshots):
+        for name in os.listdir(snapshots):
+            if name.endswith('.json'):
+                snapshot = load_manifest(os.path.join(snapshots, name))
+                referenced |= {entry['sha256'] for entry in snapshot['files'].values()}
+
+    removed, freed = 0, 0
+    objects = _abs(os.path.join(STORE_DIR, 'objects'))
+    for root, _, names in os.walk(objects):
+        for name in names:
+            sha = os.path.basename(root) + name
+            if sha not in referenced:
+                path = os.path.join(root, name)
+                freed += os.path.getsize(path)
+                os.remove(path)
+                removed += 1
+    return removed, freed
+
+
+def _megabytes(n):
+    return f"{n / 1e6:.1f} MB"
+
+
+def _print_compare(old_label, new_label, difference):
+    changed = sum(len(v) for v in difference.values())
+    if not changed:
+        print(f"✓ {new_label} is identical to {old_label}")
+        return
+    print(f"{old_label} -> {new_label}: {changed} file(s) differ")
+    for kind, marker in (('changed', '~'), ('added', '+'), ('removed', '-')):
+        for logical in difference[kind]:
+            print(f"  {marker} {logical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed store for results/')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('ingest', help='Store files and link them to their blobs')
+    p.add_argument('paths', nargs='*', default=[RESULTS_DIR])
+    p.add_argument('--mode', choices=LINK_MODES, default=DEFAULT_MODE)
+    p = sub.add_parser('materialize', help='Recreate results/ from the manifest')
+    p.add_argument('paths', nargs='*', default=[RESULTS_DIR])
+    p.add_argument('--mode', choices=LINK_MODES, default=DEFAULT_MODE)
+    p = sub.add_parser('release', help='Unlink stored files before rewriting them by hand')
+    p.add_argument('paths', nargs='+')
+    sub.add_parser('status', help='Store size, savings and changes since the manifest')
+    p = sub.add_parser('snapshot', help='Save the manifest under a name')
+    p.add_argument('name')
+    p = sub.add_parser('diff', help='Compare snapshots (or a snapshot with the live manifest)')
+    p.add_argument('old')
+    p.add_argument('new', nargs='?')
+    sub.add_parser('verify', help='Check every blob against its hash')
+    sub.add_parser('gc', help='Delete unreferenced blobs')
+    args = parser.parse_args()
+
+    os.chdir(REPO_ROOT)
+    manifest = load_manifest()
+
+    if args.command == 'ingest':
+        result = ingest(args.paths, args.mode, manifest)
+        print(f"✓ {len(result['new'])} new, {len(result['deduplicated'])} deduplicated, "
+              f"{len(result['unchanged'])} unchanged; {_megabytes(result['bytes_saved'])} saved")
+        print(f"  manifest digest {result['manifest']['digest'][:16]}")
+
+    elif args.command == 'materialize':
+        written = restore(args.paths, args.mode, manifest, relink=True)
+        print(f"✓ {len(written)} file(s) linked ({args.mode})")
+
+    elif args.command == 'release':
+        removed = release(args.paths, manifest)
+        print(f"✓ {len(removed)} stored file(s) unlinked; "
+              f"run materialize to bring back any the script does not rewrite")
+
+    elif args.command == 'status':
+        files = manifest['files']
+        logical_bytes = sum(e['size'] for e in files.values())
+        blobs = {e['sha256']: e['size'] for e in files.values()}
+        print(f"Manifest: {len(files)} files, {_megabytes(logical_bytes)} "
+              f"(digest {manifest['digest'][:16]}, updated {manifest.get('updated', 'never')})")
+        print(f"Store:    {len(blobs)} blobs, {_megabytes(sum(blobs.values()))} "
+              f"({_megabytes(logical_bytes - sum(blobs.values()))} deduplicated)")
+        missing = [k for k in files if not os.path.lexists(k)]
+        modified = [k for k in files if os.path.lexists(k)
+                    and not _is_linked(k, files[k]['sha256'])
+                    and not _is_stored_copy(k, files[k])]
+        untracked = [k for k in iter_files([RESULTS_DIR]) if k not in files]
+        for label, items in (('missing', missing), ('modified since stored', modified),
+                             ('not in the store', untracked)):
+            if items:
+                print(f"  {len(items)} {label}, e.g. {items[0]}")
+
+    elif args.command == 'snapshot':
+        save_manifest(manifest['files'], args.name)
+        print(f"✓ Snapshot {args.name} ({manifest['digest'][:16]})")
+
+    elif args.command == 'diff':
+        old = load_manifest(args.old)
+        new = load_manifest(args.new) if args.new else manifest
+        _print_compare(args.old, args.new or 'current manifest', compare(old, new))
+
+    elif args.command == 'verify':
+        bad = verify(manifest)
+        if bad:
+            print(f"✗ {len(bad)} blob(s) missing or modified:")
+            for sha in bad:
+                print(f"  {sha[:16]}: " + ', '.join(
+                    k for k, e in manifest['files'].items() if e['sha256'] == sha))
+            sys.exit(1)
+        print(f"✓ All {len({e['sha256'] for e in manifest['files'].values()})} blobs intact")
+
+    elif args.command == 'gc':
+        removed, freed = gc(manifest)
+        print(f"✓ {removed} unreferenced blob(s) removed, {_megabytes(freed)} freed")
+
+
+if __name__ == "__main__":
+    main()
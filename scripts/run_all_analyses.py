@@ -3,186 +3,964 @@
 
 """
 Master Analysis Pipeline
-Runs all analyses in the correct order
+Runs all analyses as a dependency graph, in parallel where possible
+
+Scripts are registered in pipeline_registry.py. Each entry declares the
+files it reads ('inputs') and writes ('outputs'). A script depends on every
+other selected script whose outputs cover one of its inputs; an output
+ending in '/' covers everything under that folder. Scripts whose
+dependencies have finished run concurrently.
 
 Usage:
-    python scripts/run_all_analyses.py [--skip-census] [--skip-plots]
+    python scripts/run_all_analyses.py [--skip-census] [--skip-plots] [--jobs N]
+    python scripts/run_all_analyses.py --tag fred --only 18-27,51
 
 Options:
-    --skip-census    Skip Census data fetching (use existing data)
-    --skip-plots     Skip plot generation (faster for testing)
-    --basic-only     Run only basic analyses (01-08)
-    --advanced-only  Run only advanced analyses (09-17)
+    --skip-census        Skip data fetching steps (use existing data)
+    --skip-plots         Write every CSV but build no figures (sets
+                         EPI_SKIP_PLOTS for each script; see utils.plots_enabled)
+    --basic-only         Run only census, descriptive and basic analyses (00-08)
+    --advanced-only      Run only advanced analyses (09-17)
+    --only SPEC          Run only matching scripts: ids, numbers or ranges,
+                         comma-separated (e.g. 18-27,51b,fetch_zip_rent_data)
+    --tag TAG            Run only scripts with any of these tags (repeatable)
+    --list               List the selected scripts, tags and dependencies
+    --defer-figures      Queue figures while the analyses run and render them
+                         in a process pool afterwards (see figure_queue.py)
+    --profile MODE       Profile every selected script (cpu, mem or cpu,mem;
+                         sets EPI_PROFILE) and write the results to
+                         results/_profiles/ (see profiling.py). Profiled
+                         scripts are rerun even if they are up to date
+    --in-process         Load the data once and fork each script from the
+                         runner (see pipeline_worker.py)
+    --forkserver         Fork each script from a server that has preloaded
+                         the scientific stack and the processed data
+    --jobs N             Maximum scripts running at once (default: CPU count)
+    --continue-on-error  Keep going after a failure (its dependents are skipped)
+    --force SCRIPT       Rebuild SCRIPT even if it is up to date (repeatable;
+                         a prefix such as 11 works, 'all' rebuilds everything)
+    --dry-run            Show what would be rebuilt and why, then exit
+    --store [MODE]       Keep results/ in the content-addressed store: each
+                         distinct file is stored once and results/ hardlinks
+                         to it (default), or symlink/copy; copy keeps plain
+                         files for scripts rerun by hand (sets
+                         EPI_RESULTS_STORE; see results_store.py)
+
+Run reports:
+    Each run writes results/_runs/<timestamp>.json with the wall time, CPU
+    time, peak RSS and output bytes of every script it ran, and the stages
+    scripts time with utils.stage(), then prints what changed for each
+    script since the last report in which it ran (see run_report.py).
+
+Incremental rebuilds:
+    After a successful run the runner records a fingerprint of each script:
+    the content hash of the script, of utils.py, of the helper modules in
+    scripts/ that it imports (directly or through another helper) and of its
+    declared inputs (results/.pipeline_state.json). A script is skipped when
+    its fingerprint is unchanged and all of its declared outputs still
+    exist. With --skip-plots, missing figures do not trigger a rebuild; a
+    script whose last run skipped its figures is rebuilt by the next run
+    with plots. Steps registered with 'always' (the FRED cache refresh) run
+    every time, before the scripts that read their outputs are
+    fingerprinted.
 """
 
 import os
 import sys
+import ast
+import json
+import time
+import hashlib
+import tempfile
 import subprocess
 import argparse
 from datetime import datetime
 
 SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+sys.path.append(SCRIPTS_DIR)
+from pipeline_registry import PIPELINE, TAGS
+from utils import SKIP_PLOTS_ENV, STAGE_LOG_ENV, plots_enabled, install_plot_gate
+from profiling import PROFILE_ENV, PROFILE_DIR, profile_modes
+from run_report import (list_runs, write_report, print_comparison,
+                        baseline_report, ran_scripts)
+import results_store
+
+POLL_INTERVAL = 0.1  # Seconds between checks on running scripts
+FIGURE_EXTENSIONS = ('.png', '.pdf', '.svg')  # Outputs not written with --skip-plots
+DONE = ('success', 'up-to-date')  # Statuses that satisfy a dependency
+
+# Fingerprints of the last successful run of each script
+STATE_PATH = os.path.join(REPO_ROOT, 'results', '.pipeline_state.json')
+UTILS_PATH = os.path.join(SCRIPTS_DIR, 'utils.py')
+
+# Rebuild reason of steps registered with 'always' (they check their own
+# freshness, so on their own they do not imply a downstream rebuild)
+ALWAYS_RUNS = 'always runs'
+
+def iter_pipeline():
+    """Yield (group, entry) for every registered script, in PIPELINE order"""
+    for group, entries in PIPELINE.items():
+        for analysis in (entries if isinstance(entries, list) else [entries]):
+            yield group, analysis
+
+
+def script_id(script):
+    """Short id of a script: '51b' for 51b_zip_panel_regression.py"""
+    return script[:-3] if not script[0].isdigit() else script.split('_')[0]
+
+
+def _script_number(script):
+    digits = ''
+    for char in script:
+        if not char.isdigit():
+            break
+        digits += char
+    return int(digits) if digits else None
+
+
+def _matches(token, script):
+    """
+    True if a selection token names a script
+
+    Tokens can be 'all', a file name (with or without .py), an id such as
+    '51b', a number such as '51' (matching 51, 51b, 51c and 51d), a numeric
+    range such as '18-27', or a file-name prefix such as 'fetch_'.
+    """
+    token = os.path.basename(token.strip())
+    if token == 'all':
+        return True
+    if token in (script, script[:-3], script_id(script)):
+        return True
+    number = _script_number(script)
+    if token.isdigit():
+        return number == int(token)
+    low, sep, high = token.partition('-')
+    if sep and low.isdigit() and high.isdigit():
+        return number is not None and int(low) <= number <= int(high)
+    return script.startswith(token)
 
-# Define analysis pipeline
-PIPELINE = {
-    'census': {
-        'name': 'Census Data Fetching',
-        'script': 'fetch_census_data.py',
-        'required': True,
-        'description': 'Fetch population and SES data from Census API'
-    },
-    'descriptive': {
-        'name': 'Descriptive Statistics',
-        'script': '00_descriptive_table_and_plots.py',
-        'required': False,
-        'description': 'Create Table 1 and raincloud plots'
-    },
-    'data_quality': {
-        'name': 'Data Quality Report',
-        'script': '00_data_quality_report.py',
-        'required': False,
-        'description': 'Sample derivation and data completeness'
-    },
-    'basic_analyses': [
-        {
-            'name': 'Fentanyl Timeline',
-            'script': '01_fentanyl_crisis_timeline.py',
-            'description': 'Fentanyl emergence and co-occurrence patterns'
-        },
-        {
-            'name': 'Polysubstance Trends',
-            'script': '02_polysubstance_trends.py',
-            'description': 'Polysubstance involvement and combinations'
-        },
-        {
-            'name': 'Demographics',
-            'script': '03_demographic_shifts.py',
-            'description': 'Age, race, and gender trends'
-        },
-        {
-            'name': 'Homelessness',
-            'script': '04_homelessness_analysis.py',
-            'description': 'Housing status and substance patterns'
-        },
-        {
-            'name': 'Geographic Analysis',
-            'script': '05_geographic_analysis.py',
-            'description': 'ZIP code and spatial analysis'
-        },
-        {
-            'name': 'Seasonal Patterns',
-            'script': '06_seasonal_patterns.py',
-            'description': 'Monthly and day-of-week patterns'
-        },
-        {
-            'name': 'COVID Impact',
-            'script': '07_covid_impact.py',
-            'description': 'Pre/during/post COVID comparisons'
-        },
-        {
-            'name': 'Geospatial Statistics',
-            'script': '08_geospatial_statistical_analysis.py',
-            'description': 'Center of gravity and clustering'
-        }
-    ],
-    'advanced_analyses': [
-        {
-            'name': 'Race-Stratified Trends',
-            'script': '09_race_substance_trends.py',
-            'description': 'Substance trends by race/ethnicity'
-        },
-        {
-            'name': 'Age-Race Analysis',
-            'script': '10_age_race_figure.py',
-            'description': 'Age patterns by race (addresses reviewer concern)'
-        },
-        {
-            'name': 'Population-Adjusted Rates',
-            'script': '11_population_adjusted_rates.py',
-            'description': 'Overdose rates per 100k with disparity ratios'
-        },
-        {
-            'name': 'SES Context Figure',
-            'script': '12_ses_context_figure.py',
-            'description': 'Poverty, income, and age context'
-        },
-        {
-            'name': 'Temporal Correlations',
-            'script': '13_temporal_correlation_analysis.py',
-            'description': 'SES changes vs overdose rate changes'
-        },
-        {
-            'name': 'YPLL Analysis',
-            'script': '14_years_potential_life_lost.py',
-            'description': 'Years of potential life lost by race'
-        },
-        {
-            'name': 'Disparity Decomposition',
-            'script': '15_disparity_decomposition.py',
-            'description': 'SES-explained vs structural factors'
-        },
-        {
-            'name': 'Comprehensive Figure',
-            'script': '16_comprehensive_publication_figure.py',
-            'description': 'Combined publication figure'
-        },
-        {
-            'name': 'Real Income Analysis',
-            'script': '17_real_income_cost_of_living.py',
-            'description': 'Inflation-adjusted income and housing costs'
-        }
-    ]
-}
-
-
-def run_script(script_name, description):
-    """
-    Run a single analysis script
+
+def resolve_scripts(tokens, analyses):
+    """
+    Map selection tokens (--force, --only) to script names
 
     Parameters:
     -----------
-    script_name : str
-        Name of the script file
-    description : str
-        Description of what the script does
+    tokens : list of str
+        Tokens as accepted by _matches; comma-separated lists are split
+    analyses : list of dict
+        Pipeline entries to match against
 
     Returns:
     --------
-    bool
-        True if successful, False otherwise
+    set of str
+        Matching script names
+
+    Raises:
+    -------
+    ValueError
+        If a token matches no script
     """
-    script_path = os.path.join(SCRIPTS_DIR, script_name)
+    matched = set()
+    for token in ','.join(tokens or []).split(','):
+        if not token.strip():
+            continue
+        hits = [a['script'] for a in analyses if _matches(token, a['script'])]
+        if not hits:
+            raise ValueError(f"'{token}' matches no selected script")
+        matched.update(hits)
+    return matched
 
-    print("\n" + "="*70)
-    print(f"RUNNING: {description}")
-    print(f"Script: {script_name}")
-    print("="*70)
 
+def select_analyses(args):
+    """
+    Flatten PIPELINE into the list of entries selected by the command line
+
+    Group flags (--basic-only, --advanced-only) are applied first, then
+    --only and --tag narrow the selection; --skip-census drops every
+    'fetch' step.
+
+    Parameters:
+    -----------
+    args : argparse.Namespace
+        Parsed command-line arguments
+
+    Returns:
+    --------
+    list of dict
+        Pipeline entries to run, in declaration order
+
+    Raises:
+    -------
+    ValueError
+        If --only names a script that is not registered
+    """
+    if args.basic_only:
+        groups = {'census', 'descriptive', 'data_quality', 'basic_analyses'}
+    elif args.advanced_only:
+        groups = {'advanced_analyses'}
+    else:
+        groups = set(PIPELINE)
+
+    selected = [analysis for group, analysis in iter_pipeline() if group in groups]
+
+    if args.only:
+        scripts = resolve_scripts(args.only, selected)
+        selected = [a for a in selected if a['script'] in scripts]
+    if args.tag:
+        tags = set(','.join(args.tag).split(','))
+        selected = [a for a in selected if tags & set(a.get('tags', []))]
+    if args.skip_census:
+        selected = [a for a in selected if 'fetch' not in a.get('tags', [])]
+
+    return selected
+
+
+def list_analyses(analyses):
+    """Print selected scripts with their tags and declared dependencies"""
+    dependencies = build_dependencies(analyses)
+    print(f"{'SCRIPT':<42} {'TAGS':<30} NAME")
+    for analysis in analyses:
+        script = analysis['script']
+        print(f"{script:<42} {','.join(analysis.get('tags', [])):<30} "
+              f"{analysis['name']}")
+        if dependencies[script]:
+            after = ', '.join(script_id(dep) for dep in sorted(dependencies[script]))
+            print(f"{'':<42} after: {after}")
+    print(f"\n{len(analyses)} scripts. Tags:")
+    for tag, description in TAGS.items():
+        print(f"  {tag:<12} {description}")
+
+
+def _covers(output, path):
+    """True if a declared output (file, or folder ending in '/') covers path"""
+    output = os.path.normpath(output) + (os.sep if output.endswith('/') else '')
+    path = os.path.normpath(path)
+    if output.endswith(os.sep):
+        return path.startswith(output)
+    return path == output
+
+
+def build_dependencies(analyses):
+    """
+    Derive the dependency graph from declared inputs and outputs
+
+    Inputs that no selected script produces are treated as existing files
+    (raw data, Census tables when --skip-census is set, etc.).
+
+    Parameters:
+    -----------
+    analyses : list of dict
+        Pipeline entries with 'script', 'inputs' and 'outputs'
+
+    Returns:
+    --------
+    dict
+        Maps each script to the set of scripts it must wait for
+
+    Raises:
+    -------
+    ValueError
+        If the declared inputs and outputs form a cycle
+    """
+    dependencies = {}
+    for analysis in analyses:
+        upstream = set()
+        for path in analysis.get('inputs', []):
+            for producer in analyses:
+                if producer['script'] == analysis['script']:
+                    continue
+                if any(_covers(out, path) for out in producer.get('outputs', [])):
+                    upstream.add(producer['script'])
+        dependencies[analysis['script']] = upstream
+
+    topological_order(analyses, dependencies)  # Raises on cycles
+    return dependencies
+
+
+def topological_order(analyses, dependencies):
+    """
+    Order analyses so every script follows the scripts it depends on
+
+    Parameters:
+    -----------
+    analyses : list of dict
+        Pipeline entries
+    dependencies : dict
+        Output of build_dependencies
+
+    Returns:
+    --------
+    list of dict
+        Analyses in dependency order, otherwise in declaration order
+
+    Raises:
+    -------
+    ValueError
+        If the dependencies form a cycle
+    """
+    ordered = []
+    done = set()
+    remaining = list(analyses)
+    while remaining:
+        ready = [a for a in remaining if dependencies[a['script']] <= done]
+        if not ready:
+            names = ', '.join(sorted(a['script'] for a in remaining))
+            raise ValueError(f"Dependency cycle among: {names}")
+        for analysis in ready:
+            ordered.append(analysis)
+            done.add(analysis['script'])
+            remaining.remove(analysis)
+    return ordered
+
+
+def load_state(state_path=STATE_PATH):
+    """
+    Load recorded fingerprints from the last runs
+
+    Parameters:
+    -----------
+    state_path : str
+        Path to the JSON state file
+
+    Returns:
+    --------
+    dict
+        Maps script name to its recorded fingerprint (empty if none)
+    """
+    try:
+        with open(state_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, state_path=STATE_PATH):
+    """Atomically write the fingerprint state file"""
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+
+def _resolve(path):
+    """Declared paths are relative to the repo root unless absolute"""
+    return os.path.join(REPO_ROOT, path)
+
+
+def _hash_file(path, known=None):
+    """
+    Content hash of a file, reusing a known digest if size/mtime match
+
+    Parameters:
+    -----------
+    path : str
+        File to hash
+    known : dict, optional
+        Previous {'size', 'mtime_ns', 'sha256'} record for the same file
+
+    Returns:
+    --------
+    dict or None
+        {'size', 'mtime_ns', 'sha256'}, or None if the file does not exist
+    """
     try:
-        result = subprocess.run(
-            [sys.executable, script_path],
-            cwd=os.path.dirname(SCRIPTS_DIR),  # Run from repo root
-            check=True,
-            capture_output=True,
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if os.path.isdir(path):
+        known = None  # A folder's mtime misses edits to files inside it
+    if (known and known.get('size') == stat.st_size
+            and known.get('mtime_ns') == stat.st_mtime_ns):
+        return dict(known)
+
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        # Folder inputs hash the sorted (relative path, content hash) list
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(os.path.relpath(file_path, path).encode())
+                digest.update(_hash_file(file_path)['sha256'].encode())
+    else:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest.hexdigest()}
+
+
+def _local_imports(path):
+    """Names of the modules in scripts/ that a Python file imports"""
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    def module(dotted):
+        # Scripts 28-35 and 42 import helpers as scripts.<module>
+        parts = dotted.split('.')
+        return parts[1] if parts[0] == 'scripts' and len(parts) > 1 else parts[0]
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(module(alias.name) for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            if node.module == 'scripts':
+                names.update(alias.name for alias in node.names)  # from scripts import x
+            else:
+                names.add(module(node.module))
+        elif (isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'lazy_import'
+                and node.args and isinstance(node.args[0], ast.Constant)
+                and isinstance(node.args[0].value, str)):
+            names.add(node.args[0].value.split('.')[0])
+    return {name for name in names
+            if os.path.isfile(os.path.join(SCRIPTS_DIR, name + '.py'))}
+
+
+def helper_modules(script):
+    """
+    Helper modules in scripts/ that a script depends on
+
+    Follows imports transitively, so a script importing fred_cache also
+    depends on whatever fred_cache imports. utils.py is fingerprinted for
+    every script and is not listed.
+
+    Parameters:
+    -----------
+    script : str
+        Script file name
+
+    Returns:
+    --------
+    list of str
+        Helper file names such as 'fred_cache.py', sorted
+    """
+    seen = set()
+    pending = [script]
+    while pending:
+        path = os.path.join(SCRIPTS_DIR, pending.pop())
+        for name in _local_imports(path):
+            helper = name + '.py'
+            if helper not in seen and helper != script:
+                seen.add(helper)
+                pending.append(helper)
+    seen.discard('utils.py')
+    return sorted(seen)
+
+
+def fingerprint(analysis, previous=None):
+    """
+    Fingerprint a script: hashes of itself, utils.py, the helper modules it
+    imports and its declared inputs, and whether figures are being built
+
+    Parameters:
+    -----------
+    analysis : dict
+        Pipeline entry
+    previous : dict, optional
+        Fingerprint recorded on the last run, used to skip re-hashing files
+        whose size and mtime are unchanged
+
+    Returns:
+    --------
+    dict
+        {'script': ..., 'utils': ..., 'helpers': {name: ...},
+        'inputs': {path: ...}, 'plots': bool} where each file value is a
+        record from _hash_file (None for missing inputs)
+    """
+    previous = previous or {}
+    previous_inputs = previous.get('inputs', {})
+    previous_helpers = previous.get('helpers', {})
+    return {
+        'script': _hash_file(os.path.join(SCRIPTS_DIR, analysis['script']),
+                             previous.get('script')),
+        'utils': _hash_file(UTILS_PATH, previous.get('utils')),
+        'helpers': {name: _hash_file(os.path.join(SCRIPTS_DIR, name),
+                                     previous_helpers.get(name))
+                    for name in helper_modules(analysis['script'])},
+        'inputs': {path: _hash_file(_resolve(path), previous_inputs.get(path))
+                   for path in analysis.get('inputs', [])},
+        'plots': plots_enabled()
+    }
+
+
+def _digest(record):
+    return record['sha256'] if record else None
+
+
+def rebuild_reasons(analysis, state, force=()):
+    """
+    Explain why a script needs to run; an empty list means it is up to date
+
+    Parameters:
+    -----------
+    analysis : dict
+        Pipeline entry
+    state : dict
+        Recorded fingerprints (see load_state)
+    force : collection of str
+        Scripts to rebuild regardless of their fingerprint
+
+    Returns:
+    --------
+    tuple of (list of str, dict)
+        Reasons to rebuild and the script's current fingerprint
+    """
+    script = analysis['script']
+    previous = state.get(script)
+    current = fingerprint(analysis, previous)
+
+    reasons = []
+    if script in force:
+        reasons.append('forced')
+    if analysis.get('always'):
+        reasons.append(ALWAYS_RUNS)
+    if previous is None:
+        reasons.append('no previous run')
+    else:
+        if _digest(current['script']) != _digest(previous.get('script')):
+            reasons.append('script changed')
+        if _digest(current['utils']) != _digest(previous.get('utils')):
+            reasons.append('utils.py changed')
+        previous_helpers = previous.get('helpers', {})
+        for name, record in current['helpers'].items():
+            if _digest(record) != _digest(previous_helpers.get(name)):
+                reasons.append(f"helper changed: {name}")
+        for path, record in current['inputs'].items():
+            if _digest(record) != _digest(previous.get('inputs', {}).get(path)):
+                reasons.append(f"input changed: {path}")
+        if current['plots'] and not previous.get('plots', True):
+            reasons.append('previous run skipped plots')
+    for path in analysis.get('outputs', []):
+        if not current['plots'] and path.endswith(FIGURE_EXTENSIONS):
+            continue
+        if not os.path.exists(_resolve(path)):
+            reasons.append(f"output missing: {path}")
+
+    return reasons, current
+
+
+def dry_run(analyses, state, force=()):
+    """
+    Print which scripts would be rebuilt, and why, without running anything
+
+    Scripts downstream of a rebuild are listed as well, since their inputs
+    may change when the upstream script runs.
+
+    Parameters:
+    -----------
+    analyses : list of dict
+        Selected pipeline entries
+    state : dict
+        Recorded fingerprints
+    force : collection of str
+        Scripts to rebuild regardless of their fingerprint
+
+    Returns:
+    --------
+    list of str
+        Scripts that would be rebuilt
+    """
+    dependencies = build_dependencies(analyses)
+    rebuild = []
+    print("DRY RUN: nothing will be executed\n")
+    for analysis in topological_order(analyses, dependencies):
+        script = analysis['script']
+        reasons, _ = rebuild_reasons(analysis, state, force)
+        upstream = sorted(dep for dep in dependencies[script] if dep in rebuild)
+        if upstream:
+            reasons.append(f"upstream rebuild: {', '.join(upstream)}")
+        if reasons == [ALWAYS_RUNS]:
+            print(f"  RUN         {script}  ({ALWAYS_RUNS}; dependents rebuild "
+                  f"only if its outputs change)")
+        elif reasons:
+            rebuild.append(script)
+            print(f"  REBUILD     {script}  ({'; '.join(reasons)})")
+        else:
+            print(f"  up to date  {script}")
+    print(f"\n{len(rebuild)}/{len(analyses)} scripts would run")
+    return rebuild
+
+
+def start_script(analysis, mode='subprocess'):
+    """
+    Launch a single analysis script without waiting for it
+
+    Output is captured to temporary files so concurrent scripts do not
+    interleave on the console.
+
+    Parameters:
+    -----------
+    analysis : dict
+        Pipeline entry
+    mode : str
+        'subprocess' starts a new interpreter; 'fork' forks this (prepared)
+        process and 'forkserver' forks the preloaded server (see
+        pipeline_worker.py)
+
+    Returns:
+    --------
+    dict
+        Job handle for poll_script/finish_script, or None if the script
+        could not be started
+    """
+    script_path = os.path.join(SCRIPTS_DIR, analysis['script'])
+    if not os.path.exists(script_path):
+        print(f"✗ ERROR: Script not found: {script_path}")
+        return None
+
+    stdout = tempfile.NamedTemporaryFile(mode='w+', suffix='.out')
+    stderr = tempfile.NamedTemporaryFile(mode='w+', suffix='.err')
+    stages = tempfile.NamedTemporaryFile(mode='w+', suffix='.stages')
+    env = {STAGE_LOG_ENV: stages.name}  # utils.stage() appends here
+    if mode != 'subprocess':
+        from pipeline_worker import ForkedAnalysis
+        process = ForkedAnalysis(analysis['script'], stdout, stderr, method=mode, env=env)
+    else:
+        command = [sys.executable, script_path]
+        if profile_modes():
+            command[1:1] = [os.path.join(SCRIPTS_DIR, 'profiling.py')]
+        process = subprocess.Popen(
+            command,
+            cwd=REPO_ROOT,  # Run from repo root
+            stdout=stdout,
+            stderr=stderr,
+            env=dict(os.environ, **env),
             text=True
         )
+    print(f"→ Started: {analysis['name']} ({analysis['script']})")
+
+    return {
+        'analysis': analysis,
+        'process': process,
+        'stdout': stdout,
+        'stderr': stderr,
+        'stages': stages,
+        'start': time.time()
+    }
+
+
+def poll_script(job):
+    """
+    Check whether a job has finished
+
+    Subprocesses are reaped with os.wait4 where available, so their CPU
+    time and peak RSS are kept in job['rusage'] (forked jobs report their
+    own usage, see pipeline_worker.ForkedAnalysis).
+
+    Returns:
+    --------
+    int or None
+        Exit code, or None while the script is still running
+    """
+    process = job['process']
+    if isinstance(process, subprocess.Popen) and hasattr(os, 'wait4') \
+            and process.returncode is None:
+        try:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        except ChildProcessError:
+            return process.poll()
+        if pid == 0:
+            return None
+        process.returncode = os.waitstatus_to_exitcode(status)
+        job['rusage'] = rusage
+    return process.poll()
+
+
+def output_bytes(analysis):
+    """Total size of a script's declared outputs on disk (folders walked)"""
+    total = 0
+    for output in analysis.get('outputs', []):
+        path = _resolve(output)
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        elif os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def _read_stages(stages_file):
+    """Stage records a script appended via utils.stage(), by stage name"""
+    stages_file.seek(0)
+    stages = {}
+    for line in stages_file:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # Partial line from a killed script
+        stages[record.pop('stage')] = record
+    stages_file.close()
+    return stages
+
+
+def finish_script(job):
+    """
+    Report a completed job and release its output files
 
-        # Print output
-        if result.stdout:
-            print(result.stdout)
+    Stores the job's measurements in job['metrics'].
 
-        print(f"✓ {description} completed successfully")
+    Parameters:
+    -----------
+    job : dict
+        Job handle returned by start_script
+
+    Returns:
+    --------
+    bool
+        True if the script exited successfully, False otherwise
+    """
+    analysis = job['analysis']
+    elapsed = time.time() - job['start']
+    job['stdout'].seek(0)
+    job['stderr'].seek(0)
+    stdout = job['stdout'].read()
+    stderr = job['stderr'].read()
+    job['stdout'].close()
+    job['stderr'].close()
+
+    job['metrics'] = {'wall_seconds': elapsed}
+    usage = getattr(job['process'], 'usage', None)
+    rusage = job.get('rusage')
+    if rusage is not None:
+        # ru_maxrss is in kilobytes on Linux, bytes on macOS
+        scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        usage = {'cpu_seconds': rusage.ru_utime + rusage.ru_stime,
+                 'peak_rss_mb': rusage.ru_maxrss / scale}
+    if usage:
+        job['metrics']['cpu_seconds'] = usage['cpu_seconds']
+        job['metrics']['peak_rss_mb'] = usage['peak_rss_mb']
+    job['metrics']['output_bytes'] = output_bytes(analysis)
+    stages = _read_stages(job['stages'])
+    if stages:
+        job['metrics']['stages'] = stages
+    startup = getattr(job['process'], 'startup', None)
+    if startup:
+        # What a fresh interpreter would have spent on imports and data,
+        # less what this fork took to start
+        saved = startup['preload'] - startup['latency']
+        job['metrics']['startup_saved_seconds'] = saved
+
+    print("\n" + "="*70)
+    print(f"FINISHED: {analysis['name']}")
+    resources = ''
+    if usage:
+        resources = f", {usage['cpu_seconds']:.1f}s CPU"
+        if usage['peak_rss_mb'] is not None:
+            resources += f", peak RSS {usage['peak_rss_mb']:.0f} MB"
+    print(f"Script: {analysis['script']} ({elapsed:.1f}s{resources})")
+    if startup:
+        print(f"Startup: {saved:.2f}s saved (fork took {startup['latency']:.3f}s)")
+    print("="*70)
+
+    if job['process'].returncode == 0:
+        if stdout:
+            print(stdout)
+        print(f"✓ {analysis['name']} completed successfully")
         return True
 
-    except subprocess.CalledProcessError as e:
-        print(f"✗ ERROR running {script_name}")
-        print(f"\nStdout:\n{e.stdout}")
-        print(f"\nStderr:\n{e.stderr}")
-        return False
+    print(f"✗ ERROR running {analysis['script']} (exit code {job['process'].returncode})")
+    print(f"\nStdout:\n{stdout}")
+    print(f"\nStderr:\n{stderr}")
+    return False
 
-    except FileNotFoundError:
-        print(f"✗ ERROR: Script not found: {script_path}")
-        return False
+
+def stored_outputs(analysis):
+    """Declared outputs that live under results/ (what the results store keeps)"""
+    return [path for path in analysis.get('outputs', [])
+            if path.startswith(results_store.RESULTS_DIR + '/')]
+
+
+def store_outputs(analysis, succeeded, released, store, manifest):
+    """
+    Update the results store after a script finishes
+
+    A successful script's outputs are ingested, and files it no longer
+    writes (released before it started, missing now) leave the manifest.
+    Figures are kept under --skip-plots, since the script did not try to
+    write them. A failed script's outputs may be partial, so nothing is
+    ingested and the files released for it leave the manifest as well.
+
+    Parameters:
+    -----------
+    analysis : dict
+        Pipeline entry
+    succeeded : bool
+        Whether the script finished successfully
+    released : list of str
+        Logical paths results_store.release() removed before the run
+    store : str
+        Results store link mode
+    manifest : dict
+        Current manifest
+
+    Returns:
+    --------
+    dict
+        The updated manifest
+    """
+    if not succeeded:
+        print(f"  Not stored: {len(released)} released output(s) dropped from the manifest")
+        return results_store.forget(released, manifest)
+    stored = results_store.ingest(stored_outputs(analysis), store, manifest)
+    gone = [path for path in released if not os.path.lexists(_resolve(path))
+            and (plots_enabled() or not path.endswith(FIGURE_EXTENSIONS))]
+    print(f"  Stored: {len(stored['new'])} new, {len(stored['deduplicated'])} "
+          f"deduplicated, {len(stored['unchanged'])} unchanged"
+          + (f", {len(gone)} no longer written" if gone else ''))
+    return results_store.forget(gone, stored['manifest'])
+
+
+def run_pipeline(analyses, jobs=None, continue_on_error=False, state=None,
+                 force=(), mode='subprocess', metrics=None, store=None):
+    """
+    Run analyses concurrently in dependency order
+
+    A script starts as soon as every script it depends on has succeeded and
+    a worker slot is free. When a script fails, everything downstream of it
+    is skipped; unless continue_on_error is set, no new scripts are started
+    and the pipeline stops once running scripts finish.
+
+    Parameters:
+    -----------
+    analyses : list of dict
+        Pipeline entries to run
+    jobs : int, optional
+        Maximum number of scripts running at once (default: CPU count)
+    continue_on_error : bool
+        Keep launching independent scripts after a failure
+    state : dict, optional
+        Recorded fingerprints (see load_state). When given, scripts that are
+        up to date are not run, and the state file is updated after each
+        script finishes. When None, every script runs.
+    force : collection of str
+        Scripts to rebuild regardless of their fingerprint
+    mode : str
+        How scripts are started: 'subprocess' (a fresh interpreter each),
+        'fork' (load the data once here and fork each script from this
+        process) or 'forkserver' (fork from a server preloaded with the
+        scientific stack and data); see pipeline_worker.py
+    metrics : dict, optional
+        Filled with per-script measurements: 'wall_seconds', 'cpu_seconds',
+        'peak_rss_mb', 'output_bytes', 'stages' (from utils.stage) and, for
+        forked modes, 'startup_saved_seconds'
+    store : str, optional
+        Results store link mode (see results_store.py). Each script's
+        outputs under results/ are released before it starts and, if it
+        succeeds, ingested into the store when it finishes (see
+        store_outputs)
+
+    Returns:
+    --------
+    list of tuple
+        (name, status) per analysis, where status is 'success', 'up-to-date',
+        'failed' or 'skipped'
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    dependencies = build_dependencies(analyses)
+    by_script = {analysis['script']: analysis for analysis in analyses}
+
+    if mode == 'fork':
+        import pipeline_worker
+        print("Loading shared data for in-process analyses...")
+        print(f"  ready in {pipeline_worker.prepare(analyses):.1f}s\n")
+    elif mode == 'forkserver':
+        import pipeline_worker
+        print("Starting preloaded forkserver...")
+        ready = pipeline_worker.start_forkserver(analyses)
+        print(f"  {ready['modules']} modules imported in {ready['imports']:.1f}s, "
+              f"data loaded in {ready['data']:.1f}s\n")
+
+    pending = [analysis['script'] for analysis in analyses]
+    running = []
+    status = {}
+    stopped = False
+    manifest = results_store.load_manifest() if store else None
+
+    while pending or running:
+        # Reap finished jobs
+        for job in [job for job in running if poll_script(job) is not None]:
+            running.remove(job)
+            script = job['analysis']['script']
+            status[script] = 'success' if finish_script(job) else 'failed'
+            if store:
+                manifest = store_outputs(job['analysis'], status[script] == 'success',
+                                         job['released'], store, manifest)
+            if metrics is not None:
+                metrics[script] = job['metrics']
+            if state is not None:
+                if status[script] == 'success':
+                    # Re-hash inputs the script itself refreshed (e.g. a
+                    # FRED series past its TTL), so the next run does not
+                    # see them as changed
+                    inputs = fingerprint(job['analysis'], job['fingerprint'])['inputs']
+                    state[script] = dict(job['fingerprint'], inputs=inputs)
+                else:
+                    state.pop(script, None)  # Outputs may be partial
+                save_state(state)
+            # Optional steps (descriptive, data quality) never stop the run
+            if status[script] == 'failed' and not continue_on_error \
+                    and job['analysis'].get('required', True):
+                print(f"\n✗ {job['analysis']['name']} failed. Stopping pipeline.")
+                if script == PIPELINE['census']['script']:
+                    print("  Use --skip-census to use existing data.")
+                stopped = True
+
+        # Skip anything downstream of a failure (repeat until stable)
+        changed = True
+        while changed:
+            changed = False
+            for script in list(pending):
+                if any(status.get(dep) in ('failed', 'skipped') for dep in dependencies[script]):
+                    pending.remove(script)
+                    status[script] = 'skipped'
+                    changed = True
+
+        if stopped:
+            for script in pending:
+                status[script] = 'skipped'
+            pending = []
+
+        # Launch ready scripts in declaration order
+        for script in list(pending):
+            if len(running) >= jobs:
+                break
+            if all(status.get(dep) in DONE for dep in dependencies[script]):
+                pending.remove(script)
+                current = None
+                if state is not None:
+                    # Fingerprint now, after upstream scripts have finished
+                    reasons, current = rebuild_reasons(by_script[script], state, force)
+                    if not reasons:
+                        status[script] = 'up-to-date'
+                        print(f"· Up to date: {by_script[script]['name']} ({script})")
+                        continue
+                released = []
+                if store:
+                    # Never let a script write through a link into the store
+                    released = results_store.release(stored_outputs(by_script[script]), manifest,
+                                                     keep=by_script[script].get('inputs', []))
+                job = start_script(by_script[script], mode=mode)
+                if job is None:
+                    status[script] = 'failed'
+                    stopped = stopped or not continue_on_error
+                    if store:
+                        manifest = results_store.forget(released, manifest)
+                else:
+                    job['fingerprint'] = current
+                    job['released'] = released
+                    running.append(job)
+
+        if running:
+            time.sleep(POLL_INTERVAL)
+
+    return [(analysis['name'], status[analysis['script']]) for analysis in analyses]
 
 
 def main():
@@ -192,80 +970,134 @@ def main():
     )
 
     parser.add_argument('--skip-census', action='store_true',
-                        help='Skip Census data fetching (use existing data)')
+                        help='Skip data fetching steps (use existing data)')
     parser.add_argument('--skip-plots', action='store_true',
-                        help='Skip plot generation (for testing)')
+                        help='Write CSVs only, build no figures (numeric regression runs)')
     parser.add_argument('--basic-only', action='store_true',
-                        help='Run only basic analyses (01-08)')
+                        help='Run only census, descriptive and basic analyses (00-08)')
     parser.add_argument('--advanced-only', action='store_true',
                         help='Run only advanced analyses (09-17)')
     parser.add_argument('--continue-on-error', action='store_true',
                         help='Continue running even if a script fails')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(),
+                        help='Maximum scripts running at once (default: CPU count)')
+    parser.add_argument('--force', action='append', default=[], metavar='SCRIPT',
+                        help="Rebuild SCRIPT even if up to date (repeatable; 'all' for everything)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Show what would be rebuilt and why, then exit')
+    parser.add_argument('--only', action='append', default=[], metavar='SPEC',
+                        help='Run only matching scripts, e.g. 18-27,51b (repeatable)')
+    parser.add_argument('--tag', action='append', default=[],
+                        help=f"Run only scripts with this tag ({', '.join(TAGS)})")
+    parser.add_argument('--list', action='store_true',
+                        help='List selected scripts with tags and dependencies, then exit')
+    parser.add_argument('--defer-figures', action='store_true',
+                        help='Queue figures and render them in parallel once the analyses finish')
+    parser.add_argument('--profile', metavar='MODE', default=None,
+                        help=f"Profile each script (cpu, mem, cpu,mem or all) into {PROFILE_DIR}/")
+    parser.add_argument('--store', nargs='?', const=results_store.DEFAULT_MODE,
+                        default=None, metavar='MODE',
+                        help='Keep results/ in the content-addressed store '
+                             f"({', '.join(results_store.LINK_MODES)}; "
+                             f"default {results_store.DEFAULT_MODE})")
+    parser.add_argument('--in-process', action='store_true',
+                        help='Load data once and fork each script from this process')
+    parser.add_argument('--forkserver', action='store_true',
+                        help='Fork each script from a server preloaded with the '
+                             'scientific stack and processed data')
 
     args = parser.parse_args()
 
+    unknown = set(','.join(args.tag).split(',')) - set(TAGS) - {''}
+    if unknown:
+        parser.error(f"unknown tag(s): {', '.join(sorted(unknown))}")
+    try:
+        analyses = select_analyses(args)
+        force = resolve_scripts(args.force, analyses)
+        profile = profile_modes(args.profile)
+        store = results_store.store_mode(args.store)
+    except ValueError as e:
+        parser.error(str(e))
+    if not analyses:
+        parser.error('no scripts match the selection')
+
+    if args.list:
+        list_analyses(analyses)
+        sys.exit(0)
+
+    if args.skip_plots:
+        # Inherited by every script, whichever way it is started
+        os.environ[SKIP_PLOTS_ENV] = '1'
+        install_plot_gate()
+    if store:
+        # figure_queue restores cached figures from the store
+        os.environ[results_store.STORE_ENV] = store
+    if profile:
+        # Read by profiling.py in subprocesses and by pipeline_worker in forks
+        os.environ[PROFILE_ENV] = ','.join(profile)
+        # An up-to-date script would not run, leaving nothing to profile
+        force = {a['script'] for a in analyses}
+    defer_figures = args.defer_figures and plots_enabled()
+    if defer_figures:
+        from figure_queue import DEFER_FIGURES_ENV
+        os.environ[DEFER_FIGURES_ENV] = '1'
+
     print("="*70)
     print("LA COUNTY OVERDOSE ANALYSIS PIPELINE")
     print("="*70)
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Parallel jobs: {args.jobs}")
+    print(f"Scripts selected: {len(analyses)}")
+    if not plots_enabled():
+        print(f"Plots: skipped ({SKIP_PLOTS_ENV} is set)")
+    elif defer_figures:
+        print("Plots: deferred to the render pool")
+    if profile:
+        print(f"Profiling: {', '.join(profile)} -> {PROFILE_DIR}/")
+    if store:
+        print(f"Results store: {results_store.STORE_DIR}/ ({store})")
     print()
 
-    results = []
-    failed_scripts = []
+    state = load_state()
 
-    # 1. Census data (if not skipped and not advanced-only)
-    if not args.skip_census and not args.advanced_only:
-        success = run_script(
-            PIPELINE['census']['script'],
-            PIPELINE['census']['name']
-        )
-        results.append((PIPELINE['census']['name'], success))
-        if not success:
-            failed_scripts.append(PIPELINE['census']['name'])
-            if not args.continue_on_error:
-                print("\n✗ Census data fetch failed. Stopping pipeline.")
-                print("  Use --skip-census to use existing data.")
-                sys.exit(1)
-
-    # 2. Descriptive statistics (if not advanced-only)
-    if not args.advanced_only:
-        success = run_script(
-            PIPELINE['descriptive']['script'],
-            PIPELINE['descriptive']['name']
-        )
-        results.append((PIPELINE['descriptive']['name'], success))
-        if not success:
-            failed_scripts.append(PIPELINE['descriptive']['name'])
+    if args.dry_run:
+        dry_run(analyses, state, force)
+        sys.exit(0)
 
-        success = run_script(
-            PIPELINE['data_quality']['script'],
-            PIPELINE['data_quality']['name']
-        )
-        results.append((PIPELINE['data_quality']['name'], success))
-        if not success:
-            failed_scripts.append(PIPELINE['data_quality']['name'])
-
-    # 3. Basic analyses (if not advanced-only)
-    if not args.advanced_only:
-        for analysis in PIPELINE['basic_analyses']:
-            success = run_script(analysis['script'], analysis['name'])
-            results.append((analysis['name'], success))
-            if not success:
-                failed_scripts.append(analysis['name'])
-                if not args.continue_on_error:
-                    print(f"\n✗ {analysis['name']} failed. Stopping pipeline.")
-                    sys.exit(1)
-
-    # 4. Advanced analyses (if not basic-only)
-    if not args.basic_only:
-        for analysis in PIPELINE['advanced_analyses']:
-            success = run_script(analysis['script'], analysis['name'])
-            results.append((analysis['name'], success))
-            if not success:
-                failed_scripts.append(analysis['name'])
-                if not args.continue_on_error:
-                    print(f"\n✗ {analysis['name']} failed. Stopping pipeline.")
-                    sys.exit(1)
+    mode = 'subprocess'
+    if args.in_process or args.forkserver:
+        from pipeline_worker import fork_supported
+        mode = 'forkserver' if args.forkserver else 'fork'
+        if not fork_supported(mode):
+            print(f"⚠ {mode} is not available here; running scripts as subprocesses\n")
+            mode = 'subprocess'
+
+    metrics = {}
+    started = time.time()
+    results = run_pipeline(analyses, jobs=args.jobs,
+                           continue_on_error=args.continue_on_error,
+                           state=state, force=force, mode=mode, metrics=metrics,
+                           store=store)
+    numeric_seconds = time.time() - started
+
+    figures = None
+    if defer_figures:
+        from figure_queue import render_queue, QUEUE_DIR
+        print("\n" + "="*70)
+        print("RENDERING DEFERRED FIGURES")
+        print("="*70)
+        figures = render_queue(jobs=args.jobs)
+
+    results_digest = None
+    if store:
+        # Store the deferred figures, and restore stored outputs successful
+        # scripts did not rewrite (figures under --skip-plots). Outputs of
+        # failed scripts stay out of the store.
+        ran = [a for a, (_, status) in zip(analyses, results) if status == 'success']
+        paths = [path for analysis in ran for path in stored_outputs(analysis)]
+        stored = results_store.ingest(paths, store)
+        results_store.restore(paths, store, stored['manifest'])
+        results_digest = stored['manifest']['digest']
 
     # Summary
     print("\n" + "="*70)
@@ -274,23 +1106,78 @@ def main():
     print(f"\nEnd time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
 
-    successful = sum(1 for _, success in results if success)
+    successful = sum(1 for _, status in results if status == 'success')
+    up_to_date = sum(1 for _, status in results if status == 'up-to-date')
+    failed_scripts = [name for name, status in results if status == 'failed']
+    skipped_scripts = [name for name, status in results if status == 'skipped']
     total = len(results)
 
     print(f"Completed: {successful}/{total} analyses")
+    if up_to_date:
+        print(f"Up to date (not rerun): {up_to_date}/{total} analyses")
     print()
 
     if failed_scripts:
         print("FAILED:")
         for script in failed_scripts:
             print(f"  ✗ {script}")
-    else:
+    if skipped_scripts:
+        print("SKIPPED:")
+        for script in skipped_scripts:
+            print(f"  - {script}")
+    if not failed_scripts and not skipped_scripts:
         print("✓ All analyses completed successfully!")
 
+    saved = {script: m['startup_saved_seconds'] for script, m in metrics.items()
+             if 'startup_saved_seconds' in m}
+    if saved:
+        print(f"\nSTARTUP TIME SAVED ({mode}):")
+        for script, seconds in saved.items():
+            print(f"  {script:<42} {seconds:6.2f}s")
+        print(f"  {'Total':<42} {sum(saved.values()):6.2f}s")
+
+    if figures is not None:
+        print(f"\nNumeric results ready after {numeric_seconds:.1f}s")
+        print(f"Figures: {len(figures['rendered'])} rendered in {figures['seconds']:.1f}s")
+        for output, _ in figures['failed']:
+            print(f"  ✗ {output} (spec kept in {QUEUE_DIR})")
+
+    # Performance history: this run's report, compared with earlier ones
+    previous = list_runs()
+    report = {
+        'timestamp': datetime.fromtimestamp(started).strftime('%Y%m%d-%H%M%S'),
+        'wall_seconds': time.time() - started,
+        'numeric_seconds': numeric_seconds,
+        'mode': mode,
+        'jobs': args.jobs,
+        'plots': plots_enabled(),
+        'profile': list(profile),
+        'results_digest': results_digest,
+        'scripts': {},
+    }
+    if figures is not None:
+        report['figures_seconds'] = figures['seconds']
+    for analysis, (_, status) in zip(analyses, results):
+        entry = {'status': status}
+        entry.update(metrics.get(analysis['script'], {}))
+        recorded = state.get(analysis['script'], {})
+        if status in DONE and recorded:
+            # Input digests, so a report diff can tell data refreshes apart
+            entry['inputs'] = {path: _digest(record)[:16] if record else None
+                               for path, record in recorded.get('inputs', {}).items()}
+        report['scripts'][analysis['script']] = entry
+    report_path = write_report(report)
+    print(f"\nRun report: {os.path.relpath(report_path, REPO_ROOT)}")
+    if previous:
+        # Each script against the last report in which it actually ran
+        print_comparison(baseline_report(previous, ran_scripts(report)), report,
+                         os.path.basename(previous[-1]))
+
     print("\n" + "="*70)
 
     # Exit with error code if any failed
-    sys.exit(0 if not failed_scripts else 1)
+    failed_figures = figures['failed'] if figures else []
+    sys.exit(0 if not failed_scripts and not failed_figures else 1)
 
 
 if __name__ == "__main__":
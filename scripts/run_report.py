@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+Pipeline Run Reports
+Per-run performance history written by run_all_analyses.py
+
+Every pipeline run writes results/_runs/<timestamp>.json with, for each
+script that ran, its wall time, CPU time, peak RSS and the bytes of its
+declared outputs, plus the stages it timed with utils.stage(). The runner
+prints the changes at the end of the run, comparing each script with the
+last report in which it actually ran (an incremental run skips most
+scripts); this script compares any two reports, so a slowdown after a
+data refresh can be traced to the script (and stage) that caused it.
+
+Usage:
+    python scripts/run_report.py                     # latest run vs earlier runs
+    python scripts/run_report.py OLD.json NEW.json
+    python scripts/run_report.py --list
+"""
+
+import os
+import sys
+import json
+import argparse
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+RUNS_DIR = os.path.join('results', '_runs')
+
+# Metrics compared between runs: (key, unit, minimum relative change,
+# minimum absolute change). Smaller differences are noise.
+COMPARED_METRICS = [
+    ('wall_seconds', 's', 0.10, 0.5),
+    ('cpu_seconds', 's', 0.10, 0.5),
+    ('peak_rss_mb', 'MB', 0.10, 20.0),
+    ('output_bytes', 'B', 0.05, 1024),
+]
+
+
+def runs_dir():
+    return os.path.join(REPO_ROOT, RUNS_DIR)
+
+
+def list_runs():
+    """Report paths, oldest first (timestamps sort chronologically)"""
+    directory = runs_dir()
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.endswith('.json')]
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_report(report):
+    """
+    Save a run report as results/_runs/<timestamp>.json
+
+    Parameters:
+    -----------
+    report : dict
+        Run report; report['timestamp'] (YYYYmmdd-HHMMSS) names the file
+
+    Returns:
+    --------
+    str
+        Path written
+    """
+    os.makedirs(runs_dir(), exist_ok=True)
+    path = os.path.join(runs_dir(), f"{report['timestamp']}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def baseline_report(paths, scripts=None):
+    """
+    Baseline for comparing a new run: each script's entry from the most
+    recent report in which it succeeded
+
+    Parameters:
+    -----------
+    paths : list of str
+        Earlier reports, oldest first (see list_runs)
+    scripts : collection of str, optional
+        Scripts to find a baseline for; reports are read, newest first,
+        until each has one (all reports if not given)
+
+    Returns:
+    --------
+    dict or None
+        A report with the run-level fields of the newest report and, per
+        script, its last successful entry with 'baseline' set to the
+        timestamp of the report it came from; None if paths is empty
+    """
+    baseline = None
+    for path in reversed(paths):
+        report = load_report(path)
+        if baseline is None:
+            baseline = dict(report, scripts={})
+        for script, entry in report.get('scripts', {}).items():
+            if entry.get('status') == 'success' and script not in baseline['scripts']:
+                baseline['scripts'][script] = dict(entry, baseline=report.get('timestamp'))
+        if scripts is not None and set(scripts) <= set(baseline['scripts']):
+            break
+    return baseline
+
+
+def _measurements(report):
+    """Flatten a report to {(script, stage or None): metrics} for finished scripts"""
+    rows = {}
+    for script, entry in report.get('scripts', {}).items():
+        if entry.get('status') != 'success':
+            continue
+        rows[(script, None)] = entry
+        for stage_name, stage_metrics in entry.get('stages', {}).items():
+            rows[(script, stage_name)] = stage_metrics
+    return rows
+
+
+def ran_scripts(report):
+    """Scripts that ran successfully in a report"""
+    return [script for script, entry in report.get('scripts', {}).items()
+            if entry.get('status') == 'success']
+
+
+def compare_reports(old, new):
+    """
+    Metrics that changed noticeably between two run reports
+
+    Only scripts (and stages) that succeeded in both runs are compared;
+    see COMPARED_METRICS for what counts as a change.
+
+    Parameters:
+    -----------
+    old, new : dict
+        Run reports
+
+    Returns:
+    --------
+    list of dict
+        {'script', 'stage', 'metric', 'unit', 'old', 'new', 'change'} with
+        change the relative difference, largest first
+    """
+    before = _measurements(old)
+    after = _measurements(new)
+    changes = []
+    for key in sorted(set(before) & set(after), key=lambda k: (k[0], k[1] or '')):
+        for metric, unit, relative, absolute in COMPARED_METRICS:
+            a, b = before[key].get(metric), after[key].get(metric)
+            if a is None or b is None or abs(b - a) < absolute:
+                continue
+            change = (b - a) / a if a else float('inf')
+            if abs(change) >= relative:
+                changes.append({'script': key[0], 'stage': key[1], 'metric': metric,
+                                'unit': unit, 'old': a, 'new': b, 'change': change})
+    changes.sort(key=lambda c: -abs(c['change']))
+    return changes
+
+
+def _format(value, unit):
+    if unit == 'B':
+        for unit in ('B', 'KB', 'MB', 'GB'):
+            if abs(value) < 1024 or unit == 'GB':
+                return f"{value:.0f}{unit}" if unit == 'B' else f"{value:.1f}{unit}"
+            value /= 1024
+    if unit == 'MB':
+        return f"{value:.0f}MB"
+    return f"{value:.2f}{unit}"
+
+
+def print_comparison(old, new, label=None):
+    """
+    Print the changes from run report old to new
+
+    Returns:
+    --------
+    list of dict
+        The changes (see compare_reports)
+    """
+    changes = compare_reports(old, new)
+    label = label or old.get('timestamp', 'previous run')
+    print(f"\nCHANGES SINCE {label}:")
+    for key, what in (('mode', 'worker mode'), ('plots', 'plots setting'), ('profile', 'profiling')):
+        if old.get(key) != new.get(key):
+            print(f"  (different {what}: {old.get(key)} -> {new.get(key)}; timings not like for like)")
+    if old.get('results_digest') and new.get('results_digest'):
+        # Manifest digests from the results store: equal means identical outputs
+        same = old['results_digest'] == new['results_digest']
+        print(f"  Results: {'identical' if same else 'changed'} "
+              f"(manifest {old['results_digest'][:12]} -> {new['results_digest'][:12]})")
+    if not changes:
+        print("  No notable changes in time, memory or output size")
+        return changes
+
+    # Scripts whose inputs (data files, upstream outputs) changed
+    refreshed = {script for script, entry in new.get('scripts', {}).items()
+                 if entry.get('inputs') != old.get('scripts', {}).get(script, {}).get('inputs')}
+    for c in changes:
+        name = c['script'] + (f" [{c['stage']}]" if c['stage'] else '')
+        if c['script'] in refreshed:
+            name += ' *'
+        marker = '▲' if c['change'] > 0 else '▼'
+        change = f"{c['change']:+.0%}" if c['old'] else 'new'
+        since = old['scripts'][c['script']].get('baseline')
+        if since and since != old.get('timestamp'):
+            change += f", vs {since}"
+        print(f"  {marker} {name:<50} {c['metric']:<13} "
+              f"{_format(c['old'], c['unit']):>9} -> {_format(c['new'], c['unit']):>9} ({change})")
+    if refreshed & {c['script'] for c in changes}:
+        print("  * inputs changed since the previous run")
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare pipeline run reports')
+    parser.add_argument('reports', nargs='*',
+                        help='Two reports to compare (default: the latest run against '
+                             'the last run of each of its scripts)')
+    parser.add_argument('--list', action='store_true',
+                        help='List recorded runs with their wall time')
+    args = parser.parse_args()
+
+    runs = list_runs()
+    if args.list:
+        for path in runs:
+            report = load_report(path)
+            ran = sum(1 for e in report.get('scripts', {}).values() if e.get('status') == 'success')
+            print(f"{os.path.basename(path):<24} {report.get('wall_seconds', 0):8.1f}s  "
+                  f"{ran} script(s) run  mode={report.get('mode')}")
+        return
+
+    if args.reports and len(args.reports) != 2:
+        parser.error('give two reports, or none to compare the latest run with earlier runs')
+    paths = args.reports or runs[-2:]
+    if len(paths) < 2:
+        print(f"✗ Need two run reports to compare ({len(runs)} in {RUNS_DIR})")
+        sys.exit(1)
+    new = load_report(paths[1])
+    if args.reports:
+        old = load_report(paths[0])
+    else:
+        old = baseline_report(runs[:-1], ran_scripts(new))
+    print(f"Comparing {os.path.basename(paths[0])} -> {os.path.basename(paths[1])}")
+    print_comparison(old, new, os.path.basename(paths[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,15 @@ Shared utility functions for data processing across all scripts
 Standardizes race/ethnicity recoding, age grouping, substance columns, etc.
 """
 
+import os
+import sys
+import contextlib
+import glob
+import json
+import hashlib
+import importlib
+import time
+
 import pandas as pd
 import numpy as np
 
@@ -19,42 +28,621 @@ SUBSTANCE_COLS = [
 # Race/ethnicity categories
 RACE_CATEGORIES = ['WHITE', 'LATINE', 'BLACK', 'ASIAN', 'OTHER', 'UNKNOWN']
 
+# Race recoding rules as (category, exact raw values, regex) in priority
+# order; the first matching rule wins and unmatched values become OTHER.
+# None in the exact values matches missing race.
+RACE_RULES = [
+    ('WHITE', ["CAUCASIAN", "WHITE", "White/Caucasian"], None),
+    ('LATINE', ["LATINE", "HISPANIC/LATIN AMERICAN", "Hispanic/Latino"], "Hispanic"),
+    ('BLACK', ["BLACK", "Black"], None),
+    ('ASIAN', ["ASIAN", "Asian", "CHINESE", "FILIPINO", "JAPANESE",
+               "KOREAN", "VIETNAMESE", "THAI", "CAMBODIAN"], None),
+    ('LATINE', [], r"White.*Hispanic|Hispanic.*White"),
+    ('ASIAN', [], r"White.*Asian|Asian.*White"),
+    ('LATINE', [], r"Black.*Hispanic|Hispanic.*Black"),
+    ('ASIAN', [], r"Black.*Asian|Asian.*Black"),
+    ('UNKNOWN', ["UNKNOWN", "Unknown/Other", None], None),
+]
+
+# Four-group recode used by the early analyses (03, 09, 10, 11): no mixed
+# race or UNKNOWN rules, and everything else (including missing) is OTHER
+MAJOR_RACE_RULES = [
+    ('WHITE', ["CAUCASIAN", "WHITE", "White/Caucasian"], None),
+    ('LATINE', ["LATINE", "HISPANIC/LATIN AMERICAN", "Hispanic/Latino"], "Hispanic"),
+    ('BLACK', ["BLACK", "Black"], None),
+    ('ASIAN', ["ASIAN", "Asian", "CHINESE", "FILIPINO", "JAPANESE",
+               "KOREAN", "VIETNAMESE"], None),
+]
+
 # Standard year range for analyses
 YEAR_START = 2012
 YEAR_END = 2023
 
-def load_overdose_data(file_path='data/2012-01-2024-08-overdoses.csv'):
+# Compact dtypes applied to the overdose extract at load time. Substance
+# flags are int8, and groupby/pivot sums keep that dtype, so upcast them with
+# .astype('int64') before aggregating. Race, Gender and ResidenceType are
+# categoricals: group them with observed=True so unobserved categories do not
+# show up as zero rows. Coordinates keep float64 for the spatial statistics.
+OVERDOSE_SCHEMA = {
+    **{col: 'int8' for col in SUBSTANCE_COLS},
+    'Race': 'category',
+    'Gender': 'category',
+    'ResidenceType': 'category',
+    'ZIPCODE': 'Int32',
+}
+
+# Named column subsets for load_overdose_data(profile=...). The date columns
+# are always read since load_overdose_data derives 'Date of Death' and 'Year'.
+DATE_COLS = ['DeathDate', 'DateofDeath']
+COLUMN_PROFILES = {
+    'temporal': DATE_COLS,
+    'spatial': DATE_COLS + ['lat', 'lon', 'ZIPCODE', 'DeathZip'],
+    'substance': DATE_COLS + SUBSTANCE_COLS,
+    'demographic': DATE_COLS + ['Age', 'Race', 'Gender', 'ResidenceType'],
+}
+
+# LA County ZIP/ZCTA range used to validate normalized ZIP codes
+LA_ZIP_MIN = 90001
+LA_ZIP_MAX = 93599
+
+# Formats tried, in order, against the unique raw date strings. Strings that
+# match none of them fall back to per-value inference.
+DATE_FORMATS = [
+    '%m/%d/%Y', '%Y-%m-%d', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %I:%M:%S %p', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+    '%m/%d/%y',
+]
+
+# Columnar cache for the raw extract (set EPI_NO_CACHE=1 to disable)
+CACHE_DIRNAME = '.cache'
+
+
+def file_sha256(file_path, chunk_size=1 << 20, memo=True):
     """
-    Load and perform basic processing on overdose data
+    Content hash of a file, memoized on (size, mtime) in the cache directory
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the file to hash
+    chunk_size : int
+        Bytes read per iteration
+    memo : bool
+        Whether to reuse/store the digest next to the file's cache
+
+    Returns:
+    --------
+    str
+        Hex SHA-256 digest of the file contents
+    """
+    stat = os.stat(file_path)
+    memo_path = os.path.join(_cache_dir(file_path),
+                             os.path.basename(file_path) + '.sha256.json')
+    if memo:
+        try:
+            with open(memo_path) as f:
+                cached = json.load(f)
+            if (cached['size'] == stat.st_size
+                    and cached['mtime_ns'] == stat.st_mtime_ns):
+                return cached['sha256']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    sha = digest.hexdigest()
+    if not memo:
+        return sha
+
+    try:
+        os.makedirs(os.path.dirname(memo_path), exist_ok=True)
+        with open(memo_path, 'w') as f:
+            json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                       'sha256': sha}, f)
+    except OSError:
+        pass
+
+    return sha
+
+
+def _cache_dir(file_path):
+    """Cache directory for a source file (EPI_CACHE_DIR overrides)"""
+    return os.environ.get('EPI_CACHE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(file_path)), CACHE_DIRNAME
+    )
+
+
+def _cache_enabled():
+    if os.environ.get('EPI_NO_CACHE', '').strip() not in ('', '0'):
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _write_cache(df, cache_path, stale_pattern=None, index=False):
+    """Atomically write a Parquet cache file and prune stale siblings"""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=index)
+        os.replace(tmp_path, cache_path)
+        if stale_pattern:
+            for stale in glob.glob(stale_pattern):
+                if stale != cache_path:
+                    os.remove(stale)
+    except Exception as e:
+        # Cache is an optimization only; never fail the load because of it
+        print(f"  (cache not written: {e})")
+
+
+def _project(df, columns):
+    if columns is None:
+        return df
+    return df[[c for c in df.columns if c in columns]]
+
+
+def read_raw_overdose_data(file_path='data/2012-01-2024-08-overdoses.csv',
+                           use_cache=True, columns=None):
+    """
+    Read the raw overdose extract, via a Parquet cache keyed by content hash
+
+    The first read of a given extract parses the CSV and writes
+    <cache>/<name>-raw-<sha16>.parquet; later reads memory-map that file.
+    A changed extract hashes to a new key and stale caches are removed.
 
     Parameters:
     -----------
     file_path : str
         Path to the CSV file
+    use_cache : bool
+        Whether to read/write the columnar cache (requires pyarrow)
+    columns : list
+        Only read these columns (names absent from the extract are ignored)
 
     Returns:
     --------
     pd.DataFrame
-        Loaded dataframe with basic date processing
+        Raw dataframe, identical to pd.read_csv(file_path, low_memory=False)
     """
+    if columns is not None:
+        columns = set(columns)
+
+    if not (use_cache and _cache_enabled()):
+        usecols = (lambda c: c in columns) if columns is not None else None
+        return pd.read_csv(file_path, low_memory=False, usecols=usecols)
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    cache_dir = _cache_dir(file_path)
+    cache_path = os.path.join(
+        cache_dir, f"{stem}-raw-{file_sha256(file_path)[:16]}.parquet"
+    )
+
+    if os.path.exists(cache_path):
+        if columns is None:
+            return pd.read_parquet(cache_path, memory_map=True)
+        import pyarrow.parquet as pq
+        available = pq.read_schema(cache_path).names
+        return pd.read_parquet(cache_path, memory_map=True,
+                               columns=[c for c in available if c in columns])
+
+    # Build the full cache once so later projections can be served from it
     df = pd.read_csv(file_path, low_memory=False)
+    _write_cache(df, cache_path,
+                 stale_pattern=os.path.join(cache_dir, f"{stem}-raw-*.parquet"))
+
+    return _project(df, columns)
 
-    # Process dates
-    df['Date of Death'] = pd.to_datetime(df['DeathDate'], errors='coerce')
-    if 'DateofDeath' in df.columns:
-        df['Date of Death'] = df['Date of Death'].fillna(
-            pd.to_datetime(df['DateofDeath'], errors='coerce')
-        )
 
-    df['Year'] = df['Date of Death'].dt.year
+def parse_date_column(values):
+    """
+    Parse a raw date column over its unique values
+
+    Each format in DATE_FORMATS is applied in one vectorized pass to the
+    unique strings not yet parsed; the results are mapped back to rows by
+    factorized codes. Unparseable values become NaT.
+
+    Parameters:
+    -----------
+    values : pd.Series
+        Raw date column
+
+    Returns:
+    --------
+    pd.Series
+        datetime64 series aligned with `values`
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, errors='coerce')
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Index(uniques).astype(str).str.strip().to_numpy(dtype=object)
+
+    parsed = np.full(len(uniques), np.datetime64('NaT'), dtype='datetime64[ns]')
+    remaining = np.ones(len(uniques), dtype=bool)
+
+    for fmt in DATE_FORMATS:
+        idx = np.flatnonzero(remaining)
+        if len(idx) == 0:
+            break
+        attempt = pd.to_datetime(uniques[idx], format=fmt, errors='coerce')
+        attempt = np.asarray(attempt, dtype='datetime64[ns]')
+        ok = ~np.isnat(attempt)
+        parsed[idx[ok]] = attempt[ok]
+        remaining[idx[ok]] = False
+
+    for i in np.flatnonzero(remaining):
+        value = pd.to_datetime(uniques[i], errors='coerce')
+        if not pd.isna(value):
+            parsed[i] = np.datetime64(value, 'ns')
+
+    result = np.where(codes >= 0, parsed[codes], np.datetime64('NaT'))
+    return pd.Series(result, index=values.index, dtype='datetime64[ns]')
+
+
+def normalize_dates(df, date_cols=None, output_col='Date of Death',
+                    source_col='Date_Source'):
+    """
+    Combine the raw date columns into a single parsed date
+
+    The first column in `date_cols` takes precedence; later columns only
+    fill rows where earlier ones are missing or unparseable. The column
+    each date was taken from is recorded in `source_col`.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe
+    date_cols : list
+        Raw date columns in order of precedence (defaults to DATE_COLS)
+    output_col : str
+        Name of the parsed date column
+    source_col : str
+        Name of the categorical column recording each date's source
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with parsed date and date source columns
+    """
+    if date_cols is None:
+        date_cols = DATE_COLS
+
+    date = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+    source = np.full(len(df), None, dtype=object)
+
+    for col in date_cols:
+        if col not in df.columns:
+            continue
+        parsed = parse_date_column(df[col])
+        fill = (date.isna() & parsed.notna()).to_numpy()
+        date = date.where(~fill, parsed)
+        source[fill] = col
+
+    df[output_col] = date
+    df[source_col] = pd.Categorical(source, categories=date_cols)
 
     return df
 
 
-def standardize_race(df, race_col='Race', output_col='Race_Ethnicity_Cleaned'):
+def normalize_zip(df, zip_col='DeathZip', output_col='ZIP', valid_col='ZIP_Valid'):
+    """
+    Normalize a raw ZIP column to integer ZIP codes
+
+    Raw values such as "90001", 90001.0 or "90001, 90002" (first ZIP is
+    kept) are parsed once per distinct value and mapped back to rows by
+    codes. ZIPs within LA_ZIP_MIN..LA_ZIP_MAX are flagged as valid.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe
+    zip_col : str
+        Name of the raw ZIP column ('DeathZip' or 'ZIPCODE')
+    output_col : str
+        Name of the nullable Int32 ZIP column
+    valid_col : str
+        Name of the boolean LA County validity column
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with normalized ZIP and validity columns
+    """
+    values = df[zip_col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+
+    if pd.api.types.is_numeric_dtype(uniques):
+        parsed = np.trunc(pd.Series(uniques, dtype='float64'))
+    else:
+        parsed = (pd.Series(uniques, dtype=object).astype(str)
+                  .str.split(',').str[0].str.strip().str.split('.').str[0])
+        parsed = pd.to_numeric(parsed, errors='coerce')
+    parsed = parsed.where(parsed.abs() < 2**31)
+
+    # Position -1 (missing raw value) maps to NA
+    table = pd.array(list(parsed.astype('Int64')) + [None], dtype='Int32')
+    zips = table.take(codes)
+
+    df[output_col] = pd.Series(zips, index=df.index)
+    df[valid_col] = ((zips >= LA_ZIP_MIN) & (zips <= LA_ZIP_MAX)).fillna(False).to_numpy(dtype=bool)
+
+    return df
+
+
+def _frame_megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def apply_schema(df, schema=None, report=False):
+    """
+    Cast columns to the compact dtypes declared in OVERDOSE_SCHEMA
+
+    Columns that are missing, or whose values do not fit the target dtype
+    (e.g. flags with NaN or values outside the integer range), are left
+    unchanged.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe
+    schema : dict
+        Column -> dtype mapping (defaults to OVERDOSE_SCHEMA)
+    report : bool
+        Print memory usage before and after
+
+    Returns:
+    --------
+    pd.DataFrame
+        Dataframe with compact dtypes
+    """
+    if schema is None:
+        schema = OVERDOSE_SCHEMA
+
+    before = _frame_megabytes(df) if report else None
+
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        values = df[col]
+        if dtype == 'category':
+            df[col] = values.astype('category')
+        elif not pd.api.types.is_numeric_dtype(values):
+            continue
+        elif dtype in ('float32', 'float64'):
+            df[col] = values.astype(dtype)
+        else:
+            info = np.iinfo(dtype.lower())
+            nullable = dtype[0].isupper()
+            if values.isna().any() and not nullable:
+                continue
+            present = values.dropna()
+            if ((present % 1 != 0).any() or (present < info.min).any()
+                    or (present > info.max).any()):
+                continue
+            df[col] = values.astype(dtype)
+
+    if report:
+        after = _frame_megabytes(df)
+        print(f"  Memory: {before:.1f} MB -> {after:.1f} MB "
+              f"({len(df):,} rows, compact dtypes)")
+
+    return df
+
+
+# In-memory frames shared across analyses run in one interpreter (see
+# pipeline_worker.py); off unless enable_frame_sharing() is called
+_SHARED_FRAMES = {}
+_SHARING = {'enabled': False}
+
+
+def enable_frame_sharing(enabled=True):
+    """
+    Keep loaded frames in memory and hand out copies on repeat calls
+
+    With sharing on, load_overdose_data and full_data_processing return a
+    copy of the frame built by the first call with the same arguments, so
+    analyses run in the same process (or forked from it) skip the read and
+    preprocessing. Each caller gets its own copy, so in-place edits never
+    leak between analyses.
+
+    Parameters:
+    -----------
+    enabled : bool
+        Turn sharing on or off; turning it off drops the shared frames
+    """
+    _SHARING['enabled'] = enabled
+    if not enabled:
+        _SHARED_FRAMES.clear()
+
+
+def shared_frame_keys():
+    """Keys of the frames currently held for sharing"""
+    return list(_SHARED_FRAMES)
+
+
+def _copy_on_write():
+    """True if pandas defers copies until a frame is modified"""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return bool(pd.get_option('mode.copy_on_write'))
+    except (KeyError, ValueError):
+        return False
+
+
+def enable_copy_on_write():
+    """
+    Turn on pandas copy-on-write for this process (and processes forked
+    from it)
+
+    With it on, _shared hands out shallow copies, so a forked child only
+    duplicates the pages of a shared frame that it actually modifies.
+
+    Returns:
+    --------
+    bool
+        True if copy-on-write is now on (False on pandas without the option)
+    """
+    if not _copy_on_write():
+        try:
+            pd.set_option('mode.copy_on_write', True)
+        except (KeyError, ValueError):
+            return False
+    return True
+
+
+def _shared(key, build):
+    """Return a private copy of the shared frame for key, building it once"""
+    if not _SHARING['enabled']:
+        return build()
+    if key not in _SHARED_FRAMES:
+        _SHARED_FRAMES[key] = build()
+    # Under copy-on-write a shallow copy is already private to the caller
+    return _SHARED_FRAMES[key].copy(deep=not _copy_on_write())
+
+
+def load_overdose_data(file_path='data/2012-01-2024-08-overdoses.csv',
+                       use_cache=True, compact=True, report_memory=False,
+                       columns=None, profile=None):
+    """
+    Load and perform basic processing on overdose data
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file
+    use_cache : bool
+        Whether to use the columnar cache (see read_raw_overdose_data)
+    compact : bool
+        Whether to apply OVERDOSE_SCHEMA dtypes
+    report_memory : bool
+        Print memory usage before and after applying the schema
+    columns : list
+        Only load these columns (date columns are always included)
+    profile : str or list
+        Name(s) from COLUMN_PROFILES to load, combined with `columns`
+
+    Returns:
+    --------
+    pd.DataFrame
+        Loaded dataframe with basic date processing
+    """
+    wanted = None
+    if columns is not None or profile is not None:
+        wanted = set(DATE_COLS) | set(columns or [])
+        profiles = [profile] if isinstance(profile, str) else (profile or [])
+        for name in profiles:
+            if name not in COLUMN_PROFILES:
+                raise ValueError(f"Unknown column profile: {name!r} "
+                                 f"(expected one of {sorted(COLUMN_PROFILES)})")
+            wanted |= set(COLUMN_PROFILES[name])
+
+    def build():
+        df = read_raw_overdose_data(file_path, use_cache=use_cache, columns=wanted)
+
+        if compact:
+            df = apply_schema(df, report=report_memory)
+
+        # Process dates
+        df = normalize_dates(df)
+
+        df['Year'] = df['Date of Death'].dt.year
+
+        return df
+
+    if report_memory:
+        return build()
+    key = ('load', os.path.abspath(file_path), use_cache, compact,
+           tuple(sorted(wanted)) if wanted is not None else None)
+
+    # A projection can be cut from a shared full frame instead of re-read
+    full = _SHARED_FRAMES.get(key[:-1] + (None,))
+    if wanted is not None and full is not None and key not in _SHARED_FRAMES:
+        derived = {'Date of Death', 'Date_Source', 'Year'}
+        keep = [c for c in full.columns if c in wanted or c in derived]
+        return _shared(key, lambda: full[keep].copy())
+
+    return _shared(key, build)
+
+
+# Raw value -> category lookups, one per rule set (keyed by the rules
+# themselves, so edited rules never reuse a stale lookup)
+_RACE_LOOKUPS = {}
+
+
+def _race_lookup(rules):
+    return _RACE_LOOKUPS.setdefault(repr(rules), {})
+
+
+def _apply_race_rules(values, rules):
+    """Evaluate `rules` over a (small) series of raw values"""
+    conditions = []
+    for _, exact, pattern in rules:
+        condition = values.isin([v for v in exact if v is not None])
+        if pattern is not None:
+            condition |= values.str.contains(pattern, na=False, case=True)
+        if None in exact:
+            condition |= values.isna()
+        conditions.append(condition)
+    choices = [category for category, _, _ in rules]
+    return np.select(conditions, choices, default="OTHER")
+
+
+def race_lookup_table(values=None, rules=None):
+    """
+    Lookup table from raw race values to standardized categories
+
+    Parameters:
+    -----------
+    values : iterable
+        Raw values to include (defaults to every value looked up so far)
+    rules : list
+        Recoding rules (defaults to RACE_RULES)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns 'Race' (raw) and 'Race_Ethnicity_Cleaned'
+    """
+    if rules is None:
+        rules = RACE_RULES
+    lookup = _race_lookup(rules)
+
+    if values is not None:
+        values = pd.unique(pd.Series(list(values), dtype=object).dropna())
+        missing = [v for v in values if v not in lookup]
+        if missing:
+            mapped = _apply_race_rules(pd.Series(missing, dtype=object), rules)
+            lookup.update(zip(missing, mapped))
+        keys = list(values)
+    else:
+        keys = sorted(lookup, key=str)
+
+    return pd.DataFrame({
+        'Race': keys,
+        'Race_Ethnicity_Cleaned': [lookup[k] for k in keys]
+    })
+
+
+def standardize_race(df, race_col='Race', output_col='Race_Ethnicity_Cleaned',
+                     rules=None, as_category=True):
     """
     Standardize race/ethnicity categories
 
+    Rules are evaluated once per distinct raw value (see race_lookup_table)
+    and applied to rows with a single take over the value codes.
+
     Parameters:
     -----------
     df : pd.DataFrame
@@ -63,39 +651,38 @@ def standardize_race(df, race_col='Race', output_col='Race_Ethnicity_Cleaned'):
         Name of the race column to process
     output_col : str
         Name of the output column
+    rules : list
+        Recoding rules (defaults to RACE_RULES; see MAJOR_RACE_RULES)
+    as_category : bool
+        Return an ordered categorical over RACE_CATEGORIES instead of strings
 
     Returns:
     --------
     pd.DataFrame
         Dataframe with standardized race column
     """
-    conditions = [
-        df[race_col].isin(["CAUCASIAN", "WHITE", "White/Caucasian"]),
-        df[race_col].isin(["LATINE", "HISPANIC/LATIN AMERICAN", "Hispanic/Latino"]) |
-            df[race_col].str.contains("Hispanic", na=False),
-        df[race_col].isin(["BLACK", "Black"]),
-        df[race_col].isin(["ASIAN", "Asian", "CHINESE", "FILIPINO", "JAPANESE",
-                           "KOREAN", "VIETNAMESE", "THAI", "CAMBODIAN"]),
-        df[race_col].str.contains(r"White.*Hispanic|Hispanic.*White", na=False, case=True),
-        df[race_col].str.contains(r"White.*Asian|Asian.*White", na=False, case=True),
-        df[race_col].str.contains(r"Black.*Hispanic|Hispanic.*Black", na=False, case=True),
-        df[race_col].str.contains(r"Black.*Asian|Asian.*Black", na=False, case=True),
-        df[race_col].isin(["UNKNOWN", "Unknown/Other"]) | df[race_col].isna()
-    ]
-
-    choices = [
-        "WHITE", "LATINE", "BLACK", "ASIAN",
-        "LATINE", "ASIAN", "LATINE", "ASIAN", "UNKNOWN"
-    ]
-
-    df[output_col] = np.select(conditions, choices, default="OTHER")
-
-    # Set as categorical
-    df[output_col] = pd.Categorical(
-        df[output_col],
-        categories=RACE_CATEGORIES,
-        ordered=True
-    )
+    if rules is None:
+        rules = RACE_RULES
+
+    values = df[race_col]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+
+    # Position -1 (missing) takes the category of the rule matching None
+    table = race_lookup_table(uniques, rules)['Race_Ethnicity_Cleaned'].to_numpy()
+    missing = _apply_race_rules(pd.Series([None], dtype=object), rules)[0]
+    table = np.append(table, missing).astype(object)
+
+    if as_category:
+        table_codes = pd.Categorical(table, categories=RACE_CATEGORIES).codes
+        df[output_col] = pd.Categorical.from_codes(
+            table_codes[codes], categories=RACE_CATEGORIES, ordered=True
+        )
+    else:
+        df[output_col] = table[codes]
 
     return df
 
@@ -185,40 +772,138 @@ def filter_to_study_period(df, year_col='Year', start=YEAR_START, end=YEAR_END):
     return df[df[year_col].between(start, end)].copy()
 
 
+# Processed-frame cache statistics for this interpreter
+_CACHE_STATS = {'hits': 0, 'misses': 0, 'build_seconds': 0.0}
+
+
+def _processed_cache_path(file_path, filter_years):
+    """
+    Cache file for full_data_processing output and a glob for its stale
+    versions (same extract name and year window, different data/code key)
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    source_key = file_sha256(file_path)[:12]
+    code_key = file_sha256(os.path.abspath(__file__), memo=False)[:12]
+    years = f"{YEAR_START}-{YEAR_END}" if filter_years else "all"
+    cache_dir = _cache_dir(file_path)
+    return (
+        os.path.join(cache_dir,
+                     f"{stem}-processed-{source_key}{code_key}-{years}.parquet"),
+        os.path.join(cache_dir, f"{stem}-processed-*-{years}.parquet")
+    )
+
+
+def invalidate_cache(file_path='data/2012-01-2024-08-overdoses.csv',
+                     kind='all'):
+    """
+    Remove cached frames for an overdose extract
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the CSV file whose caches should be removed
+    kind : str
+        'raw', 'processed', or 'all'
+
+    Returns:
+    --------
+    list
+        Paths of the removed cache files
+    """
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    kinds = ['raw', 'processed'] if kind == 'all' else [kind]
+    removed = []
+    for k in kinds:
+        pattern = os.path.join(_cache_dir(file_path), f"{stem}-{k}-*.parquet")
+        for path in glob.glob(pattern):
+            os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def cache_stats():
+    """Processed-frame cache hits, misses and build time so far"""
+    return dict(_CACHE_STATS)
+
+
+def print_cache_stats():
+    """Print processed-frame cache hits, misses and build time"""
+    stats = cache_stats()
+    print(f"Data cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+          f"{stats['build_seconds']:.2f}s building")
+
+
 def full_data_processing(file_path='data/2012-01-2024-08-overdoses.csv',
-                         filter_years=True):
+                         filter_years=True, use_cache=True, rebuild=False):
     """
     Perform complete standard data processing pipeline
 
+    The processed frame is cached as Parquet, keyed by the extract's
+    content hash, the hash of this module, filter_years and the study
+    period, so derived columns are computed once per data/code version.
+
     Parameters:
     -----------
     file_path : str
         Path to the CSV file
     filter_years : bool
         Whether to filter to standard study period (2012-2023)
+    use_cache : bool
+        Whether to read/write the processed-frame cache (requires pyarrow)
+    rebuild : bool
+        Recompute and overwrite the cached frame even if it is current
 
     Returns:
     --------
     pd.DataFrame
         Fully processed dataframe
     """
-    # Load data
-    df = load_overdose_data(file_path)
+    def build():
+        cache_path = None
+        if use_cache and _cache_enabled():
+            cache_path, stale_pattern = _processed_cache_path(file_path, filter_years)
+            if not rebuild and os.path.exists(cache_path):
+                _CACHE_STATS['hits'] += 1
+                if os.environ.get('EPI_CACHE_VERBOSE'):
+                    print(f"  (data cache hit: {os.path.basename(cache_path)})")
+                return pd.read_parquet(cache_path, memory_map=True)
 
-    # Filter years if requested
-    if filter_years:
-        df = filter_to_study_period(df)
+        _CACHE_STATS['misses'] += 1
+        start = time.perf_counter()
 
-    # Standardize race
-    df = standardize_race(df)
+        # Load data
+        df = load_overdose_data(file_path, use_cache=use_cache)
 
-    # Process age
-    df = process_age(df)
+        # Filter years if requested
+        if filter_years:
+            df = filter_to_study_period(df)
 
-    # Calculate polysubstance
-    df = calculate_polysubstance(df)
+        # Standardize race
+        df = standardize_race(df)
 
-    return df
+        # Process age
+        df = process_age(df)
+
+        # Calculate polysubstance
+        df = calculate_polysubstance(df)
+
+        # Normalize death ZIP codes
+        if 'DeathZip' in df.columns:
+            df = normalize_zip(df)
+
+        _CACHE_STATS['build_seconds'] += time.perf_counter() - start
+
+        if cache_path:
+            _write_cache(df, cache_path, stale_pattern=stale_pattern, index=True)
+            if os.environ.get('EPI_CACHE_VERBOSE'):
+                print(f"  (data cache miss: built {os.path.basename(cache_path)})")
+
+        return df
+
+    key = ('processed', os.path.abspath(file_path), filter_years, use_cache)
+    if rebuild:
+        _SHARED_FRAMES.pop(key, None)
+    return _shared(key, build)
 
 
 def get_race_labels(format='long'):
@@ -287,3 +972,231 @@ RACE_COLORS = {
 
 LANCET_COLORS = ['#00468B', '#ED0000', '#42B540', '#0099B4',
                  '#925E9F', '#FDAF91', '#AD002A', '#ADB6B6']
+
+
+# Lazy imports
+# Heavy optional modules (sklearn estimators, statsmodels, tableone,
+# ptitprince, plotnine, ...) are often needed on one code path only, e.g.
+# just for a figure that --skip-plots never builds. lazy_import() defers
+# the import to first use, so scripts still declare their dependencies at
+# the top without paying for them up front (see measure_import_time.py).
+class LazyModule:
+    """Module proxy that imports the module on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                raise ImportError(
+                    f"{self._name} is needed here but could not be imported "
+                    f"(pip install {self._name.split('.')[0]}): {e}"
+                ) from e
+        return self._module
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class LazyAttribute:
+    """Proxy for `from module import name`, resolved on first call or access"""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+
+    def _load(self):
+        return getattr(self._module._load(), self._name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._module._name}.{self._name}>"
+
+
+def lazy_import(module, *names):
+    """
+    Import a module, or names from it, on first use
+
+    Parameters:
+    -----------
+    module : str
+        Module to import, e.g. 'sklearn.cluster'
+    *names : str
+        Attributes to take from the module (like `from module import a, b`)
+
+    Returns:
+    --------
+    LazyModule, LazyAttribute or tuple of LazyAttribute
+        The module proxy if no names are given, one proxy for a single name,
+        otherwise a tuple of proxies in the order given
+
+    Examples:
+    ---------
+    >>> pt = lazy_import('ptitprince')
+    >>> DBSCAN = lazy_import('sklearn.cluster', 'DBSCAN')
+    >>> ggplot, aes = lazy_import('plotnine', 'ggplot', 'aes')
+    """
+    proxy = LazyModule(module)
+    if not names:
+        return proxy
+    attributes = tuple(LazyAttribute(proxy, name) for name in names)
+    return attributes[0] if len(attributes) == 1 else attributes
+
+
+# Stage timing
+# run_all_analyses.py records wall time, CPU time and peak RSS per script;
+# stage() does the same for named steps inside a script. When the runner
+# sets EPI_STAGE_LOG, each finished stage is appended to that file as one
+# JSON line and ends up in the run report (results/_runs/). Set
+# EPI_STAGE_VERBOSE=1 to also print each stage as it finishes.
+STAGE_LOG_ENV = 'EPI_STAGE_LOG'
+STAGE_VERBOSE_ENV = 'EPI_STAGE_VERBOSE'
+_STAGE_STACK = []
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far, in MB
+
+    Returns:
+    --------
+    float or None
+        None where the resource module is unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Time a named step of an analysis
+
+    Nested stages are recorded as 'outer/inner'. A stage that raises is
+    still recorded, with 'failed': True.
+
+    Parameters:
+    -----------
+    name : str
+        Stage name, e.g. 'kde' or 'dbscan'
+
+    Examples:
+    ---------
+    >>> with stage('kde'):
+    ...     density = kde.fit(coords).score_samples(grid)
+    """
+    _STAGE_STACK.append(name)
+    full_name = '/'.join(_STAGE_STACK)
+    wall, cpu = time.perf_counter(), time.process_time()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        _STAGE_STACK.pop()
+        record = {
+            'stage': full_name,
+            'wall_seconds': round(time.perf_counter() - wall, 4),
+            'cpu_seconds': round(time.process_time() - cpu, 4),
+            'peak_rss_mb': peak_rss_mb(),
+        }
+        if failed:
+            record['failed'] = True
+        if os.environ.get(STAGE_VERBOSE_ENV):
+            print(f"  [stage] {full_name}: {record['wall_seconds']:.2f}s wall, "
+                  f"{record['cpu_seconds']:.2f}s CPU")
+        log_path = os.environ.get(STAGE_LOG_ENV)
+        if log_path:
+            with open(log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+
+# Plotting gate
+# Nightly numeric regression runs only need the CSVs, so with EPI_SKIP_PLOTS
+# set (run_all_analyses.py --skip-plots sets it for every script) analyses
+# skip building figures. Scripts wrap figure-only blocks in
+# `if plots_enabled():`; install_plot_gate() turns saving and layout into
+# no-ops for any figure a script still builds, so nothing is rendered.
+SKIP_PLOTS_ENV = 'EPI_SKIP_PLOTS'
+
+def plots_enabled():
+    """
+    Whether figures should be built and saved
+
+    Returns:
+    --------
+    bool
+        False when EPI_SKIP_PLOTS is set to anything but '', '0', 'false'
+        or 'no'
+    """
+    return os.environ.get(SKIP_PLOTS_ENV, '').strip().lower() in ('', '0', 'false', 'no')
+
+
+def _skip_plot(*args, **kwargs):
+    """Stand-in for savefig/tight_layout/show while plots are skipped"""
+    return None
+
+
+def install_plot_gate():
+    """
+    Stop matplotlib (and plotnine, if loaded) from rendering figures
+
+    Does nothing while plots are enabled. Otherwise switches to the Agg
+    backend and replaces Figure.savefig, Figure.tight_layout, pyplot.show
+    and ggplot.save/draw with no-ops. Called when utils is imported, so
+    every script that imports utils is covered; call it again after
+    importing plotnine later on.
+
+    Returns:
+    --------
+    bool
+        True if the gate is in place
+    """
+    if plots_enabled():
+        return False
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    try:
+        from matplotlib.figure import Figure
+    except ImportError:
+        return False
+    Figure.savefig = _skip_plot
+    Figure.tight_layout = _skip_plot
+
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    if pyplot is not None:
+        pyplot.show = _skip_plot
+    plotnine = sys.modules.get('plotnine')
+    if plotnine is not None:
+        plotnine.ggplot.save = _skip_plot
+        plotnine.ggplot.draw = _skip_plot
+
+    return True
+
+
+install_plot_gate()
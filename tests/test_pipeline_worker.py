@@ -0,0 +1,38 @@
+"""Tests for scripts/pipeline_worker.py"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+pytest.importorskip('pandas')  # The worker imports utils
+matplotlib = pytest.importorskip('matplotlib')
+
+import pipeline_worker
+
+
+def test_run_sequence_isolates_failures_and_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_worker, 'SCRIPTS_DIR', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'work').mkdir()
+    (tmp_path / 'a.py').write_text(
+        "import os, matplotlib\n"
+        "matplotlib.rcParams['lines.linewidth'] = 9\n"
+        "os.chdir('work')\n"
+        "raise RuntimeError('boom')\n"
+    )
+    (tmp_path / 'b.py').write_text(
+        "import os, sys, matplotlib\n"
+        "assert matplotlib.rcParams['lines.linewidth'] != 9\n"
+        "assert os.path.basename(os.getcwd()) != 'work'\n"
+        "assert sys.argv[0].endswith('b.py')\n"
+    )
+    (tmp_path / 'c.py').write_text("import sys\nsys.exit(0)\n")
+    analyses = [{'name': name.upper(), 'script': f'{name}.py'} for name in 'abc']
+
+    status = pipeline_worker.run_sequence(analyses)
+
+    assert status == {'a.py': 'failed', 'b.py': 'success', 'c.py': 'success'}
+    assert os.getcwd() == str(tmp_path)
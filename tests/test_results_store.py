@@ -0,0 +1,74 @@
+"""Tests for scripts/results_store.py"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import results_store
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A scratch repo with two analyses writing the same table"""
+    monkeypatch.setattr(results_store, 'REPO_ROOT', str(tmp_path))
+    for folder in ('a', 'b'):
+        os.makedirs(tmp_path / 'results' / folder)
+        (tmp_path / 'results' / folder / 't.csv').write_text('year,deaths\n2019,1\n')
+    return tmp_path
+
+
+def test_default_mode_is_hardlink():
+    assert results_store.store_mode('1') == 'hardlink'
+    assert results_store.DEFAULT_MODE == 'hardlink'
+
+
+def test_release_protects_hardlinked_blobs(repo):
+    result = results_store.ingest()
+    assert result['new'] == ['results/a/t.csv'] and result['deduplicated'] == ['results/b/t.csv']
+    assert os.path.samefile(repo / 'results' / 'a' / 't.csv', repo / 'results' / 'b' / 't.csv')
+
+    # What the runner does before rerunning a script
+    assert results_store.release(['results/a']) == ['results/a/t.csv']
+    (repo / 'results' / 'a' / 't.csv').write_text('year,deaths\n2019,2\n')
+
+    assert (repo / 'results' / 'b' / 't.csv').read_text() == 'year,deaths\n2019,1\n'
+    assert results_store.verify() == []
+
+
+def test_plain_rerun_cannot_corrupt_copy_store(repo):
+    result = results_store.ingest(mode='copy')
+    assert result['new'] == ['results/a/t.csv'] and result['deduplicated'] == ['results/b/t.csv']
+
+    # A script rerun outside the runner rewrites its output in place
+    with open(repo / 'results' / 'a' / 't.csv', 'w') as f:
+        f.write('year,deaths\n2019,2\n')
+
+    assert (repo / 'results' / 'b' / 't.csv').read_text() == 'year,deaths\n2019,1\n'
+    assert results_store.verify() == []
+    assert results_store.ingest(mode='copy')['new'] == ['results/a/t.csv']
+    assert results_store.verify() == []
+
+
+def test_ingest_unchanged_copies(repo):
+    results_store.ingest(mode='copy')
+    result = results_store.ingest(mode='copy')
+    assert result['unchanged'] == ['results/a/t.csv', 'results/b/t.csv']
+
+
+def test_release_and_restore_copies(repo):
+    results_store.ingest(mode='copy')
+    (repo / 'results' / 'b' / 't.csv').write_text('edited\n')
+    assert results_store.release(['results']) == ['results/a/t.csv']
+    assert (repo / 'results' / 'b' / 't.csv').exists()  # Edited files are kept
+    assert results_store.restore(mode='copy') == ['results/a/t.csv']
+    assert (repo / 'results' / 'a' / 't.csv').read_text() == 'year,deaths\n2019,1\n'
+
+
+def test_forget_drops_entries(repo):
+    manifest = results_store.ingest()['manifest']
+    manifest = results_store.forget(['results/a/t.csv'], manifest)
+    assert list(manifest['files']) == ['results/b/t.csv']
+    assert results_store.load_manifest()['digest'] == manifest['digest']
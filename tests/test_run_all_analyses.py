@@ -0,0 +1,30 @@
+"""Tests for scripts/run_all_analyses.py"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+pytest.importorskip('pandas')  # The runner imports utils
+
+import run_all_analyses
+
+
+def test_helper_modules_follow_scripts_package_imports():
+    # from scripts.fred_cache import get_series
+    assert run_all_analyses.helper_modules('28_unemployment_overdose_correlation.py') == ['fred_cache.py']
+    assert run_all_analyses.helper_modules('42_labor_force_nonparticipation.py') == ['fred_cache.py']
+
+
+def test_helper_modules_follow_plain_imports():
+    assert run_all_analyses.helper_modules('fetch_census_data.py') == ['census_api.py']
+
+
+def test_helper_modules_skip_utils(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_all_analyses, 'SCRIPTS_DIR', str(tmp_path))
+    (tmp_path / 'utils.py').write_text('')
+    (tmp_path / 'helper.py').write_text('import utils\n')
+    (tmp_path / 'a.py').write_text('from scripts import helper\nfrom utils import stage\n')
+    assert run_all_analyses.helper_modules('a.py') == ['helper.py']